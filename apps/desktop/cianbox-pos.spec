@@ -18,7 +18,7 @@ block_cipher = None
 
 a = Analysis(
     [str(src_dir / 'main.py')],
-    pathex=[str(src_dir)],
+    pathex=[str(project_dir)],  # Los imports son src.*
     binaries=[],
     datas=[
         # Assets
@@ -38,10 +38,9 @@ a = Analysis(
         'h2',
         'hpack',
         'hyperframe',
-        'pydantic',
-        'pydantic_settings',
         'sqlalchemy',
         'loguru',
+        'orjson',
         'keyring',
         'keyring.backends',
         'escpos',
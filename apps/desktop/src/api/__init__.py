@@ -61,6 +61,7 @@ from .terminals import (
     register_terminal,
     send_heartbeat,
     get_terminal_status,
+    invalidate_terminal_status,
     identify_terminal,
 )
 from .cash import (
@@ -117,6 +118,7 @@ __all__ = [
     "register_terminal",
     "send_heartbeat",
     "get_terminal_status",
+    "invalidate_terminal_status",
     "identify_terminal",
     # Caja
     "CashAPI",
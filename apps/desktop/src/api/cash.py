@@ -11,6 +11,7 @@ from enum import Enum
 
 from loguru import logger
 
+from src.config.constants import LabeledStrEnum
 from .client import APIClient, get_api_client
 from .exceptions import APIError
 
@@ -27,7 +28,7 @@ class CashMovementType(str, Enum):
     CHANGE_FUND = "CHANGE_FUND"
 
 
-class CashMovementReason(str, Enum):
+class CashMovementReason(LabeledStrEnum):
     """Razones de movimiento de caja."""
 
     SAFE_DEPOSIT = "SAFE_DEPOSIT"
@@ -45,20 +46,22 @@ class CashMovementReason(str, Enum):
     @classmethod
     def get_display_name(cls, reason: "CashMovementReason") -> str:
         """Obtiene el nombre para mostrar."""
-        names = {
-            cls.SAFE_DEPOSIT: "Deposito en Caja Fuerte",
-            cls.BANK_DEPOSIT: "Deposito Bancario",
-            cls.SUPPLIER_PAYMENT: "Pago a Proveedor",
-            cls.EXPENSE: "Gasto",
-            cls.CHANGE_FUND: "Fondo de Cambio",
-            cls.INITIAL_FUND: "Fondo Inicial",
-            cls.LOAN_RETURN: "Devolucion de Prestamo",
-            cls.CORRECTION: "Correccion",
-            cls.COUNT_DIFFERENCE: "Diferencia de Arqueo",
-            cls.SHIFT_TRANSFER: "Transferencia de Turno",
-            cls.OTHER: "Otro",
-        }
-        return names.get(reason, reason.value)
+        return cls.label(reason)
+
+
+CashMovementReason.set_labels({
+    CashMovementReason.SAFE_DEPOSIT: "Deposito en Caja Fuerte",
+    CashMovementReason.BANK_DEPOSIT: "Deposito Bancario",
+    CashMovementReason.SUPPLIER_PAYMENT: "Pago a Proveedor",
+    CashMovementReason.EXPENSE: "Gasto",
+    CashMovementReason.CHANGE_FUND: "Fondo de Cambio",
+    CashMovementReason.INITIAL_FUND: "Fondo Inicial",
+    CashMovementReason.LOAN_RETURN: "Devolucion de Prestamo",
+    CashMovementReason.CORRECTION: "Correccion",
+    CashMovementReason.COUNT_DIFFERENCE: "Diferencia de Arqueo",
+    CashMovementReason.SHIFT_TRANSFER: "Transferencia de Turno",
+    CashMovementReason.OTHER: "Otro",
+})
 
 
 class CashSessionStatus(str, Enum):
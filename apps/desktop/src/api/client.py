@@ -8,6 +8,7 @@ Proporciona:
 - Manejo de errores tipado
 """
 
+import random
 import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, TypeVar
@@ -32,6 +33,25 @@ from .exceptions import (
 
 T = TypeVar("T")
 
+# Jitter maximo agregado al backoff (segundos)
+RETRY_JITTER = 0.3
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Calcula la espera antes del siguiente reintento.
+
+    Backoff exponencial con jitter para que varias terminales no
+    reintenten sincronizadas contra un backend que se esta recuperando.
+
+    Args:
+        attempt: Numero de intento fallido (desde 0)
+
+    Returns:
+        Segundos a esperar
+    """
+    return API_RETRY_DELAY * (2 ** attempt) + random.random() * RETRY_JITTER
+
 
 class APIResponse:
     """
@@ -233,6 +253,7 @@ class APIClient:
         params: Optional[Dict] = None,
         retry_count: int = API_MAX_RETRIES,
         skip_auth_refresh: bool = False,
+        content: Optional[bytes] = None,
     ) -> APIResponse:
         """
         Realiza una peticion HTTP a la API.
@@ -244,6 +265,7 @@ class APIClient:
             params: Query parameters
             retry_count: Numero de reintentos
             skip_auth_refresh: Saltar renovacion de token
+            content: Body JSON ya serializado (reemplaza a data)
 
         Returns:
             APIResponse con el resultado
@@ -267,7 +289,8 @@ class APIClient:
                 response = client.request(
                     method=method,
                     url=endpoint,
-                    json=data,
+                    json=data if content is None else None,
+                    content=content,
                     params=params,
                     headers=self._get_headers(),
                 )
@@ -293,7 +316,7 @@ class APIClient:
                     )
                     logger.warning(f"Error de servidor: {last_error}")
                     if attempt < retry_count - 1:
-                        time.sleep(API_RETRY_DELAY * (attempt + 1))
+                        time.sleep(retry_delay(attempt))
                     continue
 
                 # Error de cliente - no reintentar
@@ -314,7 +337,7 @@ class APIClient:
                 last_error = NetworkError("Error de conexion", e)
                 logger.warning(f"Error de red (intento {attempt + 1}): {e}")
                 if attempt < retry_count - 1:
-                    time.sleep(API_RETRY_DELAY * (attempt + 1))
+                    time.sleep(retry_delay(attempt))
 
             except APIError:
                 raise
@@ -340,9 +363,10 @@ class APIClient:
         self,
         endpoint: str,
         data: Optional[Dict] = None,
+        content: Optional[bytes] = None,
     ) -> APIResponse:
         """Realiza una peticion POST."""
-        return self.request("POST", endpoint, data=data)
+        return self.request("POST", endpoint, data=data, content=content)
 
     def put(
         self,
@@ -5,7 +5,7 @@ Maneja la obtencion de promociones activas y el calculo de descuentos
 para los items del carrito.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -60,9 +60,10 @@ class PromotionData:
     discount_type: str = "PERCENTAGE"
     buy_quantity: int = 1
     get_quantity: int = 1
-    category_ids: List[str] = field(default_factory=list)
-    brand_ids: List[str] = field(default_factory=list)
-    product_ids: List[str] = field(default_factory=list)
+    # Conjuntos: applies_to_product consulta pertenencia en O(1)
+    category_ids: FrozenSet[str] = field(default_factory=frozenset)
+    brand_ids: FrozenSet[str] = field(default_factory=frozenset)
+    product_ids: FrozenSet[str] = field(default_factory=frozenset)
     badge_color: Optional[str] = None
     is_active: bool = True
 
@@ -70,12 +71,10 @@ class PromotionData:
     def from_dict(cls, data: dict) -> "PromotionData":
         """Crea PromotionData desde diccionario de la API."""
         # Extraer IDs de productos si vienen como objetos
-        product_ids = []
-        if data.get("applicableProducts"):
-            product_ids = [
-                p.get("productId") or p.get("id", "")
-                for p in data.get("applicableProducts", [])
-            ]
+        product_ids = frozenset(
+            p.get("productId") or p.get("id", "")
+            for p in data.get("applicableProducts") or []
+        )
 
         return cls(
             id=data.get("id", ""),
@@ -86,8 +85,8 @@ class PromotionData:
             discount_type=data.get("discountType", "PERCENTAGE"),
             buy_quantity=int(data.get("buyQuantity", 1)),
             get_quantity=int(data.get("getQuantity", 1)),
-            category_ids=data.get("categoryIds", []) or [],
-            brand_ids=data.get("brandIds", []) or [],
+            category_ids=frozenset(data.get("categoryIds") or ()),
+            brand_ids=frozenset(data.get("brandIds") or ()),
             product_ids=product_ids,
             badge_color=data.get("badgeColor"),
             is_active=data.get("isActive", True),
@@ -148,6 +147,79 @@ class PromotionData:
         return False
 
 
+class PromotionIndex:
+    """
+    Indice inverso de promociones por producto, categoria y marca.
+
+    Se arma una vez por lista de promociones activas y responde
+    la primera promocion aplicable sin recorrer la lista. Respeta el
+    orden original, igual que PromotionsAPI.get_promotion_for_product.
+    """
+
+    def __init__(self, promotions: List[PromotionData]):
+        """
+        Construye el indice.
+
+        Args:
+            promotions: Promociones activas, en orden de prioridad
+        """
+        self._promotions = list(promotions)
+        self._all_position: Optional[int] = None
+        self._by_product: Dict[str, int] = {}
+        self._by_category: Dict[str, int] = {}
+        self._by_brand: Dict[str, int] = {}
+
+        targets = {
+            "SPECIFIC_PRODUCTS": ("product_ids", self._by_product),
+            "CATEGORIES": ("category_ids", self._by_category),
+            "BRANDS": ("brand_ids", self._by_brand),
+        }
+
+        for position, promo in enumerate(self._promotions):
+            if not promo.is_active:
+                continue
+
+            if promo.apply_to == "ALL_PRODUCTS":
+                if self._all_position is None:
+                    self._all_position = position
+                continue
+
+            target = targets.get(promo.apply_to)
+            if target:
+                attr, index = target
+                for key in getattr(promo, attr):
+                    index.setdefault(key, position)
+
+    def first_for(
+        self,
+        product_id: str,
+        category_id: Optional[str] = None,
+        brand_id: Optional[str] = None,
+    ) -> Optional[PromotionData]:
+        """
+        Busca la primera promocion aplicable a un producto.
+
+        Args:
+            product_id: ID del producto
+            category_id: ID de la categoria del producto
+            brand_id: ID de la marca del producto
+
+        Returns:
+            PromotionData si hay promocion aplicable, None si no
+        """
+        positions = [
+            position
+            for position in (
+                self._all_position,
+                self._by_product.get(product_id),
+                self._by_category.get(category_id) if category_id is not None else None,
+                self._by_brand.get(brand_id) if brand_id is not None else None,
+            )
+            if position is not None
+        ]
+        return self._promotions[min(positions)] if positions else None
+
+
 @dataclass
 class AppliedPromotionData:
     """Datos de una promocion aplicada a un item."""
@@ -7,8 +7,11 @@ Maneja:
 - Consulta de estado
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+import json
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 
 from loguru import logger
 
@@ -16,8 +19,24 @@ from .client import get_api_client, APIResponse
 from .exceptions import APIError
 import httpx
 
+# Parser JSON rapido (opcional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+
+# Cache de estado de terminal: device_id -> (timestamp monotonic, status)
+STATUS_CACHE_TTL = 10.0  # segundos
+_STATUS_CACHE: Dict[str, Tuple[float, str]] = {}
+
+# Timeouts de identificacion: conectar rapido para que la UI reaccione
+# ante una red caida, pero dar margen a la respuesta del servidor
+IDENTIFY_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=5.0, pool=1.0)
+
+
+@dataclass(slots=True)
 class TerminalIdentification:
     """
     Resultado de identificar una terminal.
@@ -40,7 +59,7 @@ class TerminalIdentification:
     message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TerminalInfo:
     """
     Informacion de la terminal registrada en el backend.
@@ -64,6 +83,35 @@ class TerminalInfo:
     point_of_sale: Optional[Dict[str, Any]]
     is_new: bool = False
 
+    # Datos del punto de venta aplanados en __post_init__
+    _branch_id: Optional[str] = field(default=None, init=False, repr=False)
+    _branch_name: Optional[str] = field(default=None, init=False, repr=False)
+    _price_list_id: Optional[str] = field(default=None, init=False, repr=False)
+    _price_list_name: Optional[str] = field(default=None, init=False, repr=False)
+    _pos_id: Optional[str] = field(default=None, init=False, repr=False)
+    _pos_code: Optional[str] = field(default=None, init=False, repr=False)
+    _pos_name: Optional[str] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Aplana point_of_sale una sola vez para evitar lookups anidados."""
+        pos = self.point_of_sale
+        if not pos:
+            return
+
+        self._pos_id = pos.get("id")
+        self._pos_code = pos.get("code")
+        self._pos_name = pos.get("name")
+
+        branch = pos.get("branch")
+        if branch:
+            self._branch_id = branch.get("id")
+            self._branch_name = branch.get("name")
+
+        price_list = pos.get("priceList")
+        if price_list:
+            self._price_list_id = price_list.get("id")
+            self._price_list_name = price_list.get("name")
+
     @property
     def is_active(self) -> bool:
         """Verifica si la terminal esta activa."""
@@ -77,51 +125,37 @@ class TerminalInfo:
     @property
     def branch_id(self) -> Optional[str]:
         """Obtiene el ID de sucursal del punto de venta."""
-        if self.point_of_sale and self.point_of_sale.get("branch"):
-            return self.point_of_sale["branch"].get("id")
-        return None
+        return self._branch_id
 
     @property
     def branch_name(self) -> Optional[str]:
         """Obtiene el nombre de sucursal."""
-        if self.point_of_sale and self.point_of_sale.get("branch"):
-            return self.point_of_sale["branch"].get("name")
-        return None
+        return self._branch_name
 
     @property
     def price_list_id(self) -> Optional[str]:
         """Obtiene el ID de lista de precios."""
-        if self.point_of_sale and self.point_of_sale.get("priceList"):
-            return self.point_of_sale["priceList"].get("id")
-        return None
+        return self._price_list_id
 
     @property
     def price_list_name(self) -> Optional[str]:
         """Obtiene el nombre de lista de precios."""
-        if self.point_of_sale and self.point_of_sale.get("priceList"):
-            return self.point_of_sale["priceList"].get("name")
-        return None
+        return self._price_list_name
 
     @property
     def pos_id(self) -> Optional[str]:
         """Obtiene el ID del punto de venta."""
-        if self.point_of_sale:
-            return self.point_of_sale.get("id")
-        return None
+        return self._pos_id
 
     @property
     def pos_code(self) -> Optional[str]:
         """Obtiene el codigo del punto de venta."""
-        if self.point_of_sale:
-            return self.point_of_sale.get("code")
-        return None
+        return self._pos_code
 
     @property
     def pos_name(self) -> Optional[str]:
         """Obtiene el nombre del punto de venta."""
-        if self.point_of_sale:
-            return self.point_of_sale.get("name")
-        return None
+        return self._pos_name
 
 
 class TerminalNotActiveError(APIError):
@@ -159,8 +193,10 @@ def register_terminal(
         TerminalNotActiveError: Si la terminal no esta activa
         APIError: Si hay error de comunicacion
     """
-    logger.info(f"Registrando terminal: {hostname} ({mac_address})")
+    logger.info("Registrando terminal: {} ({})", hostname, mac_address)
 
+    # El cliente compartido reintenta errores de red con backoff sobre
+    # la misma conexion; aqui no se agrega otro ciclo de reintentos
     client = get_api_client()
 
     try:
@@ -187,7 +223,8 @@ def register_terminal(
             raise APIError(response.error or "Error al registrar terminal")
 
         data = response.data
-        is_new = response.data is not None and data.get("isNewTerminal", False)
+        if not data:
+            raise APIError("Respuesta vacia al registrar terminal")
 
         terminal = TerminalInfo(
             id=data["id"],
@@ -197,20 +234,23 @@ def register_terminal(
             name=data.get("name"),
             status=data["status"],
             point_of_sale=data.get("pointOfSale"),
-            is_new=is_new,
+            is_new=data.get("isNewTerminal", False),
         )
 
+        # El registro puede cambiar el estado: descartar el valor cacheado
+        invalidate_terminal_status(terminal.device_id)
+
         if terminal.is_active:
+            # Formato diferido de loguru: solo se arma el mensaje si el nivel esta habilitado
             logger.info(
-                f"Terminal activa: {terminal.name or terminal.hostname} "
-                f"- Sucursal: {terminal.branch_name}"
+                "Terminal activa: {} - Sucursal: {}",
+                terminal.name or terminal.hostname,
+                terminal.branch_name,
             )
         elif terminal.is_pending:
-            logger.warning(
-                f"Terminal pendiente de activacion: {terminal.hostname}"
-            )
+            logger.warning("Terminal pendiente de activacion: {}", terminal.hostname)
         else:
-            logger.warning(f"Terminal con estado: {terminal.status}")
+            logger.warning("Terminal con estado: {}", terminal.status)
 
         return terminal
 
@@ -223,6 +263,26 @@ def register_terminal(
         raise APIError(f"Error al registrar terminal: {e}")
 
 
+@lru_cache(maxsize=4)
+def _heartbeat_payload(device_id: str) -> bytes:
+    """
+    Serializa el body del heartbeat una sola vez por dispositivo.
+
+    El device_id no cambia durante la vida del proceso, asi que el
+    body JSON se reutiliza en cada heartbeat.
+
+    Args:
+        device_id: ID unico del dispositivo
+
+    Returns:
+        Body JSON como bytes
+    """
+    payload = {"deviceId": device_id}
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
 def send_heartbeat(device_id: str) -> bool:
     """
     Envia heartbeat para indicar que la terminal esta activa.
@@ -239,31 +299,57 @@ def send_heartbeat(device_id: str) -> bool:
         client = get_api_client()
         response = client.post(
             "/api/pos/terminals/heartbeat",
-            data={"deviceId": device_id},
+            content=_heartbeat_payload(device_id),
         )
+        if not response.success:
+            invalidate_terminal_status(device_id)
         return response.success
 
     except Exception as e:
         logger.warning(f"Error enviando heartbeat: {e}")
+        invalidate_terminal_status(device_id)
         return False
 
 
+def invalidate_terminal_status(device_id: Optional[str] = None) -> None:
+    """
+    Descarta el estado cacheado de una terminal.
+
+    Args:
+        device_id: ID unico del dispositivo (None limpia todo el cache)
+    """
+    if device_id is None:
+        _STATUS_CACHE.clear()
+    else:
+        _STATUS_CACHE.pop(device_id, None)
+
+
 def get_terminal_status(device_id: str) -> Optional[str]:
     """
     Consulta el estado actual de la terminal.
 
+    El resultado se cachea durante STATUS_CACHE_TTL segundos para
+    no consultar al backend en cada refresco de la UI.
+
     Args:
         device_id: ID unico del dispositivo
 
     Returns:
         Estado de la terminal o None si hay error
     """
+    entry = _STATUS_CACHE.get(device_id)
+    if entry and time.monotonic() - entry[0] < STATUS_CACHE_TTL:
+        return entry[1]
+
     try:
         client = get_api_client()
         response = client.get(f"/api/pos/terminals/{device_id}/status")
 
         if response.success and response.data:
-            return response.data.get("status")
+            status = response.data.get("status")
+            if status:
+                _STATUS_CACHE[device_id] = (time.monotonic(), status)
+            return status
         return None
 
     except Exception as e:
@@ -285,24 +371,24 @@ def identify_terminal(mac_address: str, api_url: str) -> TerminalIdentification:
     Returns:
         TerminalIdentification con los datos del tenant
     """
-    logger.info(f"Identificando terminal: {mac_address}")
+    logger.info("Identificando terminal: {}", mac_address)
 
     try:
         # Usamos httpx directamente porque no tenemos auth todavía
-        with httpx.Client(timeout=10.0) as client:
+        with httpx.Client(timeout=IDENTIFY_TIMEOUT) as client:
             response = client.post(
                 f"{api_url}/api/pos/terminals/identify",
                 json={"macAddress": mac_address},
             )
 
             if response.status_code != 200:
-                logger.warning(f"Error identificando terminal: HTTP {response.status_code}")
+                logger.warning("Error identificando terminal: HTTP {}", response.status_code)
                 return TerminalIdentification(
                     registered=False,
                     message="Error de conexión con el servidor",
                 )
 
-            data = response.json()
+            data = orjson.loads(response.content) if HAS_ORJSON else response.json()
 
             if not data.get("success"):
                 return TerminalIdentification(
@@ -335,17 +421,25 @@ def identify_terminal(mac_address: str, api_url: str) -> TerminalIdentification:
 
             if identification.is_active:
                 logger.info(
-                    f"Terminal identificada: {identification.terminal_name} "
-                    f"@ {identification.tenant_name}"
+                    "Terminal identificada: {} @ {}",
+                    identification.terminal_name,
+                    identification.tenant_name,
                 )
             else:
                 logger.warning(
-                    f"Terminal no activa: {identification.terminal_name} "
-                    f"- {identification.message}"
+                    "Terminal no activa: {} - {}",
+                    identification.terminal_name,
+                    identification.message,
                 )
 
             return identification
 
+    except httpx.ConnectTimeout:
+        logger.error("Timeout conectando al servidor")
+        return TerminalIdentification(
+            registered=False,
+            message="Timeout conectando al servidor. Verifique la conexión de red.",
+        )
     except httpx.ConnectError:
         logger.error("No se pudo conectar al servidor")
         return TerminalIdentification(
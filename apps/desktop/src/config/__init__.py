@@ -10,10 +10,18 @@ Uso:
     >>> settings = get_settings()
     >>> print(settings.API_URL)
 
+Todos los simbolos (settings, constants, change_math) se resuelven
+bajo demanda via __getattr__ (PEP 562) para no pagar su importacion
+en el arranque. Para nombre y version sin construir Settings usar
+src.config.env.get_app_info.
+
 Exports:
-    - Settings: Clase de configuracion Pydantic
+    - Settings: Dataclass de configuracion
     - get_settings: Factory para obtener configuracion (singleton)
+    - reset_settings: Descarta la configuracion cargada
+    - LabeledStrEnum: Base de enums con nombre para mostrar
     - PaymentMethod: Enum de metodos de pago
+    - as_payment_method: Normaliza un string a PaymentMethod
     - SaleStatus: Enum de estados de venta
     - CashSessionStatus: Enum de estados de turno
     - ReceiptType: Enum de tipos de comprobante
@@ -21,74 +29,22 @@ Exports:
     - SyncStatus: Enum de estados de sincronizacion
     - COLORS: Diccionario de colores del tema
     - KEYBOARD_SHORTCUTS: Mapeo de atajos de teclado
+    - get_key_sequences: QKeySequence precompilados de los atajos
     - BILL_DENOMINATIONS: Denominaciones de billetes (ARS)
     - COIN_DENOMINATIONS: Denominaciones de monedas (ARS)
+    - ALL_DENOMINATIONS: Todas las denominaciones, de mayor a menor
+    - make_change: Desglose de un monto en billetes y monedas
 """
 
-from .settings import Settings, get_settings
-from .constants import (
-    # Enumeraciones
-    PaymentMethod,
-    SaleStatus,
-    CashSessionStatus,
-    ReceiptType,
-    PromotionType,
-    SyncStatus,
-    # Colores y UI
-    COLORS,
-    KEYBOARD_SHORTCUTS,
-    # Denominaciones monetarias
-    BILL_DENOMINATIONS,
-    COIN_DENOMINATIONS,
-    # Constantes de configuracion
-    DEFAULT_TAX_RATE,
-    DEFAULT_PAGE_SIZE,
-    MAX_CART_ITEMS,
-    BARCODE_MIN_LENGTH,
-    BARCODE_MAX_LENGTH,
-    TOKEN_REFRESH_BEFORE_EXPIRY,
-    API_RETRY_DELAY,
-    API_MAX_RETRIES,
-    SYNC_INTERVAL,
-    # Formatos
-    DATE_FORMAT,
-    TIME_FORMAT,
-    DATETIME_FORMAT,
-    CURRENCY_SYMBOL,
-    CURRENCY_DECIMALS,
-    # Dimensiones de ventana
-    MAIN_WINDOW_MIN_WIDTH,
-    MAIN_WINDOW_MIN_HEIGHT,
-    MAIN_WINDOW_DEFAULT_WIDTH,
-    MAIN_WINDOW_DEFAULT_HEIGHT,
-    LOGIN_WINDOW_WIDTH,
-    LOGIN_WINDOW_HEIGHT,
-    DIALOG_MIN_WIDTH,
-    DIALOG_MIN_HEIGHT,
-    CHECKOUT_DIALOG_WIDTH,
-    CHECKOUT_DIALOG_HEIGHT,
-    PRODUCT_LOOKUP_WIDTH,
-    PRODUCT_LOOKUP_HEIGHT,
-    # Limites de negocio
-    MAX_SALE_AMOUNT,
-    MIN_SALE_AMOUNT,
-    MAX_ITEM_QUANTITY,
-    MAX_DISCOUNT_PERCENT,
-    SEARCH_DEBOUNCE_MS,
-    SEARCH_MIN_CHARS,
-    SEARCH_MAX_RESULTS,
-    PRODUCTS_CACHE_TTL_MINUTES,
-    PROMOTIONS_CACHE_TTL_MINUTES,
-    # Mensajes de error
-    ERROR_MESSAGES,
-)
-
 __all__ = [
     # Settings
     "Settings",
     "get_settings",
+    "reset_settings",
     # Enumeraciones
+    "LabeledStrEnum",
     "PaymentMethod",
+    "as_payment_method",
     "SaleStatus",
     "CashSessionStatus",
     "ReceiptType",
@@ -97,9 +53,13 @@ __all__ = [
     # UI
     "COLORS",
     "KEYBOARD_SHORTCUTS",
+    "get_key_sequences",
     # Denominaciones
     "BILL_DENOMINATIONS",
     "COIN_DENOMINATIONS",
+    "ALL_DENOMINATIONS",
+    "DENOMINATION_LABELS",
+    "make_change",
     # Constantes
     "DEFAULT_TAX_RATE",
     "DEFAULT_PAGE_SIZE",
@@ -142,3 +102,32 @@ __all__ = [
     # Mensajes de error
     "ERROR_MESSAGES",
 ]
+
+# Simbolos que se cargan bajo demanda: nombre -> submodulo
+_LAZY_MODULES = {
+    "Settings": "settings",
+    "get_settings": "settings",
+    "reset_settings": "settings",
+    "make_change": "change_math",
+}
+_LAZY_CONSTANTS = frozenset(__all__) - set(_LAZY_MODULES)
+
+
+def __getattr__(name: str):
+    """Importa bajo demanda los simbolos de settings, constants y change_math."""
+    if name in _LAZY_CONSTANTS:
+        from . import constants
+        value = getattr(constants, name)
+    elif name in _LAZY_MODULES:
+        from importlib import import_module
+        value = getattr(import_module(f".{_LAZY_MODULES[name]}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cachear para que los siguientes accesos no pasen por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,62 @@
+"""
+Calculo de vuelto por denominacion.
+
+Desglosa un monto en billetes y monedas usando las denominaciones
+definidas en constants (algoritmo greedy, de mayor a menor).
+"""
+
+from typing import List, Sequence, Tuple
+
+from .constants import ALL_DENOMINATIONS
+
+
+def split_change(amount: int, denominations: Sequence[int]) -> Tuple[List[int], int]:
+    """
+    Reparte un monto entero entre denominaciones (greedy).
+
+    Solo usa aritmetica entera sobre un vector ya ordenado de mayor
+    a menor, sin armar estructuras intermedias.
+
+    Args:
+        amount: Monto entero a repartir (en pesos)
+        denominations: Denominaciones ordenadas de mayor a menor
+
+    Returns:
+        Tupla (cantidades, resto) con una cantidad por denominacion
+    """
+    counts = [0] * len(denominations)
+    remaining = amount
+
+    for i, value in enumerate(denominations):
+        if remaining >= value:
+            counts[i], remaining = divmod(remaining, value)
+            if not remaining:
+                break
+
+    return counts, remaining
+
+
+def make_change(amount_cents: int) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Desglosa un monto en billetes y monedas.
+
+    Args:
+        amount_cents: Monto a desglosar, en centavos
+
+    Returns:
+        Tupla (desglose, resto):
+            - desglose: Lista de (denominacion, cantidad) con cantidad > 0
+            - resto: Centavos que no se pueden entregar con las denominaciones
+    """
+    if amount_cents <= 0:
+        return [], 0
+
+    pesos, cents = divmod(amount_cents, 100)
+    counts, remaining = split_change(pesos, ALL_DENOMINATIONS)
+
+    breakdown = [
+        (value, count)
+        for value, count in zip(ALL_DENOMINATIONS, counts)
+        if count
+    ]
+    return breakdown, remaining * 100 + cents
@@ -8,10 +8,57 @@ Define valores fijos usados en toda la aplicacion como:
 - Denominaciones de billetes y monedas
 """
 
+import sys
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 
 
-class PaymentMethod(str, Enum):
+class LabeledStrEnum(str, Enum):
+    """
+    Enum de strings con nombre para mostrar.
+
+    Cada subclase carga sus nombres una sola vez con set_labels()
+    despues de declarar la clase. Los nombres quedan en una tupla
+    en orden de declaracion y cada miembro guarda su indice, asi
+    label() resuelve un miembro con un acceso por indice.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._LABELS = {}
+        cls._LABEL_TUPLE = ()
+
+    @classmethod
+    def set_labels(cls, labels: dict) -> None:
+        """
+        Registra los nombres para mostrar de los miembros.
+
+        Args:
+            labels: Mapa miembro -> nombre (los faltantes usan su valor)
+        """
+        cls._LABELS = labels
+        cls._LABEL_TUPLE = tuple(labels.get(m, m.value) for m in cls)
+        for idx, member in enumerate(cls):
+            member._label_idx = idx
+
+    @classmethod
+    def label(cls, member) -> str:
+        """
+        Obtiene el nombre para mostrar de un miembro.
+
+        Args:
+            member: Miembro del enum o su valor como string
+
+        Returns:
+            Nombre para mostrar (o el valor si no tiene nombre asignado)
+        """
+        if member.__class__ is cls:
+            return cls._LABEL_TUPLE[member._label_idx]
+        return cls._LABELS.get(member, getattr(member, "value", member))
+
+
+class PaymentMethod(LabeledStrEnum):
     """Metodos de pago soportados."""
 
     CASH = "CASH"
@@ -29,23 +76,47 @@ class PaymentMethod(str, Enum):
     @classmethod
     def get_display_name(cls, method: "PaymentMethod") -> str:
         """Obtiene el nombre para mostrar del metodo de pago."""
-        names = {
-            cls.CASH: "Efectivo",
-            cls.CREDIT_CARD: "Tarjeta de Credito",
-            cls.DEBIT_CARD: "Tarjeta de Debito",
-            cls.QR: "QR",
-            cls.MP_POINT: "MercadoPago Point",
-            cls.TRANSFER: "Transferencia",
-            cls.CHECK: "Cheque",
-            cls.CREDIT: "Cuenta Corriente",
-            cls.VOUCHER: "Voucher",
-            cls.GIFTCARD: "Gift Card",
-            cls.OTHER: "Otro",
-        }
-        return names.get(method, method.value)
-
-
-class SaleStatus(str, Enum):
+        return cls.label(method)
+
+
+def as_payment_method(value) -> PaymentMethod:
+    """
+    Normaliza un metodo de pago recibido como string.
+
+    Se usa en los bordes (API, propiedades Qt) para que el resto del
+    codigo trabaje siempre con miembros del enum y pueda compararlos
+    por identidad (`method is PaymentMethod.CASH`).
+
+    Args:
+        value: Miembro de PaymentMethod o su valor como string
+
+    Returns:
+        Miembro de PaymentMethod (OTHER si el valor no es conocido)
+    """
+    if isinstance(value, PaymentMethod):
+        return value
+    try:
+        return PaymentMethod(value)
+    except ValueError:
+        return PaymentMethod.OTHER
+
+
+PaymentMethod.set_labels({
+    PaymentMethod.CASH: "Efectivo",
+    PaymentMethod.CREDIT_CARD: "Tarjeta de Credito",
+    PaymentMethod.DEBIT_CARD: "Tarjeta de Debito",
+    PaymentMethod.QR: "QR",
+    PaymentMethod.MP_POINT: "MercadoPago Point",
+    PaymentMethod.TRANSFER: "Transferencia",
+    PaymentMethod.CHECK: "Cheque",
+    PaymentMethod.CREDIT: "Cuenta Corriente",
+    PaymentMethod.VOUCHER: "Voucher",
+    PaymentMethod.GIFTCARD: "Gift Card",
+    PaymentMethod.OTHER: "Otro",
+})
+
+
+class SaleStatus(LabeledStrEnum):
     """Estados de venta."""
 
     PENDING = "PENDING"
@@ -55,7 +126,16 @@ class SaleStatus(str, Enum):
     PARTIAL_REFUND = "PARTIAL_REFUND"
 
 
-class CashSessionStatus(str, Enum):
+SaleStatus.set_labels({
+    SaleStatus.PENDING: "Pendiente",
+    SaleStatus.COMPLETED: "Completada",
+    SaleStatus.CANCELLED: "Anulada",
+    SaleStatus.REFUNDED: "Devolución",
+    SaleStatus.PARTIAL_REFUND: "Dev. Parcial",
+})
+
+
+class CashSessionStatus(LabeledStrEnum):
     """Estados de turno de caja."""
 
     OPEN = "OPEN"
@@ -65,7 +145,16 @@ class CashSessionStatus(str, Enum):
     TRANSFERRED = "TRANSFERRED"
 
 
-class ReceiptType(str, Enum):
+CashSessionStatus.set_labels({
+    CashSessionStatus.OPEN: "Abierto",
+    CashSessionStatus.SUSPENDED: "Suspendido",
+    CashSessionStatus.COUNTING: "En Arqueo",
+    CashSessionStatus.CLOSED: "Cerrado",
+    CashSessionStatus.TRANSFERRED: "Transferido",
+})
+
+
+class ReceiptType(LabeledStrEnum):
     """Tipos de comprobante fiscal."""
 
     TICKET = "TICKET"       # @deprecated - usar NDP_X
@@ -80,7 +169,21 @@ class ReceiptType(str, Enum):
     RECEIPT = "RECEIPT"
 
 
-class PromotionType(str, Enum):
+ReceiptType.set_labels({
+    ReceiptType.TICKET: "NDP X",
+    ReceiptType.NDP_X: "NDP X",
+    ReceiptType.NDC_X: "NDC X",
+    ReceiptType.INVOICE_A: "Fact. A",
+    ReceiptType.INVOICE_B: "Fact. B",
+    ReceiptType.INVOICE_C: "Fact. C",
+    ReceiptType.CREDIT_NOTE_A: "NC A",
+    ReceiptType.CREDIT_NOTE_B: "NC B",
+    ReceiptType.CREDIT_NOTE_C: "NC C",
+    ReceiptType.RECEIPT: "Recibo",
+})
+
+
+class PromotionType(LabeledStrEnum):
     """Tipos de promocion."""
 
     PERCENTAGE = "PERCENTAGE"
@@ -92,7 +195,18 @@ class PromotionType(str, Enum):
     COUPON = "COUPON"
 
 
-class SyncStatus(str, Enum):
+PromotionType.set_labels({
+    PromotionType.PERCENTAGE: "Porcentaje",
+    PromotionType.FIXED_AMOUNT: "Monto Fijo",
+    PromotionType.BUY_X_GET_Y: "Lleva X Paga Y",
+    PromotionType.SECOND_UNIT_DISCOUNT: "2da Unidad",
+    PromotionType.BUNDLE_PRICE: "Precio Combo",
+    PromotionType.FLASH_SALE: "Oferta Relampago",
+    PromotionType.COUPON: "Cupon",
+})
+
+
+class SyncStatus(LabeledStrEnum):
     """Estados de sincronizacion."""
 
     PENDING = "PENDING"
@@ -101,6 +215,14 @@ class SyncStatus(str, Enum):
     FAILED = "FAILED"
 
 
+SyncStatus.set_labels({
+    SyncStatus.PENDING: "Pendiente",
+    SyncStatus.IN_PROGRESS: "En Progreso",
+    SyncStatus.COMPLETED: "Completada",
+    SyncStatus.FAILED: "Fallida",
+})
+
+
 # ==============================================================================
 # TEMA Y COLORES
 # ==============================================================================
@@ -172,6 +294,9 @@ COLORS = {
     "text_inverse": "#ffffff",
 }
 
+# Solo lectura: se comparte entre todos los modulos de UI
+COLORS = MappingProxyType({key: sys.intern(value) for key, value in COLORS.items()})
+
 
 # ==============================================================================
 # ATAJOS DE TECLADO
@@ -208,6 +333,26 @@ KEYBOARD_SHORTCUTS = {
     "Tab": ("nav_next", "Siguiente campo"),
 }
 
+KEYBOARD_SHORTCUTS = MappingProxyType({
+    sys.intern(key): (sys.intern(action), description)
+    for key, (action, description) in KEYBOARD_SHORTCUTS.items()
+})
+
+
+@lru_cache(maxsize=1)
+def get_key_sequences() -> MappingProxyType:
+    """
+    Obtiene los QKeySequence de KEYBOARD_SHORTCUTS (se construyen una sola vez).
+
+    PyQt6 se importa aca para que este modulo siga siendo usable sin Qt.
+
+    Returns:
+        Mapeo tecla -> QKeySequence
+    """
+    from PyQt6.QtGui import QKeySequence
+
+    return MappingProxyType({key: QKeySequence(key) for key in KEYBOARD_SHORTCUTS})
+
 
 # ==============================================================================
 # DENOMINACIONES MONETARIAS (Argentina - ARS)
@@ -235,6 +380,15 @@ COIN_DENOMINATIONS = [
     (1, "Uno"),
 ]
 
+# Todas las denominaciones (billetes y monedas) sin repetir, de mayor a menor.
+# Se precalculan al importar para que el calculo de vuelto no reordene listas.
+ALL_DENOMINATIONS = tuple(
+    sorted({value for value, _ in BILL_DENOMINATIONS + COIN_DENOMINATIONS}, reverse=True)
+)
+
+# Nombre de cada denominacion por valor
+DENOMINATION_LABELS = dict(COIN_DENOMINATIONS + BILL_DENOMINATIONS)
+
 
 # ==============================================================================
 # CONFIGURACION POR DEFECTO
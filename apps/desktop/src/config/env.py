@@ -0,0 +1,102 @@
+"""
+Lectura liviana del entorno de la aplicacion.
+
+Lee variables de entorno y del archivo .env. La usa Settings y
+tambien los caminos de arranque que solo necesitan un par de valores
+(por ejemplo `--version`) sin construir Settings.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from dotenv import dotenv_values
+
+
+# Valores por defecto compartidos con Settings
+DEFAULT_APP_NAME = "Cianbox POS"
+DEFAULT_APP_VERSION = "1.0.0"
+
+
+@lru_cache(maxsize=1)
+def get_base_path() -> Path:
+    """
+    Obtiene el directorio base de la aplicacion (calculado una vez).
+
+    Returns:
+        Path absoluto y resuelto al directorio raiz del proyecto desktop
+    """
+    return Path(__file__).resolve().parents[2]
+
+
+def get_env_file() -> Path:
+    """
+    Obtiene la ruta del archivo .env.
+
+    Returns:
+        Path al archivo .env en el directorio base
+    """
+    return get_base_path() / ".env"
+
+
+@lru_cache(maxsize=4)
+def _parse_env_file(path: str, mtime: float) -> Dict[str, Optional[str]]:
+    """
+    Parsea el archivo .env (cacheado por ruta y fecha de modificacion).
+
+    Args:
+        path: Ruta al archivo
+        mtime: Fecha de modificacion, invalida el cache si cambia
+
+    Returns:
+        Diccionario de variables del archivo
+    """
+    return dotenv_values(path, encoding="utf-8")
+
+
+def load_env_file() -> Dict[str, Optional[str]]:
+    """
+    Obtiene las variables del archivo .env.
+
+    Returns:
+        Diccionario de variables (vacio si no existe el archivo)
+    """
+    path = get_env_file()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    return _parse_env_file(str(path), mtime)
+
+
+def get_env_value(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Obtiene una variable respetando la prioridad de Settings.
+
+    Orden: variables de entorno del sistema, archivo .env, default.
+
+    Args:
+        name: Nombre de la variable
+        default: Valor por defecto
+
+    Returns:
+        Valor de la variable (default si no esta definida)
+    """
+    value = os.environ.get(name)
+    if value is None:
+        value = load_env_file().get(name)
+    return default if value is None else value
+
+
+def get_app_info() -> Tuple[str, str]:
+    """
+    Obtiene nombre y version de la aplicacion sin cargar Settings.
+
+    Returns:
+        Tupla (APP_NAME, APP_VERSION)
+    """
+    return (
+        get_env_value("APP_NAME", DEFAULT_APP_NAME),
+        get_env_value("APP_VERSION", DEFAULT_APP_VERSION),
+    )
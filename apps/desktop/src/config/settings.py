@@ -1,102 +1,168 @@
 """
 Configuracion global de la aplicacion.
 
-Carga variables de entorno y proporciona configuracion tipada usando Pydantic.
-Soporta archivo .env y variables de entorno del sistema.
+Carga variables de entorno y proporciona configuracion tipada como
+dataclass. Soporta archivo .env y variables de entorno del sistema.
 """
 
 import os
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set
 
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from .env import DEFAULT_APP_NAME, DEFAULT_APP_VERSION, get_base_path, get_env_value
 
 
-def get_base_path() -> Path:
+# Directorios ya verificados en este proceso
+_ready_dirs: Set[str] = set()
+
+
+@lru_cache(maxsize=16)
+def _resolve_path(relative_path: str) -> Path:
     """
-    Obtiene el directorio base de la aplicacion.
+    Resuelve una ruta contra el directorio base (cacheado por ruta).
+
+    Args:
+        relative_path: Ruta relativa desde el directorio base (o absoluta)
 
     Returns:
-        Path al directorio raiz del proyecto desktop
+        Path absoluto
     """
-    return Path(__file__).parent.parent.parent
+    path = Path(relative_path)
+    if path.is_absolute():
+        return path
+    return get_base_path() / path
+
+
+# Valores aceptados para campos booleanos
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+
+LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
 
 
-class Settings(BaseSettings):
+def _to_bool(name: str, value: str) -> bool:
+    """
+    Convierte un valor de entorno a bool.
+
+    Args:
+        name: Nombre de la variable (para el mensaje de error)
+        value: Valor leido
+
+    Returns:
+        Valor booleano
+
+    Raises:
+        ValueError: Si el valor no es un booleano reconocido
+    """
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise ValueError(f"{name}: valor booleano invalido: {value!r}")
+
+
+def _to_int(name: str, value: str, minimum: int, maximum: int) -> int:
+    """
+    Convierte un valor de entorno a int dentro de un rango.
+
+    Args:
+        name: Nombre de la variable (para el mensaje de error)
+        value: Valor leido
+        minimum: Minimo permitido
+        maximum: Maximo permitido
+
+    Returns:
+        Valor entero
+
+    Raises:
+        ValueError: Si no es un entero o esta fuera de rango
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name}: entero invalido: {value!r}") from None
+    if not minimum <= number <= maximum:
+        raise ValueError(f"{name}: debe estar entre {minimum} y {maximum}")
+    return number
+
+
+@dataclass(slots=True)
+class Settings:
     """
     Configuracion de la aplicacion.
 
-    Los valores se cargan en orden de prioridad:
+    Los valores se cargan con Settings.from_env() en orden de prioridad:
     1. Variables de entorno del sistema
     2. Archivo .env en el directorio raiz
     3. Valores por defecto definidos aqui
 
     Attributes:
         API_URL: URL base de la API de Cianbox POS
-        API_TIMEOUT: Timeout de requests HTTP en segundos
+        API_TIMEOUT: Timeout de requests HTTP en segundos (5 a 120)
         APP_NAME: Nombre de la aplicacion
         APP_VERSION: Version de la aplicacion
         DEBUG: Modo debug activo
         DATABASE_PATH: Ruta relativa a la base de datos SQLite
-        LOG_LEVEL: Nivel de logging (DEBUG, INFO, WARNING, ERROR)
+        LOG_LEVEL: Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         LOG_PATH: Ruta relativa al directorio de logs
     """
 
-    model_config = SettingsConfigDict(
-        env_file=str(get_base_path() / ".env"),
-        env_file_encoding="utf-8",
-        case_sensitive=True,
-        extra="ignore",
-    )
-
     # API Backend
-    API_URL: str = Field(
-        default="https://cianbox-pos-api.ews-cdn.link",
-        description="URL base de la API de Cianbox POS",
-    )
-    API_TIMEOUT: int = Field(
-        default=30,
-        description="Timeout de requests HTTP en segundos",
-        ge=5,
-        le=120,
-    )
+    API_URL: str = "https://cianbox-pos-api.ews-cdn.link"
+    API_TIMEOUT: int = 30
 
     # Aplicacion
-    APP_NAME: str = Field(
-        default="Cianbox POS",
-        description="Nombre de la aplicacion",
-    )
-    APP_VERSION: str = Field(
-        default="1.0.0",
-        description="Version de la aplicacion",
-    )
-    DEBUG: bool = Field(
-        default=False,
-        description="Modo debug activo",
-    )
+    APP_NAME: str = DEFAULT_APP_NAME
+    APP_VERSION: str = DEFAULT_APP_VERSION
+    DEBUG: bool = False
 
     # Base de datos
-    DATABASE_PATH: str = Field(
-        default="data/cianbox_pos.db",
-        description="Ruta relativa a la base de datos SQLite",
-    )
+    DATABASE_PATH: str = "data/cianbox_pos.db"
 
     # Logging
-    LOG_LEVEL: str = Field(
-        default="INFO",
-        description="Nivel de logging",
-        pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$",
-    )
-    LOG_PATH: str = Field(
-        default="logs",
-        description="Ruta relativa al directorio de logs",
-    )
+    LOG_LEVEL: str = "INFO"
+    LOG_PATH: str = "logs"
 
     # Credenciales guardadas (no en .env, se cargan dinamicamente)
-    _saved_tenant: Optional[str] = None
-    _saved_email: Optional[str] = None
+    _saved_tenant: Optional[str] = field(default=None, init=False, repr=False)
+    _saved_email: Optional[str] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Valida los campos con restricciones."""
+        if not 5 <= self.API_TIMEOUT <= 120:
+            raise ValueError("API_TIMEOUT: debe estar entre 5 y 120")
+        if self.LOG_LEVEL not in LOG_LEVELS:
+            raise ValueError(f"LOG_LEVEL: nivel invalido: {self.LOG_LEVEL!r}")
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Crea la configuracion desde el entorno y el archivo .env.
+
+        Returns:
+            Instancia de Settings
+
+        Raises:
+            ValueError: Si algun valor es invalido
+        """
+        values = {}
+        for name in _STR_FIELDS:
+            value = get_env_value(name)
+            if value is not None:
+                values[name] = value
+
+        timeout = get_env_value("API_TIMEOUT")
+        if timeout is not None:
+            values["API_TIMEOUT"] = _to_int("API_TIMEOUT", timeout, 5, 120)
+
+        debug = get_env_value("DEBUG")
+        if debug is not None:
+            values["DEBUG"] = _to_bool("DEBUG", debug)
+
+        return cls(**values)
 
     @property
     def base_path(self) -> Path:
@@ -134,21 +200,25 @@ class Settings(BaseSettings):
         Returns:
             Path absoluto
         """
-        path = Path(relative_path)
-        if path.is_absolute():
-            return path
-        return self.base_path / path
+        return _resolve_path(relative_path)
 
     def ensure_directories(self) -> None:
         """
         Crea los directorios necesarios si no existen.
 
+        Cada ruta se verifica una sola vez por proceso.
+
         Crea:
             - Directorio de base de datos
             - Directorio de logs
         """
-        self.database_file.parent.mkdir(parents=True, exist_ok=True)
-        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        for directory in (self.data_dir, self.logs_dir):
+            path = str(directory)
+            if path in _ready_dirs:
+                continue
+            if not os.path.isdir(path):
+                os.makedirs(path, exist_ok=True)
+            _ready_dirs.add(path)
 
     def get_saved_tenant(self) -> Optional[str]:
         """Obtiene el ultimo tenant usado."""
@@ -177,16 +247,44 @@ class Settings(BaseSettings):
         self._saved_email = email
 
 
-@lru_cache()
+# Campos de texto que se leen sin conversion
+_STR_FIELDS = (
+    "API_URL",
+    "APP_NAME",
+    "APP_VERSION",
+    "DATABASE_PATH",
+    "LOG_LEVEL",
+    "LOG_PATH",
+)
+
+
+# Instancia global (singleton)
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
     """
     Obtiene la instancia de configuracion (singleton).
 
-    Usa cache para evitar recargar la configuracion en cada llamada.
+    Se crea una sola vez para evitar recargar la configuracion
+    en cada llamada.
 
     Returns:
         Instancia de Settings
     """
-    settings = Settings()
-    settings.ensure_directories()
-    return settings
+    global _settings
+    if _settings is None:
+        settings = Settings.from_env()
+        settings.ensure_directories()
+        _settings = settings
+    return _settings
+
+
+def reset_settings() -> None:
+    """
+    Descarta la configuracion cargada.
+
+    Util para testing o cuando cambian las variables de entorno.
+    """
+    global _settings
+    _settings = None
@@ -12,8 +12,10 @@ categorias y promociones, permitiendo operacion offline.
 
 Optimizaciones SQLite aplicadas:
 - WAL mode para mejor concurrencia
+- Un motor de escritura y un pool de lectura de solo lectura
 - Foreign keys habilitadas
 - Cache en memoria (64MB)
+- busy_timeout de 30s, temp_store en memoria y mmap (256MB)
 
 Uso recomendado:
     >>> from src.db import session_scope
@@ -26,30 +28,42 @@ Para inicializar la base de datos:
 
 Exports:
     - Base: Clase base para modelos SQLAlchemy
-    - get_engine: Obtiene el motor SQLite (singleton)
+    - get_engine: Obtiene el motor SQLite de escritura (singleton)
+    - get_read_engine: Obtiene el motor SQLite de solo lectura (singleton)
     - get_session: Crea una nueva sesion
     - get_session_factory: Factory de sesiones (singleton)
+    - get_read_session_factory: Factory de sesiones de lectura (singleton)
     - session_scope: Context manager con commit/rollback automatico
+    - SyncContext: Fecha y hora compartida por las escrituras de una sesion
     - init_database: Crea todas las tablas
     - drop_all_tables: Elimina todas las tablas (DESTRUCTIVO)
+    - reset_database: Cierra los motores y descarta los singletons
 """
 
 from .database import (
     Base,
     get_engine,
+    get_read_engine,
     get_session,
     get_session_factory,
+    get_read_session_factory,
     session_scope,
+    SyncContext,
     init_database,
     drop_all_tables,
+    reset_database,
 )
 
 __all__ = [
     "Base",
     "get_engine",
+    "get_read_engine",
     "get_session",
     "get_session_factory",
+    "get_read_session_factory",
     "session_scope",
+    "SyncContext",
     "init_database",
     "drop_all_tables",
+    "reset_database",
 ]
@@ -2,20 +2,66 @@
 Configuracion de base de datos SQLAlchemy.
 
 Proporciona:
-- Motor de base de datos SQLite
+- Motor de base de datos SQLite (un escritor + pool de lectores)
 - Factory de sesiones
 - Context manager para sesiones
 - Inicializacion de esquema
 """
 
+import json
+import os
+import sqlite3
+import time
 from contextlib import contextmanager
-from functools import lru_cache
-from typing import Generator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Generator, Optional
+from urllib.parse import quote
 
 from loguru import logger
-from sqlalchemy import create_engine, event
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import URL, Engine
 from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from .fts import FTS_INDEXES
+
+# Parser JSON rapido para columnas JSON (opcional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# SQLite admite un solo escritor; en modo WAL los lectores no lo bloquean
+WRITE_POOL_SIZE = 1
+READ_POOL_SIZE = max(4, os.cpu_count() or 1)
+
+# Intervalo minimo entre PRAGMA optimize de una misma conexion (segundos)
+OPTIMIZE_INTERVAL = 60.0
+
+
+# Clave de SyncContext en session.info
+SYNC_CONTEXT_KEY = "sync_context"
+
+
+# Indices reemplazados por otros; se eliminan de bases existentes
+OBSOLETE_INDEXES = (
+    "ix_sale_items_product_id",
+    "ix_sale_items_product",
+    "ix_products_barcode",
+    "ix_products_sku",
+    "ix_products_tenant_active",
+    "ix_sales_tenant_id",
+    "ix_sales_sale_date",
+    "ix_sales_tenant_status",
+    "ix_customers_tenant_active",
+    "ix_customers_search",
+    "ix_customers_search_cov",
+    "ix_offline_queue_tenant_id",
+)
 
 
 class Base(DeclarativeBase):
@@ -28,54 +74,219 @@ class Base(DeclarativeBase):
     pass
 
 
+# Pragmas de conexion, aplicados a cada conexion nueva en un solo llamado
+SQLITE_PRAGMAS = """
+PRAGMA foreign_keys=ON;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-64000;
+PRAGMA busy_timeout=30000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
+
+
+@event.listens_for(Engine, "first_connect")
+def set_sqlite_wal(dbapi_connection, connection_record):
+    """
+    Activa el modo WAL en la primera conexion de cada motor.
+
+    journal_mode=WAL queda guardado en el archivo de base de datos,
+    asi que no hace falta repetirlo en cada conexion del pool.
+    """
+    dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """
     Configura pragmas de SQLite para mejor rendimiento.
 
-    Se ejecuta cada vez que se establece una nueva conexion.
+    Se ejecuta cada vez que se establece una nueva conexion. Son
+    pragmas con alcance de conexion (el modo WAL lo activa
+    set_sqlite_wal una sola vez):
+    - foreign_keys: integridad referencial
+    - synchronous=NORMAL: balance entre seguridad y velocidad
+    - cache_size: 64MB de cache en memoria
+    - busy_timeout: esperar el lock 30s (igual que connect_args)
+    - temp_store: tablas temporales en memoria
+    - mmap_size: lectura de paginas via mmap (256MB)
+    """
+    dbapi_connection.executescript(SQLITE_PRAGMAS)
+
+
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    """
+    Desactiva el BEGIN implicito de pysqlite en el motor de escritura.
+
+    Asi la transaccion la abre _begin_immediate en lugar del driver.
     """
-    cursor = dbapi_connection.cursor()
-    # Habilitar foreign keys
-    cursor.execute("PRAGMA foreign_keys=ON")
-    # Modo WAL para mejor concurrencia
-    cursor.execute("PRAGMA journal_mode=WAL")
-    # Sincronizacion normal (balance entre seguridad y velocidad)
-    cursor.execute("PRAGMA synchronous=NORMAL")
-    # Cache en memoria
-    cursor.execute("PRAGMA cache_size=-64000")  # 64MB
-    cursor.close()
+    dbapi_connection.isolation_level = None
+
+
+def _begin_immediate(conn):
+    """
+    Abre las transacciones de escritura con BEGIN IMMEDIATE.
+
+    Toma el lock de escritura al inicio: si otro escritor lo tiene, se
+    espera el busy timeout en lugar de fallar a mitad de la transaccion.
+    """
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _optimize_on_checkin(dbapi_connection, connection_record):
+    """
+    Ejecuta PRAGMA optimize al devolver una conexion de escritura al pool.
+
+    SQLite solo corre ANALYZE sobre las tablas cuyas estadisticas
+    quedaron desactualizadas. Se limita a una vez por minuto por
+    conexion para no pagarlo en cada checkin.
+    """
+    if dbapi_connection is None:
+        return
+
+    now = time.monotonic()
+    last_run = connection_record.info.get("optimized_at")
+    if last_run is not None and now - last_run < OPTIMIZE_INTERVAL:
+        return
+
+    connection_record.info["optimized_at"] = now
+    try:
+        dbapi_connection.execute("PRAGMA optimize")
+    except Exception as e:
+        logger.debug(f"PRAGMA optimize omitido: {e}")
+
+
+# Instancias globales (singletons)
+_engine: Optional[Engine] = None
+_read_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_read_session_factory: Optional[sessionmaker] = None
+
+
+def _json_serializer(value) -> str:
+    """Serializa columnas JSON (payloads de la cola offline)."""
+    if HAS_ORJSON:
+        # OPT_NON_STR_KEYS: claves no str como json.dumps ({1: x} -> {"1": x})
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+def _json_deserializer(value: str):
+    """Parsea columnas JSON."""
+    if HAS_ORJSON:
+        return orjson.loads(value)
+    return json.loads(value)
 
 
-@lru_cache()
 def get_engine() -> Engine:
     """
-    Obtiene el motor de base de datos (singleton).
+    Obtiene el motor de escritura de la base de datos (singleton).
+
+    Usa una sola conexion para que las escrituras se encolen en el
+    pool en lugar de chocar con SQLITE_BUSY.
 
     Returns:
         Engine de SQLAlchemy configurado para SQLite
     """
+    global _engine
+    if _engine is not None:
+        return _engine
+
     from src.config import get_settings
 
     settings = get_settings()
-    database_url = settings.database_url
+    # URL.create en lugar de parsear settings.database_url: una ruta con
+    # ? o % se leeria como parametros o escapes de la URL
+    database_url = URL.create("sqlite", database=str(settings.database_file))
 
-    logger.debug(f"Creando engine de base de datos: {database_url}")
+    logger.debug(f"Creando engine de base de datos: {settings.database_file}")
 
+    # Sin executemany_mode: es una opcion de psycopg2. Con SQLite las
+    # escrituras en lote (executemany) corren dentro del proceso, sin
+    # viajes de red que agrupar
     engine = create_engine(
         database_url,
         echo=settings.DEBUG,  # Log SQL queries en modo debug
-        pool_pre_ping=True,
+        poolclass=QueuePool,
+        pool_size=WRITE_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=30,
         connect_args={
             "check_same_thread": False,  # Permitir uso multi-hilo
             "timeout": 30,
         },
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
     )
 
+    event.listen(engine, "connect", _disable_pysqlite_begin)
+    event.listen(engine, "begin", _begin_immediate)
+    event.listen(engine, "checkin", _optimize_on_checkin)
+
+    _engine = engine
     return engine
 
 
-@lru_cache()
+def get_read_engine() -> Engine:
+    """
+    Obtiene el motor de solo lectura de la base de datos (singleton).
+
+    Abre el archivo con mode=ro y un pool de varias conexiones, para
+    que las consultas corran en paralelo con el escritor (modo WAL).
+
+    Returns:
+        Engine de SQLAlchemy de solo lectura
+    """
+    global _read_engine
+    if _read_engine is not None:
+        return _read_engine
+
+    from src.config import get_settings
+
+    settings = get_settings()
+
+    db_path = settings.database_file.as_posix()
+
+    # Crear el archivo y activar WAL antes de abrir conexiones de solo
+    # lectura. Con una conexion propia y no del pool de escritura: su
+    # unica conexion puede estar tomada por la sincronizacion
+    bootstrap = sqlite3.connect(db_path, timeout=30)
+    try:
+        bootstrap.execute("PRAGMA journal_mode=WAL")
+    finally:
+        bootstrap.close()
+
+    # Solo mode=ro: nolock=1 / immutable=1 desactivarian el protocolo de
+    # locks de WAL (marcas de lectura en -shm) mientras el motor de
+    # escritura sigue escribiendo y haciendo checkpoint sobre el mismo
+    # archivo, y los lectores podrian ver paginas inconsistentes
+    logger.debug(f"Creando engine de lectura: {db_path} (pool={READ_POOL_SIZE})")
+
+    # URL.create no reinterpreta la ruta: se pasa a SQLite como URI,
+    # con ?, # y % escapados
+    read_url = URL.create(
+        "sqlite",
+        database=f"file:{quote(db_path, safe='/:')}",
+        query={"mode": "ro", "uri": "true"},
+    )
+
+    _read_engine = create_engine(
+        read_url,
+        echo=settings.DEBUG,
+        poolclass=QueuePool,
+        pool_size=READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=30,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": 30,
+        },
+        json_serializer=_json_serializer,
+        json_deserializer=_json_deserializer,
+    )
+    return _read_engine
+
+
 def get_session_factory() -> sessionmaker:
     """
     Obtiene la factory de sesiones (singleton).
@@ -83,44 +294,88 @@ def get_session_factory() -> sessionmaker:
     Returns:
         sessionmaker configurado
     """
-    engine = get_engine()
-    return sessionmaker(
-        bind=engine,
-        autocommit=False,
-        autoflush=False,
-        expire_on_commit=False,
-    )
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(
+            bind=get_engine(),
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _session_factory
+
+
+def get_read_session_factory() -> sessionmaker:
+    """
+    Obtiene la factory de sesiones de solo lectura (singleton).
 
+    Returns:
+        sessionmaker ligado al motor de lectura
+    """
+    global _read_session_factory
+    if _read_session_factory is None:
+        _read_session_factory = sessionmaker(
+            bind=get_read_engine(),
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _read_session_factory
+
+
+def reset_database() -> None:
+    """
+    Cierra los motores y descarta los singletons de base de datos.
+
+    Util para testing o cuando cambia la ruta de la base de datos.
+    """
+    global _engine, _read_engine, _session_factory, _read_session_factory
+
+    for engine in (_read_engine, _engine):
+        if engine is not None:
+            engine.dispose()
+
+    _engine = None
+    _read_engine = None
+    _session_factory = None
+    _read_session_factory = None
 
-def get_session() -> Session:
+
+def get_session(readonly: bool = False) -> Session:
     """
     Crea una nueva sesion de base de datos.
 
+    Args:
+        readonly: Usar el motor de solo lectura
+
     Returns:
         Nueva instancia de Session
 
     Note:
         La sesion debe ser cerrada manualmente o usar el context manager.
     """
-    factory = get_session_factory()
+    factory = get_read_session_factory() if readonly else get_session_factory()
     return factory()
 
 
 @contextmanager
-def session_scope() -> Generator[Session, None, None]:
+def session_scope(readonly: bool = False) -> Generator[Session, None, None]:
     """
     Context manager para sesiones de base de datos.
 
     Maneja automaticamente commit/rollback y cierre de sesion.
 
+    Args:
+        readonly: Usar el pool de lectura (consultas sin escrituras)
+
     Yields:
         Session activa
 
     Example:
-        >>> with session_scope() as session:
+        >>> with session_scope(readonly=True) as session:
         ...     products = session.query(Product).all()
     """
-    session = get_session()
+    session = get_session(readonly)
     try:
         yield session
         session.commit()
@@ -132,6 +387,87 @@ def session_scope() -> Generator[Session, None, None]:
         session.close()
 
 
+@dataclass
+class SyncContext:
+    """
+    Datos compartidos por las escrituras de una misma sesion.
+
+    Se guarda en session.info: todas las filas de un lote de
+    sincronizacion llevan la misma marca de tiempo y datetime.now()
+    se llama una vez por sesion en lugar de una vez por fila.
+
+    Attributes:
+        now: Fecha y hora (local) del lote
+    """
+
+    now: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def get(cls, session: Session) -> "SyncContext":
+        """
+        Obtiene el contexto de la sesion, creandolo si no existe.
+
+        Args:
+            session: Sesion de base de datos
+
+        Returns:
+            SyncContext de la sesion
+        """
+        context = session.info.get(SYNC_CONTEXT_KEY)
+        if context is None:
+            context = session.info[SYNC_CONTEXT_KEY] = cls()
+        return context
+
+
+def _load_model_modules() -> None:
+    """
+    Importa todos los modulos del paquete de modelos.
+
+    Registra las tablas en Base.metadata solo cuando hace falta crear
+    el esquema, sin mantener una lista de modelos a mano.
+    """
+    import importlib
+    import pkgutil
+
+    import src.models as models_package
+
+    for module_info in pkgutil.iter_modules(models_package.__path__):
+        importlib.import_module(f"{models_package.__name__}.{module_info.name}")
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    """
+    Agrega a las tablas existentes las columnas nuevas de los modelos.
+
+    create_all no modifica tablas que ya existen. Solo se agregan
+    columnas que SQLite admite con ALTER TABLE ADD COLUMN (nullables o
+    con default de servidor); el resto se informa en el log.
+
+    Args:
+        engine: Motor de escritura
+    """
+    # Una sola conexion: el motor de escritura no tiene otra libre
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+
+                if column.primary_key or (not column.nullable and column.server_default is None):
+                    logger.warning(
+                        f"No se puede agregar la columna {table.name}.{column.name}: "
+                        f"recrear la base de datos local"
+                    )
+                    continue
+
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN {ddl}')
+                logger.info(f"Columna agregada: {table.name}.{column.name}")
+
+
 def init_database() -> None:
     """
     Inicializa la base de datos.
@@ -143,27 +479,11 @@ def init_database() -> None:
 
     settings = get_settings()
 
-    # Asegurar que existe el directorio
-    settings.database_file.parent.mkdir(parents=True, exist_ok=True)
+    # Asegurar que existe el directorio (verificado una vez por proceso)
+    settings.ensure_directories()
 
     # Importar modelos para registrarlos en el metadata
-    from src.models import (
-        User,
-        Tenant,
-        Branch,
-        Category,
-        Brand,
-        Product,
-        ProductPrice,
-        PriceList,
-        Promotion,
-        OfflineQueue,
-        AppConfig,
-        Device,
-        Customer,
-        Sale,
-        SaleItem,
-    )
+    _load_model_modules()
 
     engine = get_engine()
 
@@ -172,6 +492,24 @@ def init_database() -> None:
     # Crear todas las tablas
     Base.metadata.create_all(bind=engine)
 
+    # create_all tampoco agrega columnas nuevas a tablas existentes
+    _add_missing_columns(engine)
+
+    with engine.begin() as conn:
+        # create_all no agrega indices a tablas existentes: crear los nuevos.
+        # IF NOT EXISTS: la reflexion de checkfirst no ve los indices de
+        # expresiones (lower(email)) y los intentaria crear de nuevo
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+        for index_name in OBSOLETE_INDEXES:
+            conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index_name}"')
+
+        # Los indices FTS5 se crean con su tabla; en bases existentes, aca
+        for fts_index in FTS_INDEXES:
+            fts_index.create(conn)
+
     logger.info("Base de datos inicializada correctamente")
 
 
@@ -0,0 +1,213 @@
+"""
+Indices de texto completo (FTS5) sobre tablas del modelo.
+
+Cada FtsIndex es una tabla virtual FTS5 de contenido externo: solo
+guarda el indice y los datos se leen de la tabla original por rowid.
+Triggers AFTER INSERT/UPDATE/DELETE lo mantienen sincronizado.
+
+Se usa el tokenizer trigram: resuelve busquedas por subcadena (igual
+que LIKE '%texto%') con terminos de 3 o mas caracteres. Para terminos
+mas cortos, o si el SQLite disponible no tiene FTS5, los repositorios
+siguen usando LIKE. Un texto de varias palabras (todas de 3 o mas
+caracteres) busca cada palabra en cualquier orden y columna.
+
+Uso:
+    >>> PRODUCTS_FTS = FtsIndex("products_fts", "products", ("name", "sku"))
+    >>> PRODUCTS_FTS.attach(Product.__table__)
+    >>> clause = PRODUCTS_FTS.match(session.connection(), "coca")
+"""
+
+from typing import List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import Table
+from sqlalchemy.sql.elements import TextClause
+
+
+# Largo minimo de termino para el tokenizer trigram
+FTS_MIN_LENGTH = 3
+
+
+def _quote(term: str) -> str:
+    """Frase FTS5 entre comillas: el texto se busca como subcadena literal."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+# Indices registrados con attach (init_database los crea en bases existentes)
+FTS_INDEXES: List["FtsIndex"] = []
+
+
+class FtsIndex:
+    """
+    Indice FTS5 de contenido externo sobre una tabla.
+
+    Attributes:
+        name: Nombre de la tabla virtual
+        table: Tabla indexada
+        columns: Columnas indexadas
+    """
+
+    def __init__(self, name: str, table: str, columns: Tuple[str, ...]):
+        self.name = name
+        self.table = table
+        self.columns = columns
+
+    def _ddl(self) -> Tuple[str, ...]:
+        """Sentencias de creacion de la tabla virtual y sus triggers."""
+        columns = ", ".join(self.columns)
+        new = ", ".join(f"new.{column}" for column in self.columns)
+        old = ", ".join(f"old.{column}" for column in self.columns)
+        insert_new = f"INSERT INTO {self.name}(rowid, {columns}) VALUES (new.rowid, {new});"
+        delete_old = (
+            f"INSERT INTO {self.name}({self.name}, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old});"
+        )
+
+        return (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5("
+            f"{columns}, content='{self.table}', content_rowid='rowid', "
+            f"tokenize='trigram')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai AFTER INSERT ON {self.table} "
+            f"BEGIN {insert_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad AFTER DELETE ON {self.table} "
+            f"BEGIN {delete_old} END",
+            # Solo cambios en columnas indexadas (no stock, saldos, etc.)
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au "
+            f"AFTER UPDATE OF {columns} ON {self.table} "
+            f"BEGIN {delete_old} {insert_new} END",
+        )
+
+    def _table_exists(self, connection: Connection) -> bool:
+        """Consulta sqlite_master por la tabla virtual."""
+        return connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.name,),
+        ).first() is not None
+
+    def _stored_columns(self, connection: Connection) -> Tuple[str, ...]:
+        """Columnas de la tabla virtual existente."""
+        return tuple(
+            row[1]
+            for row in connection.exec_driver_sql(f"PRAGMA table_info({self.name})")
+        )
+
+    def _drop_triggers(self, connection: Connection) -> None:
+        """Elimina los triggers de sincronizacion."""
+        for suffix in ("ai", "ad", "au"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {self.name}_{suffix}")
+
+    def create(self, connection: Connection) -> bool:
+        """
+        Crea el indice y sus triggers si no existen.
+
+        Si el indice es nuevo se carga con las filas existentes. Si
+        existe con otras columnas se vuelve a crear.
+
+        Args:
+            connection: Conexion con transaccion abierta
+
+        Returns:
+            True si el indice esta disponible
+        """
+        if connection.dialect.name != "sqlite":
+            return False
+
+        exists = self._table_exists(connection)
+        if exists and self._stored_columns(connection) != self.columns:
+            logger.info(f"Recreando indice FTS5 {self.name} (cambiaron las columnas)")
+            self.drop(connection)
+            exists = False
+
+        try:
+            for statement in self._ddl():
+                connection.exec_driver_sql(statement)
+        except OperationalError as e:
+            logger.warning(f"Indice FTS5 {self.name} no disponible: {e}")
+            return False
+
+        if not exists:
+            connection.exec_driver_sql(
+                f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+            )
+        connection.info[self.name] = True
+        return True
+
+    def drop(self, connection: Connection) -> None:
+        """
+        Elimina el indice y sus triggers.
+
+        Args:
+            connection: Conexion con transaccion abierta
+        """
+        if connection.dialect.name == "sqlite":
+            self._drop_triggers(connection)
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {self.name}")
+            connection.info.pop(self.name, None)
+
+    def exists(self, connection: Connection) -> bool:
+        """
+        Indica si la base tiene el indice.
+
+        El resultado se guarda en la conexion DBAPI (una consulta a
+        sqlite_master por conexion del pool).
+
+        Args:
+            connection: Conexion SQLAlchemy
+
+        Returns:
+            True si existe la tabla virtual
+        """
+        info = connection.info
+        if self.name not in info:
+            info[self.name] = (
+                connection.dialect.name == "sqlite" and self._table_exists(connection)
+            )
+        return info[self.name]
+
+    def match(
+        self,
+        connection: Connection,
+        query: str,
+        columns: Optional[Tuple[str, ...]] = None,
+    ) -> Optional[TextClause]:
+        """
+        Condicion `rowid IN (... MATCH ...)` para un texto de busqueda.
+
+        Args:
+            connection: Conexion de la sesion
+            query: Texto de busqueda
+            columns: Columnas donde buscar (por defecto, todas)
+
+        Returns:
+            Condicion para el WHERE, o None si hay que usar LIKE
+            (termino corto o indice no disponible)
+        """
+        if len(query) < FTS_MIN_LENGTH or not self.exists(connection):
+            return None
+
+        terms = query.split()
+        if len(terms) > 1 and all(len(term) >= FTS_MIN_LENGTH for term in terms):
+            # Todas las palabras, en cualquier orden y columna
+            expression = "(" + " AND ".join(_quote(term) for term in terms) + ")"
+        else:
+            expression = _quote(query)
+        if columns:
+            expression = "{" + " ".join(columns) + "} : " + expression
+        return text(
+            f"{self.table}.rowid IN (SELECT rowid FROM {self.name} "
+            f"WHERE {self.name} MATCH :fts_query)"
+        ).bindparams(fts_query=expression)
+
+    def attach(self, table: Table) -> None:
+        """
+        Crea y elimina el indice junto con la tabla del modelo.
+
+        Args:
+            table: Tabla indexada (Model.__table__)
+        """
+        event.listen(table, "after_create", lambda target, connection, **kw: self.create(connection))
+        event.listen(table, "before_drop", lambda target, connection, **kw: self.drop(connection))
+        FTS_INDEXES.append(self)
@@ -0,0 +1,71 @@
+"""
+Consultas de solo lectura para listados.
+
+Devuelven filas (Row) con las columnas necesarias en lugar de
+instancias ORM: no se hidratan objetos, no se instrumentan atributos
+ni se cargan en el identity map. Usar solo para datos que la UI
+muestra sin modificar; el CRUD sigue pasando por los repositorios.
+
+Uso:
+    >>> from src.db.queries import load_customer_rows
+    >>> with session_scope(readonly=True) as session:
+    ...     rows = load_customer_rows(session, tenant_id, search="perez")
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from src.models import Customer
+from src.models.customer import customer_text_filter
+
+
+# Columnas del listado de clientes
+CUSTOMER_LIST_COLUMNS = (
+    Customer.id,
+    Customer.name,
+    Customer.trade_name,
+    Customer.tax_id,
+    Customer.email,
+    Customer.phone,
+    Customer.mobile,
+    Customer.city,
+    Customer.customer_type,
+    Customer.credit_limit,
+    Customer.global_discount,
+)
+
+
+def load_customer_rows(
+    session: Session,
+    tenant_id: str,
+    search: Optional[str] = None,
+    limit: int = 500,
+) -> List[Row]:
+    """
+    Obtiene las filas del listado de clientes activos.
+
+    Aplica el mismo filtro de texto que CustomerRepository.search.
+
+    Args:
+        session: Sesion de base de datos
+        tenant_id: ID del tenant
+        search: Texto de busqueda (nombre, documento, email, telefono)
+        limit: Limite de resultados
+
+    Returns:
+        Lista de filas con CUSTOMER_LIST_COLUMNS, ordenadas por nombre
+    """
+    stmt = (
+        select(*CUSTOMER_LIST_COLUMNS)
+        .where(Customer.tenant_id == tenant_id)
+        .where(Customer.is_active == True)
+    )
+
+    if search:
+        stmt = stmt.where(customer_text_filter(session.connection(), search))
+
+    stmt = stmt.order_by(Customer.name).limit(limit)
+
+    return list(session.execute(stmt).all())
@@ -0,0 +1,79 @@
+"""
+Cache en memoria de consultas sobre tablas de referencia.
+
+Categorias y marcas cambian solo al sincronizar y se listan en cada
+panel de la UI. El resultado de cada consulta se guarda como copias
+desacopladas de toda sesion; en un acierto se pasan a la sesion con
+merge(load=False), sin SQL.
+
+Las entradas se descartan con invalidate() despues de escribir las
+tablas (SyncService lo llama al terminar de importar).
+
+Uso:
+    >>> categories = REFERENCE_CACHE.get(
+    ...     session, ("root_categories", tenant_id), lambda: list(...)
+    ... )
+    >>> REFERENCE_CACHE.invalidate()
+"""
+
+import pickle
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+from sqlalchemy.orm import Session
+
+
+class ReferenceCache:
+    """
+    Resultados de consultas por clave, compartidos entre sesiones.
+
+    Thread-safe: la sincronizacion corre en otro hilo que la UI.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(
+        self,
+        session: Session,
+        key: Hashable,
+        loader: Callable[[], List[Any]],
+    ) -> List[Any]:
+        """
+        Obtiene el resultado cacheado o lo carga.
+
+        Args:
+            session: Sesion donde se devuelven las entidades
+            key: Clave de la consulta (nombre y parametros)
+            loader: Ejecuta la consulta en la sesion
+
+        Returns:
+            Lista de entidades de la sesion
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            generation = self._generation
+
+        if cached is None:
+            result = loader()
+            # Copias fuera de toda sesion (la sesion puede modificar las suyas)
+            detached = pickle.loads(pickle.dumps(result))
+            with self._lock:
+                # Si se invalido mientras se cargaba, el resultado ya es viejo
+                if generation == self._generation:
+                    self._entries[key] = detached
+            return result
+
+        return [session.merge(entity, load=False) for entity in cached]
+
+    def invalidate(self) -> None:
+        """Descarta todos los resultados cacheados."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+# Cache de categorias y marcas
+REFERENCE_CACHE = ReferenceCache()
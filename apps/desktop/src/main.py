@@ -7,39 +7,32 @@ Este modulo inicializa todos los componentes y lanza la aplicacion.
 import sys
 from pathlib import Path
 
-# Asegurar que el directorio src y su padre esten en el path
-src_dir = Path(__file__).parent
-parent_dir = src_dir.parent
 
-if str(parent_dir) not in sys.path:
-    sys.path.insert(0, str(parent_dir))
-if str(src_dir) not in sys.path:
-    sys.path.insert(0, str(src_dir))
-
-
-def setup_environment() -> None:
+def setup_environment(init_db: bool = True) -> None:
     """
     Configura el entorno antes de inicializar la aplicacion.
 
-    - Crea directorios necesarios
+    - Crea directorios necesarios (via get_settings)
     - Configura logging
     - Inicializa base de datos
+
+    Args:
+        init_db: Inicializar la base de datos (los comandos CLI que no
+            la usan lo omiten y no cargan los modelos)
     """
-    from config import get_settings
-    from config.logging import setup_logging
-    from db import init_database
+    from src.config import get_settings
+    from src.config.logging import setup_logging
 
+    # get_settings() ya crea los directorios de datos y logs
     settings = get_settings()
 
-    # Crear directorios necesarios
-    settings.data_dir.mkdir(parents=True, exist_ok=True)
-    settings.logs_dir.mkdir(parents=True, exist_ok=True)
-
     # Configurar logging
     setup_logging(settings)
 
     # Inicializar base de datos
-    init_database()
+    if init_db:
+        from src.db import init_database
+        init_database()
 
 
 def main() -> int:
@@ -60,7 +53,7 @@ def main() -> int:
         logger.info("=" * 60)
 
         # Importar y crear aplicacion Qt
-        from ui.app import create_application
+        from src.ui.app import create_application
         app = create_application()
 
         # Ejecutar aplicacion
@@ -141,9 +134,10 @@ def run_cli_mode() -> None:
     args = parser.parse_args()
 
     if args.version:
-        from config import get_settings
-        settings = get_settings()
-        print(f"{settings.APP_NAME} v{settings.APP_VERSION}")
+        # Camino rapido: no construye Settings
+        from src.config.env import get_app_info
+        app_name, app_version = get_app_info()
+        print(f"{app_name} v{app_version}")
         return
 
     if args.check:
@@ -164,10 +158,10 @@ def run_cli_mode() -> None:
 
 def check_connection() -> None:
     """Verifica la conexion con el servidor."""
-    from config import get_settings
-    from api import get_api_client
+    from src.config import get_settings
+    from src.api import get_api_client
 
-    setup_environment()
+    setup_environment(init_db=False)
 
     settings = get_settings()
     client = get_api_client()
@@ -190,11 +184,11 @@ def check_connection() -> None:
 
 def reset_database() -> None:
     """Reinicia la base de datos local."""
-    from config import get_settings
-    from db import init_database
+    from src.config import get_settings
+    from src.db import init_database
 
     settings = get_settings()
-    db_path = Path(settings.DATABASE_PATH)
+    db_path = settings.database_file
 
     if db_path.exists():
         confirm = input(f"Esto eliminara la base de datos en {db_path}. Continuar? [s/N]: ")
@@ -213,7 +207,7 @@ def reset_database() -> None:
 def open_logs_directory() -> None:
     """Abre el directorio de logs."""
     import subprocess
-    from config import get_settings
+    from src.config import get_settings
 
     settings = get_settings()
     logs_dir = settings.logs_dir
@@ -229,6 +223,13 @@ def open_logs_directory() -> None:
 
 
 if __name__ == "__main__":
+    # Ejecutado como script (python src/main.py): el paquete src se
+    # importa desde el directorio padre. Instalado (entry point
+    # cianbox-pos) o compilado con PyInstaller no hace falta.
+    project_dir = str(Path(__file__).resolve().parent.parent)
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+
     # Verificar si hay argumentos de CLI
     if len(sys.argv) > 1:
         run_cli_mode()
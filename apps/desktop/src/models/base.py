@@ -8,7 +8,7 @@ Proporciona funcionalidad comun para todos los modelos:
 """
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from sqlalchemy import DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column
@@ -51,6 +51,37 @@ class BaseModel(Base, TimestampMixin):
 
     __abstract__ = True
 
+    @classmethod
+    def _serialization_plan(cls) -> Tuple[Tuple[str, bool], ...]:
+        """
+        Obtiene las columnas a serializar (cacheado por clase).
+
+        Returns:
+            Tupla de (nombre de columna, es DateTime)
+        """
+        plan = cls.__dict__.get("_serialization_plan_cache")
+        if plan is None:
+            plan = tuple(
+                (column.name, isinstance(column.type, DateTime))
+                for column in cls.__table__.columns
+            )
+            cls._serialization_plan_cache = plan
+        return plan
+
+    @classmethod
+    def _pk_names(cls) -> Tuple[str, ...]:
+        """
+        Obtiene los nombres de las columnas de primary key (cacheado por clase).
+
+        Returns:
+            Tupla de nombres de columna
+        """
+        names = cls.__dict__.get("_pk_names_cache")
+        if names is None:
+            names = tuple(col.name for col in cls.__table__.primary_key)
+            cls._pk_names_cache = names
+        return names
+
     def to_dict(self, exclude: set = None) -> Dict[str, Any]:
         """
         Convierte el modelo a diccionario.
@@ -61,23 +92,22 @@ class BaseModel(Base, TimestampMixin):
         Returns:
             Diccionario con los datos del modelo
         """
-        exclude = exclude or set()
+        exclude = exclude or ()
         result = {}
 
-        for column in self.__table__.columns:
-            if column.name not in exclude:
-                value = getattr(self, column.name)
-                # Convertir datetime a ISO string
-                if isinstance(value, datetime):
-                    value = value.isoformat()
-                result[column.name] = value
+        for name, is_datetime in self._serialization_plan():
+            if name in exclude:
+                continue
+            value = getattr(self, name)
+            # Convertir datetime a ISO string
+            if is_datetime and isinstance(value, datetime):
+                value = value.isoformat()
+            result[name] = value
 
         return result
 
     def __repr__(self) -> str:
         """Representacion string del modelo."""
         class_name = self.__class__.__name__
-        # Obtener campos de primary key
-        pk_columns = [col.name for col in self.__table__.primary_key]
-        pk_values = [f"{col}={getattr(self, col)!r}" for col in pk_columns]
+        pk_values = [f"{col}={getattr(self, col)!r}" for col in self._pk_names()]
         return f"<{class_name}({', '.join(pk_values)})>"
@@ -8,6 +8,7 @@ para busqueda y seleccion en ventas.
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 
 from sqlalchemy import (
@@ -19,12 +20,19 @@ from sqlalchemy import (
     Integer,
     Numeric,
     Index,
+    event,
+    func,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from src.db.fts import FtsIndex
+
 from .base import BaseModel
 
 
+ZERO = Decimal("0")
+
+
 class CustomerType(str, Enum):
     """Tipos de cliente."""
 
@@ -107,19 +115,22 @@ class Customer(BaseModel):
 
     # Indices para busqueda
     __table_args__ = (
-        Index("ix_customers_search", "tenant_id", "name", "tax_id"),
-        Index("ix_customers_tenant_active", "tenant_id", "is_active"),
+        # Listados, busquedas y conteos de activos, ordenados por nombre
+        # (el texto se filtra con customers_fts)
+        Index("ix_customers_active_name", "tenant_id", "is_active", "name"),
         Index("ix_customers_cianbox", "tenant_id", "cianbox_id", unique=True),
+        # Clientes recientes (activos, por fecha de sincronizacion)
+        Index("ix_customers_tenant_synced", "tenant_id", "is_active", "last_synced_at"),
     )
 
-    @property
+    @cached_property
     def display_name(self) -> str:
         """Nombre para mostrar en la UI."""
         if self.trade_name:
             return self.trade_name
         return self.name
 
-    @property
+    @cached_property
     def full_contact(self) -> str:
         """Informacion de contacto formateada."""
         parts = []
@@ -131,7 +142,7 @@ class Customer(BaseModel):
             parts.append(self.email)
         return " | ".join(parts) if parts else ""
 
-    @property
+    @cached_property
     def tax_info(self) -> str:
         """Informacion fiscal formateada."""
         if self.tax_id:
@@ -150,6 +161,9 @@ class Customer(BaseModel):
 
     def to_dict(self) -> dict:
         """Convierte a diccionario para serializar."""
+        # Leer los atributos de credito una sola vez
+        credit_limit = self.credit_limit or ZERO
+        credit_balance = self.credit_balance or ZERO
         return {
             "id": self.id,
             "name": self.name,
@@ -163,9 +177,83 @@ class Customer(BaseModel):
             "mobile": self.mobile,
             "address": self.address,
             "city": self.city,
-            "credit_limit": str(self.credit_limit),
-            "credit_balance": str(self.credit_balance),
-            "available_credit": str(self.available_credit),
-            "global_discount": str(self.global_discount),
+            "credit_limit": format(credit_limit, "f"),
+            "credit_balance": format(credit_balance, "f"),
+            "available_credit": format(credit_limit - credit_balance, "f"),
+            "global_discount": format(self.global_discount or ZERO, "f"),
             "price_list_id": self.price_list_id,
         }
+
+
+# Propiedades cacheadas -> columnas de las que dependen
+_CACHED_PROPERTIES = {
+    "display_name": ("name", "trade_name"),
+    "full_contact": ("phone", "mobile", "email"),
+    "tax_info": ("tax_id", "tax_id_type"),
+}
+
+
+def _make_invalidator(prop_name: str):
+    """Crea un listener que descarta una propiedad cacheada al cambiar su columna."""
+
+    def invalidate(target, value, oldvalue, initiator):
+        target.__dict__.pop(prop_name, None)
+
+    return invalidate
+
+
+def _clear_cached_properties(target, *args) -> None:
+    """Descarta todas las propiedades cacheadas (refresh/expire de la instancia)."""
+    for prop_name in _CACHED_PROPERTIES:
+        target.__dict__.pop(prop_name, None)
+
+
+for _prop_name, _columns in _CACHED_PROPERTIES.items():
+    for _column in _columns:
+        event.listen(getattr(Customer, _column), "set", _make_invalidator(_prop_name))
+
+event.listen(Customer, "refresh", _clear_cached_properties)
+event.listen(Customer, "expire", _clear_cached_properties)
+
+
+# Busqueda de texto de clientes (CustomerRepository.search y listados)
+CUSTOMERS_FTS = FtsIndex(
+    "customers_fts",
+    "customers",
+    ("name", "trade_name", "tax_id", "email", "phone", "mobile"),
+)
+CUSTOMERS_FTS.attach(Customer.__table__)
+
+# Columnas de CUSTOMERS_FTS unidas en un solo texto para la busqueda con
+# LIKE: un lower() y un LIKE por fila en lugar de uno por columna. El
+# separador evita que un termino sin comodines coincida entre columnas.
+_SEARCH_SEPARATOR = "\x01"
+_CUSTOMER_SEARCH_TEXT = func.coalesce(Customer.name, "")
+for _column in CUSTOMERS_FTS.columns[1:]:
+    _CUSTOMER_SEARCH_TEXT = (
+        _CUSTOMER_SEARCH_TEXT
+        + _SEARCH_SEPARATOR
+        + func.coalesce(getattr(Customer, _column), "")
+    )
+
+
+def customer_text_filter(connection, query: str):
+    """
+    Condicion de busqueda por texto en nombre, documento, email y telefonos.
+
+    Usa el indice FTS5 de clientes si esta disponible y el termino
+    tiene al menos 3 caracteres; si no, LIKE '%texto%' sobre las columnas.
+
+    Args:
+        connection: Conexion de la sesion
+        query: Texto de busqueda
+
+    Returns:
+        Condicion para el WHERE
+    """
+    clause = CUSTOMERS_FTS.match(connection, query)
+    if clause is not None:
+        return clause
+
+    return _CUSTOMER_SEARCH_TEXT.ilike(f"%{query}%")
+
@@ -9,7 +9,7 @@ from datetime import datetime
 from typing import Optional
 from enum import Enum
 
-from sqlalchemy import String, Text, DateTime, Enum as SQLEnum
+from sqlalchemy import String, Text, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import BaseModel
@@ -31,6 +31,12 @@ class DeviceStatus(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Valores guardados en la columna status (str plano, sin Enum de SQLAlchemy)
+_APPROVED = DeviceStatus.APPROVED.value
+_BLOCKED = DeviceStatus.BLOCKED.value
+_PENDING = DeviceStatus.PENDING.value
+
+
 class Device(BaseModel):
     """
     Modelo de dispositivo registrado.
@@ -78,10 +84,11 @@ class Device(BaseModel):
     username: Mapped[str] = mapped_column(String(128), nullable=True, default="")
 
     # Estado y habilitacion
-    status: Mapped[DeviceStatus] = mapped_column(
-        SQLEnum(DeviceStatus),
+    # Valor de DeviceStatus como texto; el Enum queda solo para tipado
+    status: Mapped[str] = mapped_column(
+        String(16),
         nullable=False,
-        default=DeviceStatus.UNKNOWN,
+        default=DeviceStatus.UNKNOWN.value,
     )
     status_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
@@ -101,7 +108,7 @@ class Device(BaseModel):
         Returns:
             True si el dispositivo puede usar el POS
         """
-        return self.status == DeviceStatus.APPROVED
+        return self.status == _APPROVED
 
     def is_blocked(self) -> bool:
         """
@@ -110,7 +117,7 @@ class Device(BaseModel):
         Returns:
             True si el dispositivo fue bloqueado
         """
-        return self.status == DeviceStatus.BLOCKED
+        return self.status == _BLOCKED
 
     def is_pending(self) -> bool:
         """
@@ -119,7 +126,7 @@ class Device(BaseModel):
         Returns:
             True si esta pendiente
         """
-        return self.status == DeviceStatus.PENDING
+        return self.status == _PENDING
 
     def update_status(
         self,
@@ -128,6 +135,7 @@ class Device(BaseModel):
         server_device_id: Optional[str] = None,
         approved_at: Optional[datetime] = None,
         approved_by: Optional[str] = None,
+        now: Optional[datetime] = None,
     ) -> None:
         """
         Actualiza el estado del dispositivo.
@@ -138,10 +146,11 @@ class Device(BaseModel):
             server_device_id: ID en el servidor
             approved_at: Fecha de aprobacion
             approved_by: Usuario que aprobo
+            now: Fecha del chequeo (por defecto, la actual)
         """
-        self.status = status
+        self.status = DeviceStatus(status).value
         self.status_message = message
-        self.last_check = datetime.now()
+        self.last_check = now or datetime.now()
 
         if server_device_id:
             self.server_device_id = server_device_id
@@ -153,12 +162,17 @@ class Device(BaseModel):
             self.approved_by = approved_by
 
     @classmethod
-    def from_device_info(cls, device_info: "DeviceInfo") -> "Device":
+    def from_device_info(
+        cls,
+        device_info: "DeviceInfo",
+        now: Optional[datetime] = None,
+    ) -> "Device":
         """
         Crea un modelo Device desde DeviceInfo.
 
         Args:
             device_info: Informacion detectada del dispositivo
+            now: Fecha de registro (por defecto, la actual)
 
         Returns:
             Nueva instancia de Device
@@ -174,8 +188,8 @@ class Device(BaseModel):
             disk_serial=device_info.disk_serial,
             app_version=device_info.app_version,
             username=device_info.username,
-            status=DeviceStatus.UNKNOWN,
-            registered_at=datetime.now(),
+            status=DeviceStatus.UNKNOWN.value,
+            registered_at=now or datetime.now(),
         )
 
     def update_from_device_info(self, device_info: "DeviceInfo") -> None:
@@ -7,7 +7,8 @@ para busqueda y operacion offline.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List
+from functools import cached_property, lru_cache
+from typing import Dict, Optional, List
 
 from sqlalchemy import (
     String,
@@ -18,12 +19,36 @@ from sqlalchemy import (
     Integer,
     Numeric,
     Index,
+    event,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from src.db.fts import FtsIndex
+
 from .base import BaseModel
 
 
+# Redondeo de precios a centavos
+CENT = Decimal("0.01")
+
+
+@lru_cache(maxsize=32)
+def _tax_divisor(tax_rate: Decimal) -> Decimal:
+    """
+    Obtiene el divisor para quitar el IVA de un precio.
+
+    Cacheado por alicuota: hay pocas distintas en el catalogo.
+
+    Args:
+        tax_rate: Alicuota de IVA en porcentaje (ej: 21)
+
+    Returns:
+        1 + tax_rate / 100
+    """
+    return 1 + tax_rate / 100
+
+
 class Category(BaseModel):
     """
     Modelo de categoria de productos.
@@ -148,15 +173,22 @@ class Product(BaseModel):
         ForeignKey("brands.id"),
     )
 
+    # Nombres de categoria y marca (copiados en la sincronizacion para
+    # mostrar listados sin join)
+    category_name: Mapped[Optional[str]] = mapped_column(String(100))
+    brand_name: Mapped[Optional[str]] = mapped_column(String(100))
+
     # Codigos
-    sku: Mapped[Optional[str]] = mapped_column(String(50), index=True)
-    barcode: Mapped[Optional[str]] = mapped_column(String(50), index=True)
+    sku: Mapped[Optional[str]] = mapped_column(String(50))
+    barcode: Mapped[Optional[str]] = mapped_column(String(50))
     internal_code: Mapped[Optional[str]] = mapped_column(String(50))
 
     # Datos basicos
+    # Las columnas del grupo "details" no se leen en grillas ni carrito:
+    # se cargan al accederlas o con undefer_group("details")
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     short_name: Mapped[Optional[str]] = mapped_column(String(100))
-    description: Mapped[Optional[str]] = mapped_column(Text)
+    description: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="details")
 
     # Precios base (IVA incluido por defecto)
     base_price: Mapped[Decimal] = mapped_column(
@@ -197,10 +229,12 @@ class Product(BaseModel):
     color: Mapped[Optional[str]] = mapped_column(String(100))
 
     # ID de Cianbox
-    cianbox_id: Mapped[Optional[int]] = mapped_column(Integer)
+    cianbox_id: Mapped[Optional[int]] = mapped_column(Integer, deferred=True, deferred_group="details")
 
     # Sincronizacion
-    last_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, deferred=True, deferred_group="details"
+    )
 
     # Relaciones
     category: Mapped[Optional["Category"]] = relationship(back_populates="products")
@@ -213,7 +247,13 @@ class Product(BaseModel):
     # Indices para busqueda
     __table_args__ = (
         Index("ix_products_search", "tenant_id", "name", "sku", "barcode"),
-        Index("ix_products_tenant_active", "tenant_id", "is_active"),
+        # Parcial: solo productos activos, ordenados por nombre (listados del POS)
+        Index("ix_products_active_name", "tenant_id", "name", sqlite_where=text("is_active = 1")),
+        # Busqueda exacta por codigo (lector de barras): tenant + codigo.
+        # Los tres, para que SQLite resuelva el OR con indices
+        Index("ix_products_tenant_barcode", "tenant_id", "barcode"),
+        Index("ix_products_tenant_sku", "tenant_id", "sku"),
+        Index("ix_products_tenant_internal_code", "tenant_id", "internal_code"),
     )
 
     def get_price(self, price_list_id: Optional[str] = None) -> Decimal:
@@ -227,11 +267,21 @@ class Product(BaseModel):
             Precio del producto (usa base_price si no hay lista especifica)
         """
         if price_list_id:
-            for price in self.prices:
-                if price.price_list_id == price_list_id:
-                    return price.price
+            price = self._prices_by_list.get(price_list_id)
+            if price is not None:
+                return price.price
         return self.base_price
 
+    @cached_property
+    def _prices_by_list(self) -> Dict[str, "ProductPrice"]:
+        """
+        Indice de precios por lista (cacheado).
+
+        Guarda las instancias ProductPrice, asi un cambio de precio se ve
+        sin invalidar. Se descarta al agregar o quitar precios.
+        """
+        return {price.price_list_id: price for price in self.prices}
+
     def get_net_price(self, price_list_id: Optional[str] = None) -> Decimal:
         """
         Obtiene el precio neto (sin IVA) del producto.
@@ -245,8 +295,7 @@ class Product(BaseModel):
         price = self.get_price(price_list_id)
         if self.tax_included:
             # Calcular precio neto
-            divisor = Decimal("1") + (self.tax_rate / Decimal("100"))
-            return (price / divisor).quantize(Decimal("0.01"))
+            return (price / _tax_divisor(self.tax_rate)).quantize(CENT)
         return price
 
 
@@ -284,3 +333,29 @@ class ProductPrice(BaseModel):
     __table_args__ = (
         Index("ix_product_prices_unique", "product_id", "price_list_id", unique=True),
     )
+
+
+def _clear_prices_index(target, *args) -> None:
+    """Descarta el indice de precios del producto."""
+    target.__dict__.pop("_prices_by_list", None)
+
+
+def _price_list_changed(target, value, oldvalue, initiator) -> None:
+    """Descarta el indice del producto si un precio cambia de lista."""
+    product = target.__dict__.get("product")
+    if product is not None:
+        _clear_prices_index(product)
+
+
+event.listen(Product.prices, "append", _clear_prices_index)
+event.listen(Product.prices, "remove", _clear_prices_index)
+event.listen(Product, "refresh", _clear_prices_index)
+event.listen(Product, "expire", _clear_prices_index)
+event.listen(ProductPrice.price_list_id, "set", _price_list_changed)
+
+
+# Busqueda de texto de productos (ProductRepository.search). Las
+# variantes tambien se buscan por color y talle.
+PRODUCT_TEXT_COLUMNS = ("name", "sku", "barcode", "internal_code")
+PRODUCTS_FTS = FtsIndex("products_fts", "products", PRODUCT_TEXT_COLUMNS + ("color", "size"))
+PRODUCTS_FTS.attach(Product.__table__)
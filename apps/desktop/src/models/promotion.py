@@ -6,7 +6,8 @@ Almacena las promociones activas sincronizadas desde el backend.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List
+from functools import cached_property
+from typing import FrozenSet, Optional, List
 
 from sqlalchemy import (
     String,
@@ -17,6 +18,7 @@ from sqlalchemy import (
     Integer,
     Numeric,
     Enum,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -87,17 +89,22 @@ class Promotion(BaseModel):
         cascade="all, delete-orphan",
     )
 
-    def is_valid_now(self) -> bool:
+    def is_valid_now(self, now: Optional[datetime] = None) -> bool:
         """
         Verifica si la promocion esta vigente.
 
+        Args:
+            now: Fecha de referencia; al evaluar varias promociones
+                conviene calcularla una vez y pasarla (default: ahora)
+
         Returns:
             True si la promocion esta activa y dentro del rango de fechas
         """
         if not self.is_active:
             return False
 
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
 
         if self.start_date and now < self.start_date:
             return False
@@ -120,11 +127,16 @@ class Promotion(BaseModel):
         if self.applies_to_all:
             return True
 
-        for pp in self.products:
-            if pp.product_id == product_id:
-                return True
+        return product_id in self._product_ids
 
-        return False
+    @cached_property
+    def _product_ids(self) -> FrozenSet[str]:
+        """
+        IDs de productos de la promocion (cacheado).
+
+        Se descarta al agregar o quitar productos de la promocion.
+        """
+        return frozenset(pp.product_id for pp in self.products)
 
 
 class PromotionProduct(BaseModel):
@@ -154,3 +166,14 @@ class PromotionProduct(BaseModel):
 
     # Relaciones
     promotion: Mapped["Promotion"] = relationship(back_populates="products")
+
+
+def _clear_product_ids(target, *args) -> None:
+    """Descarta el conjunto de productos cacheado de la promocion."""
+    target.__dict__.pop("_product_ids", None)
+
+
+event.listen(Promotion.products, "append", _clear_product_ids)
+event.listen(Promotion.products, "remove", _clear_product_ids)
+event.listen(Promotion, "refresh", _clear_product_ids)
+event.listen(Promotion, "expire", _clear_product_ids)
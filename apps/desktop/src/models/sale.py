@@ -18,7 +18,9 @@ from sqlalchemy import (
     Integer,
     Numeric,
     Index,
+    func,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -35,14 +37,14 @@ class Sale(BaseModel):
     __tablename__ = "sales"
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    tenant_id: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    tenant_id: Mapped[str] = mapped_column(String(50), nullable=False)
     branch_id: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # Numero de ticket
     sale_number: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # Fecha de venta
-    sale_date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    sale_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
 
     # Cliente
     customer_id: Mapped[Optional[str]] = mapped_column(String(50))
@@ -87,11 +89,15 @@ class Sale(BaseModel):
         cascade="all, delete-orphan",
     )
 
-    # Indices
+    # Indices (tenant_id y sale_date sueltos quedan cubiertos por estos)
     __table_args__ = (
+        # Listado de ventas del tenant ordenado por fecha
         Index("ix_sales_tenant_date", "tenant_id", "sale_date"),
-        Index("ix_sales_tenant_status", "tenant_id", "status"),
+        # Ventas de un estado, ya ordenadas por fecha (busqueda de devoluciones)
+        Index("ix_sales_tenant_status_date", "tenant_id", "status", "sale_date"),
         Index("ix_sales_sale_number", "tenant_id", "sale_number"),
+        # Tabla agrupada por id: sin rowid ni segundo B-tree de la clave primaria
+        {"sqlite_with_rowid": False},
     )
 
 
@@ -112,7 +118,7 @@ class SaleItem(BaseModel):
     )
 
     # Producto
-    product_id: Mapped[Optional[str]] = mapped_column(String(50), index=True)
+    product_id: Mapped[Optional[str]] = mapped_column(String(50))
     product_code: Mapped[Optional[str]] = mapped_column(String(50))
     product_name: Mapped[str] = mapped_column(String(255), nullable=False)
     product_barcode: Mapped[Optional[str]] = mapped_column(String(50))
@@ -146,11 +152,19 @@ class SaleItem(BaseModel):
 
     # Indices
     __table_args__ = (
-        Index("ix_sale_items_product", "product_id"),
+        # Cubre la busqueda de devoluciones (EXISTS por producto y venta)
+        Index("ix_sale_items_product_refund", "product_id", "sale_id", "refunded_quantity"),
         Index("ix_sale_items_sale", "sale_id"),
+        {"sqlite_with_rowid": False},
     )
 
-    @property
+    @hybrid_property
     def available_quantity(self) -> Decimal:
         """Cantidad disponible para devolucion."""
         return abs(self.quantity) - abs(self.refunded_quantity)
+
+    @available_quantity.inplace.expression
+    @classmethod
+    def _available_quantity_expression(cls):
+        """Misma cuenta en SQL, para filtrar items con saldo en la consulta."""
+        return func.abs(cls.quantity) - func.abs(cls.refunded_quantity)
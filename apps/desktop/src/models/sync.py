@@ -4,15 +4,33 @@ Modelos para sincronizacion y configuracion local.
 Maneja la cola de operaciones offline y configuracion de la app.
 """
 
+import json
 from datetime import datetime
-from typing import Optional
+from functools import cached_property
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from sqlalchemy import String, Boolean, DateTime, Text, Integer, JSON
+from sqlalchemy import String, Boolean, DateTime, Text, Integer, Index, JSON, event, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import BaseModel
 
 
+# Textos que se leen como True en valores bool
+_TRUE_VALUES = frozenset(("true", "1", "yes"))
+
+# Tipo de Python -> (value_type, serializador). bool va antes que int:
+# el recorrido por isinstance de las subclases respeta este orden
+_STRING_ENCODER: Tuple[str, Callable[[Any], str]] = ("string", str)
+_TYPE_ENCODERS: Dict[type, Tuple[str, Callable[[Any], str]]] = {
+    bool: ("bool", lambda value: "true" if value else "false"),
+    int: ("int", str),
+    dict: ("json", json.dumps),
+    list: ("json", json.dumps),
+    str: _STRING_ENCODER,
+}
+
+
 class OfflineQueue(BaseModel):
     """
     Cola de operaciones pendientes para sincronizar.
@@ -24,7 +42,7 @@ class OfflineQueue(BaseModel):
     __tablename__ = "offline_queue"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    tenant_id: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    tenant_id: Mapped[str] = mapped_column(String(50), nullable=False)
 
     # Tipo de operacion
     operation_type: Mapped[str] = mapped_column(
@@ -56,6 +74,11 @@ class OfflineQueue(BaseModel):
     response_data: Mapped[Optional[dict]] = mapped_column(JSON)
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
+    # Operaciones pendientes/fallidas del tenant que aun admiten reintentos
+    __table_args__ = (
+        Index("ix_offline_tenant_status_retry", "tenant_id", "status", "retry_count"),
+    )
+
     def can_retry(self) -> bool:
         """Verifica si se puede reintentar la operacion."""
         return (
@@ -63,23 +86,44 @@ class OfflineQueue(BaseModel):
             and self.retry_count < self.max_retries
         )
 
-    def mark_processing(self) -> None:
-        """Marca la operacion como en proceso."""
+    def mark_processing(self, now: Optional[datetime] = None) -> None:
+        """
+        Marca la operacion como en proceso.
+
+        Args:
+            now: Fecha del intento (por defecto, la actual)
+        """
         self.status = "processing"
-        self.last_attempt_at = datetime.now()
+        self.last_attempt_at = now or datetime.now()
 
-    def mark_completed(self, response_data: dict = None) -> None:
-        """Marca la operacion como completada."""
+    def mark_completed(
+        self,
+        response_data: dict = None,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Marca la operacion como completada.
+
+        Args:
+            response_data: Respuesta del servidor
+            now: Fecha de procesamiento (por defecto, la actual)
+        """
         self.status = "completed"
-        self.processed_at = datetime.now()
+        self.processed_at = now or datetime.now()
         self.response_data = response_data
 
-    def mark_failed(self, error: str) -> None:
-        """Marca la operacion como fallida."""
+    def mark_failed(self, error: str, now: Optional[datetime] = None) -> None:
+        """
+        Marca la operacion como fallida.
+
+        Args:
+            error: Mensaje de error
+            now: Fecha del intento (por defecto, la actual)
+        """
         self.status = "failed"
         self.retry_count += 1
         self.last_error = error
-        self.last_attempt_at = datetime.now()
+        self.last_attempt_at = now or datetime.now()
 
 
 class AppConfig(BaseModel):
@@ -106,63 +150,126 @@ class AppConfig(BaseModel):
     # Categoria para agrupar
     category: Mapped[str] = mapped_column(String(50), default="general")
 
-    def get_typed_value(self):
-        """Obtiene el valor con el tipo correcto."""
+    @cached_property
+    def _typed_value(self):
+        """Valor convertido a su tipo (se parsea una vez por instancia)."""
         if self.value is None:
             return None
 
         if self.value_type == "int":
             return int(self.value)
         elif self.value_type == "bool":
-            return self.value.lower() in ("true", "1", "yes")
+            return self.value.lower() in _TRUE_VALUES
         elif self.value_type == "json":
-            import json
             return json.loads(self.value)
         else:
             return self.value
 
+    def get_typed_value(self):
+        """
+        Obtiene el valor con el tipo correcto.
+
+        Los valores json se devuelven compartidos: no modificarlos.
+        """
+        return self._typed_value
+
+    @staticmethod
+    def _encode(value) -> Tuple[str, Optional[str]]:
+        """
+        Convierte un valor a (tipo, texto) para guardarlo.
+
+        Args:
+            value: Valor a guardar
+
+        Returns:
+            Tupla (value_type, value serializado)
+        """
+        if value is None:
+            return "string", None
+
+        encoder = _TYPE_ENCODERS.get(type(value))
+        if encoder is None:
+            # Subclases (IntEnum, OrderedDict, ...): primer tipo base que coincida
+            encoder = next(
+                (enc for base, enc in _TYPE_ENCODERS.items() if isinstance(value, base)),
+                _STRING_ENCODER,
+            )
+
+        value_type, encode = encoder
+        return value_type, encode(value)
+
+    @classmethod
+    def _upsert(cls, stmt):
+        """
+        Agrega ON CONFLICT (key) DO UPDATE a un INSERT de configuracion.
+
+        Una clave existente conserva su categoria y actualiza valor y tipo.
+        """
+        return stmt.on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={
+                "value": stmt.excluded.value,
+                "value_type": stmt.excluded.value_type,
+                # onupdate no se aplica en ON CONFLICT: asignarlo a mano
+                "updated_at": func.now(),
+            },
+        )
+
     @classmethod
     def set_value(cls, session, key: str, value, category: str = "general"):
         """
         Establece un valor de configuracion.
 
+        Un solo INSERT ... ON CONFLICT DO UPDATE, sin consultar antes.
+
         Args:
             session: Sesion de SQLAlchemy
             key: Clave de configuracion
             value: Valor a guardar
             category: Categoria de la configuracion
+
+        Returns:
+            Entidad AppConfig guardada
         """
-        import json
-
-        # Determinar tipo
-        if isinstance(value, bool):
-            value_type = "bool"
-            str_value = str(value).lower()
-        elif isinstance(value, int):
-            value_type = "int"
-            str_value = str(value)
-        elif isinstance(value, (dict, list)):
-            value_type = "json"
-            str_value = json.dumps(value)
-        else:
-            value_type = "string"
-            str_value = str(value) if value is not None else None
+        value_type, str_value = cls._encode(value)
 
-        # Buscar o crear
-        config = session.query(cls).filter_by(key=key).first()
-        if config:
-            config.value = str_value
-            config.value_type = value_type
-        else:
-            config = cls(
+        stmt = cls._upsert(
+            sqlite_insert(cls).values(
                 key=key,
                 value=str_value,
                 value_type=value_type,
                 category=category,
             )
-            session.add(config)
+        ).returning(cls)
+
+        return session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+
+    @classmethod
+    def set_values(cls, session, values: Dict[str, Any], category: str = "general") -> None:
+        """
+        Establece varios valores de configuracion en una sola sentencia.
+
+        Args:
+            session: Sesion de SQLAlchemy
+            values: Diccionario clave -> valor
+            category: Categoria de las configuraciones
+        """
+        if not values:
+            return
 
-        return config
+        rows = []
+        for key, value in values.items():
+            value_type, str_value = cls._encode(value)
+            rows.append({
+                "key": key,
+                "value": str_value,
+                "value_type": value_type,
+                "category": category,
+            })
+
+        session.execute(cls._upsert(sqlite_insert(cls)), rows)
 
     @classmethod
     def get_value(cls, session, key: str, default=None):
@@ -181,3 +288,14 @@ class AppConfig(BaseModel):
         if config:
             return config.get_typed_value()
         return default
+
+
+def _clear_typed_value(target, *args) -> None:
+    """Descarta el valor convertido de la configuracion."""
+    target.__dict__.pop("_typed_value", None)
+
+
+event.listen(AppConfig.value, "set", _clear_typed_value)
+event.listen(AppConfig.value_type, "set", _clear_typed_value)
+event.listen(AppConfig, "refresh", _clear_typed_value)
+event.listen(AppConfig, "expire", _clear_typed_value)
@@ -6,9 +6,10 @@ para operacion offline.
 """
 
 from datetime import datetime
-from typing import Optional, List
+from functools import cached_property
+from typing import FrozenSet, Optional, List
 
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text, JSON, Index, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -70,6 +71,11 @@ class Branch(BaseModel):
     tenant: Mapped["Tenant"] = relationship(back_populates="branches")
     users: Mapped[List["User"]] = relationship(back_populates="branch")
 
+    __table_args__ = (
+        # Busqueda por codigo sin distinguir mayusculas (get_by_code)
+        Index("ix_branches_tenant_code_lower", "tenant_id", text("lower(code)")),
+    )
+
 
 class User(BaseModel):
     """
@@ -114,6 +120,20 @@ class User(BaseModel):
     tenant: Mapped["Tenant"] = relationship(back_populates="users")
     branch: Mapped[Optional["Branch"]] = relationship(back_populates="users")
 
+    __table_args__ = (
+        # Parcial: solo el usuario actual (get_current_user). No es UNIQUE:
+        # SQLite verifica UNIQUE fila por fila y el UPDATE de
+        # set_current_user puede marcar el nuevo antes de desmarcar el anterior
+        Index("ix_users_current", "is_current_user", sqlite_where=text("is_current_user = 1")),
+        # Busqueda por email sin distinguir mayusculas (get_by_email)
+        Index("ix_users_tenant_email_lower", "tenant_id", text("lower(email)")),
+    )
+
+    @cached_property
+    def _permission_set(self) -> FrozenSet[str]:
+        """Permisos como conjunto (se descarta al cambiar permissions)."""
+        return frozenset(self.permissions or ())
+
     def has_permission(self, permission: str) -> bool:
         """
         Verifica si el usuario tiene un permiso especifico.
@@ -124,9 +144,16 @@ class User(BaseModel):
         Returns:
             True si tiene el permiso
         """
-        if not self.permissions:
-            return False
+        permissions = self._permission_set
         # Permiso wildcard
-        if "*" in self.permissions:
-            return True
-        return permission in self.permissions
+        return "*" in permissions or permission in permissions
+
+
+def _clear_permission_set(target, *args) -> None:
+    """Descarta el conjunto de permisos del usuario."""
+    target.__dict__.pop("_permission_set", None)
+
+
+event.listen(User.permissions, "set", _clear_permission_set)
+event.listen(User, "refresh", _clear_permission_set)
+event.listen(User, "expire", _clear_permission_set)
@@ -11,6 +11,7 @@ from .user_repository import UserRepository
 from .config_repository import ConfigRepository
 from .device_repository import DeviceRepository
 from .customer_repository import CustomerRepository
+from .offline_queue_repository import OfflineQueueRepository
 
 __all__ = [
     "BaseRepository",
@@ -21,4 +22,5 @@ __all__ = [
     "ConfigRepository",
     "DeviceRepository",
     "CustomerRepository",
+    "OfflineQueueRepository",
 ]
@@ -4,9 +4,15 @@ Repositorio base con operaciones CRUD genericas.
 Proporciona metodos comunes para todos los repositorios.
 """
 
-from typing import Generic, TypeVar, Type, Optional, List, Any
-
-from sqlalchemy import select, func
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import (
+    Generic, TypeVar, Type, Optional, List, Any, Dict, Iterable, Iterator,
+    NamedTuple, Tuple, Union,
+)
+
+from sqlalchemy import select, func, insert, delete, exists, literal, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from src.db.database import Base
@@ -14,6 +20,61 @@ from src.db.database import Base
 T = TypeVar("T", bound=Base)
 
 
+class _ModelMeta(NamedTuple):
+    """Datos del mapper que los repositorios consultan en cada operacion."""
+
+    pk_column: Any
+    pk_names: Tuple[str, ...]
+    column_keys: Tuple[str, ...]
+    has_updated_at: bool
+    cascade_delete: bool
+
+
+@lru_cache(maxsize=None)
+def _model_meta(model_class: type) -> _ModelMeta:
+    """
+    Obtiene los datos del mapper de un modelo (calculado una vez por clase).
+
+    Args:
+        model_class: Clase del modelo
+
+    Returns:
+        Columnas de primary key, atributos de columna y flags del modelo
+    """
+    mapper = model_class.__mapper__
+    table = model_class.__table__
+    return _ModelMeta(
+        pk_column=mapper.primary_key[0],
+        pk_names=tuple(column.name for column in table.primary_key.columns),
+        column_keys=tuple(attr.key for attr in mapper.column_attrs),
+        has_updated_at="updated_at" in table.c,
+        cascade_delete=any(
+            relationship.cascade.delete for relationship in mapper.relationships
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def _tenant_statement(model_class: type, has_limit: bool, has_offset: bool):
+    """
+    Arma el SELECT por tenant con parametros (una vez por forma).
+
+    Args:
+        model_class: Clase del modelo
+        has_limit: Si lleva LIMIT (:limit)
+        has_offset: Si lleva OFFSET (:offset)
+
+    Returns:
+        Sentencia select con los parametros :tenant_id, :limit y :offset
+    """
+    stmt = select(model_class).where(model_class.tenant_id == bindparam("tenant_id"))
+    if has_offset:
+        stmt = stmt.offset(bindparam("offset"))
+    if has_limit:
+        stmt = stmt.limit(bindparam("limit"))
+    return stmt
+
+
 class BaseRepository(Generic[T]):
     """
     Repositorio base generico.
@@ -35,6 +96,33 @@ class BaseRepository(Generic[T]):
         """
         self.session = session
         self.model_class = model_class
+        self._meta = _model_meta(model_class)
+        self._defer_flush = False
+
+    def _flush(self) -> None:
+        """Hace flush de la sesion, salvo dentro de bulk()."""
+        if not self._defer_flush:
+            self.session.flush()
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """
+        Agrupa escrituras con un solo flush al final.
+
+        Dentro del bloque create/update/delete no hacen flush por
+        operacion; las consultas de la sesion siguen haciendo autoflush.
+
+        Example:
+            >>> with repo.bulk():
+            ...     for entity in entities:
+            ...         repo.create(entity)
+        """
+        self._defer_flush = True
+        try:
+            yield
+        finally:
+            self._defer_flush = False
+        self.session.flush()
 
     def get_by_id(self, id: str) -> Optional[T]:
         """
@@ -86,17 +174,68 @@ class BaseRepository(Generic[T]):
         Returns:
             Lista de entidades del tenant
         """
-        query = select(self.model_class).where(
-            self.model_class.tenant_id == tenant_id
+        stmt = _tenant_statement(self.model_class, bool(limit), bool(offset))
+        result = self.session.execute(
+            stmt, {"tenant_id": tenant_id, "limit": limit, "offset": offset}
         )
+        return list(result.scalars().all())
 
-        if offset:
-            query = query.offset(offset)
-        if limit:
-            query = query.limit(limit)
+    def _fetch(
+        self,
+        stmt,
+        stream: bool = False,
+        batch_size: int = 500,
+    ) -> Union[List[Any], Iterator[Any]]:
+        """
+        Ejecuta un select de entidades.
 
-        result = self.session.execute(query)
-        return list(result.scalars().all())
+        Args:
+            stmt: Select a ejecutar
+            stream: Devolver un iterador por lotes (yield_per) en lugar
+                de una lista; se debe recorrer con la sesion abierta
+            batch_size: Filas por lote al recorrer
+
+        Returns:
+            Lista de entidades, o iterador si stream es True
+        """
+        if stream:
+            stmt = stmt.execution_options(yield_per=batch_size)
+            return iter(self.session.execute(stmt).scalars())
+        return list(self.session.execute(stmt).scalars().all())
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[T]:
+        """
+        Recorre todas las entidades por lotes (yield_per).
+
+        No carga el resultado completo en memoria: pensado para
+        exportaciones y reportes. Consumir dentro de la sesion.
+
+        Args:
+            batch_size: Filas por lote
+
+        Yields:
+            Entidades
+        """
+        stmt = select(self.model_class).execution_options(yield_per=batch_size)
+        yield from self.session.execute(stmt).scalars()
+
+    def iter_by_tenant(self, tenant_id: str, batch_size: int = 500) -> Iterator[T]:
+        """
+        Recorre las entidades de un tenant por lotes (yield_per).
+
+        Args:
+            tenant_id: ID del tenant
+            batch_size: Filas por lote
+
+        Yields:
+            Entidades del tenant
+        """
+        stmt = (
+            select(self.model_class)
+            .where(self.model_class.tenant_id == tenant_id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(stmt).scalars()
 
     def count(self, tenant_id: str = None) -> int:
         """
@@ -116,6 +255,26 @@ class BaseRepository(Generic[T]):
         result = self.session.execute(query)
         return result.scalar() or 0
 
+    def has_any(self, tenant_id: str = None) -> bool:
+        """
+        Verifica si hay al menos una entidad.
+
+        SELECT EXISTS(...): se detiene en la primera fila, a diferencia
+        de count que recorre todas. Usar cuando solo importa si hay datos.
+
+        Args:
+            tenant_id: Filtrar por tenant (opcional)
+
+        Returns:
+            True si existe alguna entidad
+        """
+        condition = exists().select_from(self.model_class)
+
+        if tenant_id and hasattr(self.model_class, "tenant_id"):
+            condition = condition.where(self.model_class.tenant_id == tenant_id)
+
+        return bool(self.session.execute(select(condition)).scalar())
+
     def create(self, entity: T) -> T:
         """
         Crea una nueva entidad.
@@ -127,13 +286,16 @@ class BaseRepository(Generic[T]):
             Entidad creada
         """
         self.session.add(entity)
-        self.session.flush()
+        self._flush()
         return entity
 
     def create_many(self, entities: List[T]) -> List[T]:
         """
         Crea multiples entidades.
 
+        Las entidades quedan en la sesion. Para cargas masivas que no
+        necesitan las instancias, usar create_many_bulk.
+
         Args:
             entities: Lista de entidades
 
@@ -141,9 +303,23 @@ class BaseRepository(Generic[T]):
             Lista de entidades creadas
         """
         self.session.add_all(entities)
-        self.session.flush()
+        self._flush()
         return entities
 
+    def create_many_bulk(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Inserta multiples filas sin crear instancias del modelo.
+
+        Un INSERT con executemany, sin unit of work ni identity map.
+        Los defaults de las columnas se aplican igual.
+
+        Args:
+            rows: Filas como diccionarios columna -> valor (mismas claves)
+        """
+        if not rows:
+            return
+        self.session.execute(insert(self.model_class), rows)
+
     def update(self, entity: T) -> T:
         """
         Actualiza una entidad.
@@ -155,7 +331,7 @@ class BaseRepository(Generic[T]):
             Entidad actualizada
         """
         self.session.merge(entity)
-        self.session.flush()
+        self._flush()
         return entity
 
     def delete(self, entity: T) -> None:
@@ -166,64 +342,112 @@ class BaseRepository(Generic[T]):
             entity: Entidad a eliminar
         """
         self.session.delete(entity)
-        self.session.flush()
+        self._flush()
 
     def delete_by_id(self, id: str) -> bool:
         """
         Elimina una entidad por ID.
 
+        Un solo DELETE, sin cargar la fila. Los modelos con relaciones
+        en cascada se eliminan por el ORM para que la cascada se aplique.
+
         Args:
             id: ID de la entidad
 
         Returns:
             True si se elimino, False si no existia
         """
-        entity = self.get_by_id(id)
-        if entity:
-            self.delete(entity)
-            return True
-        return False
+        if self._meta.cascade_delete:
+            entity = self.get_by_id(id)
+            if entity:
+                self.delete(entity)
+                return True
+            return False
+
+        result = self.session.execute(
+            delete(self.model_class).where(self._meta.pk_column == id)
+        )
+        return result.rowcount > 0
 
     def exists(self, id: str) -> bool:
         """
         Verifica si existe una entidad.
 
+        SELECT 1 ... LIMIT 1: no carga la fila ni crea la instancia.
+
         Args:
             id: ID de la entidad
 
         Returns:
             True si existe
         """
-        return self.get_by_id(id) is not None
+        stmt = select(literal(1)).where(self._meta.pk_column == id).limit(1)
+        return self.session.execute(stmt).scalar() is not None
+
+    def _upsert_statement(self, columns: Iterable[str]):
+        """
+        Arma un INSERT ... ON CONFLICT (pk) DO UPDATE para el modelo.
+
+        Args:
+            columns: Columnas que trae cada fila
+
+        Returns:
+            Sentencia insert de SQLite
+        """
+        pk_names = self._meta.pk_names
+
+        stmt = sqlite_insert(self.model_class)
+        update = {
+            name: stmt.excluded[name]
+            for name in columns
+            if name not in pk_names
+        }
+        if self._meta.has_updated_at:
+            # onupdate no se aplica en ON CONFLICT: asignarlo a mano
+            update["updated_at"] = func.now()
+
+        if not update:
+            return stmt.on_conflict_do_nothing(index_elements=pk_names)
+        return stmt.on_conflict_do_update(index_elements=pk_names, set_=update)
 
     def upsert(self, entity: T) -> T:
         """
         Crea o actualiza una entidad.
 
+        Un solo INSERT ... ON CONFLICT DO UPDATE. Los atributos en None
+        no pisan el valor guardado. Las relaciones de la entidad no se
+        guardan.
+
         Args:
             entity: Entidad a crear/actualizar
 
         Returns:
-            Entidad creada/actualizada
-        """
-        # Obtener el valor de la primary key
-        pk_columns = self.model_class.__table__.primary_key.columns
-        pk_values = {col.name: getattr(entity, col.name) for col in pk_columns}
-
-        # Verificar si existe
-        existing = self.session.get(self.model_class, pk_values)
-
-        if existing:
-            # Actualizar campos
-            for column in self.model_class.__table__.columns:
-                if column.name not in pk_values:
-                    value = getattr(entity, column.name, None)
-                    if value is not None:
-                        setattr(existing, column.name, value)
-            self.session.flush()
-            return existing
-        else:
-            return self.create(entity)
+            Entidad creada/actualizada (la instancia de la sesion)
+        """
+        row = {}
+        for key in self._meta.column_keys:
+            value = getattr(entity, key, None)
+            if value is not None:
+                row[key] = value
+
+        stmt = self._upsert_statement(row).values(row).returning(self.model_class)
+        return self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+
+    def upsert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Crea o actualiza multiples filas en una sola sentencia.
+
+        No pasa por el unit of work del ORM: todas las filas deben traer
+        las mismas claves (incluida la primary key).
+
+        Args:
+            rows: Filas como diccionarios columna -> valor
+        """
+        if not rows:
+            return
+        self.session.execute(self._upsert_statement(rows[0]), rows)
 
     def delete_all(self, tenant_id: str = None) -> int:
         """
@@ -241,5 +465,5 @@ class BaseRepository(Generic[T]):
             query = query.filter(self.model_class.tenant_id == tenant_id)
 
         count = query.delete()
-        self.session.flush()
+        self._flush()
         return count
@@ -12,15 +12,27 @@ from .base import BaseRepository
 from src.models import AppConfig
 
 
+# Marca de clave inexistente en el cache
+_MISSING = object()
+
+
 class ConfigRepository(BaseRepository[AppConfig]):
     """
     Repositorio para configuracion de la aplicacion.
 
     Proporciona acceso tipo clave-valor para configuracion persistente.
+
+    Las lecturas se cachean en el repositorio (una consulta por clave
+    mientras dure la sesion); las escrituras actualizan el cache.
     """
 
     def __init__(self, session: Session):
         super().__init__(session, AppConfig)
+        self._cache: dict[str, Any] = {}
+
+    def invalidate(self) -> None:
+        """Descarta los valores cacheados (por ejemplo, tras una sincronizacion)."""
+        self._cache.clear()
 
     def get_value(self, key: str, default: Any = None) -> Any:
         """
@@ -33,7 +45,12 @@ class ConfigRepository(BaseRepository[AppConfig]):
         Returns:
             Valor de la configuracion
         """
-        return AppConfig.get_value(self.session, key, default)
+        if key not in self._cache:
+            # Tambien se cachea la ausencia de la clave
+            self._cache[key] = AppConfig.get_value(self.session, key, _MISSING)
+
+        value = self._cache[key]
+        return default if value is _MISSING else value
 
     def set_value(
         self,
@@ -52,7 +69,21 @@ class ConfigRepository(BaseRepository[AppConfig]):
         Returns:
             Entidad AppConfig
         """
-        return AppConfig.set_value(self.session, key, value, category)
+        config = AppConfig.set_value(self.session, key, value, category)
+        self._cache[key] = config.get_typed_value()
+        return config
+
+    def set_values(self, values: dict[str, Any], category: str = "general") -> None:
+        """
+        Establece varios valores de configuracion en una sola sentencia.
+
+        Args:
+            values: Diccionario clave -> valor
+            category: Categoria de las configuraciones
+        """
+        AppConfig.set_values(self.session, values, category)
+        for key in values:
+            self._cache.pop(key, None)
 
     def get_by_category(self, category: str) -> dict[str, Any]:
         """
@@ -70,7 +101,9 @@ class ConfigRepository(BaseRepository[AppConfig]):
         result = self.session.execute(stmt)
         configs = result.scalars().all()
 
-        return {config.key: config.get_typed_value() for config in configs}
+        values = {config.key: config.get_typed_value() for config in configs}
+        self._cache.update(values)
+        return values
 
     def delete_key(self, key: str) -> bool:
         """
@@ -82,17 +115,11 @@ class ConfigRepository(BaseRepository[AppConfig]):
         Returns:
             True si se elimino
         """
-        from sqlalchemy import select
-
-        stmt = select(AppConfig).where(AppConfig.key == key)
-        result = self.session.execute(stmt)
-        config = result.scalar_one_or_none()
+        from sqlalchemy import delete
 
-        if config:
-            self.session.delete(config)
-            self.session.flush()
-            return True
-        return False
+        self._cache.pop(key, None)
+        result = self.session.execute(delete(AppConfig).where(AppConfig.key == key))
+        return result.rowcount > 0
 
     # =========================================================================
     # METODOS DE CONVENIENCIA PARA CONFIGURACIONES COMUNES
@@ -136,8 +163,7 @@ class ConfigRepository(BaseRepository[AppConfig]):
 
     def set_printer_config(self, config: dict) -> None:
         """Guarda configuracion de impresora."""
-        for key, value in config.items():
-            self.set_value(f"printer_{key}", value, "printer")
+        self.set_values({f"printer_{key}": value for key, value in config.items()}, "printer")
 
     def get_ui_config(self) -> dict:
         """Obtiene configuracion de UI."""
@@ -145,5 +171,4 @@ class ConfigRepository(BaseRepository[AppConfig]):
 
     def set_ui_config(self, config: dict) -> None:
         """Guarda configuracion de UI."""
-        for key, value in config.items():
-            self.set_value(f"ui_{key}", value, "ui")
+        self.set_values({f"ui_{key}": value for key, value in config.items()}, "ui")
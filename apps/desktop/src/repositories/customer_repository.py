@@ -4,13 +4,19 @@ Repositorio de clientes.
 Proporciona acceso a clientes con metodos de busqueda optimizados.
 """
 
+import re
 from typing import List, Optional
 
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
 
 from .base import BaseRepository
 from src.models import Customer
+from src.models.customer import customer_text_filter
+
+
+# Caracteres que se quitan del documento (CUIT con guiones, DNI con puntos)
+_NON_DIGITS = re.compile(r"[^0-9]")
 
 
 class CustomerRepository(BaseRepository[Customer]):
@@ -45,21 +51,10 @@ class CustomerRepository(BaseRepository[Customer]):
         Returns:
             Lista de clientes que coinciden
         """
-        search_term = f"%{query}%"
-
         stmt = (
             select(Customer)
             .where(Customer.tenant_id == tenant_id)
-            .where(
-                or_(
-                    Customer.name.ilike(search_term),
-                    Customer.trade_name.ilike(search_term),
-                    Customer.tax_id.ilike(search_term),
-                    Customer.email.ilike(search_term),
-                    Customer.phone.ilike(search_term),
-                    Customer.mobile.ilike(search_term),
-                )
-            )
+            .where(customer_text_filter(self.session.connection(), query))
         )
 
         if only_active:
@@ -86,18 +81,13 @@ class CustomerRepository(BaseRepository[Customer]):
             Cliente o None
         """
         # Limpiar el documento de caracteres no numericos
-        cleaned_tax_id = "".join(c for c in tax_id if c.isdigit())
+        cleaned_tax_id = _NON_DIGITS.sub("", tax_id)
 
-        stmt = (
-            select(Customer)
-            .where(Customer.tenant_id == tenant_id)
-            .where(
-                or_(
-                    Customer.tax_id == tax_id,
-                    Customer.tax_id == cleaned_tax_id,
-                )
-            )
-        )
+        stmt = select(Customer).where(Customer.tenant_id == tenant_id)
+        if cleaned_tax_id == tax_id:
+            stmt = stmt.where(Customer.tax_id == tax_id)
+        else:
+            stmt = stmt.where(Customer.tax_id.in_((tax_id, cleaned_tax_id)))
 
         result = self.session.execute(stmt)
         return result.scalar_one_or_none()
@@ -8,15 +8,22 @@ y su estado de habilitacion.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from .base import BaseRepository
+from src.db import SyncContext
 from src.models.device import Device, DeviceStatus
 from src.utils.device import DeviceInfo, get_device_info
 
 
+# Consultas frecuentes, armadas una vez (solo cambian los parametros)
+_CURRENT_DEVICE = select(Device).limit(1)
+_DEVICE_BY_ID = select(Device).where(Device.device_id == bindparam("device_id"))
+_DEVICE_STATUS = select(Device.status).where(Device.device_id == bindparam("device_id"))
+
+
 class DeviceRepository(BaseRepository[Device]):
     """
     Repositorio para gestionar el dispositivo local.
@@ -33,6 +40,8 @@ class DeviceRepository(BaseRepository[Device]):
             session: Sesion de SQLAlchemy
         """
         super().__init__(session, Device)
+        # Dispositivo local ya cargado en esta sesion
+        self._device: Optional[Device] = None
 
     def get_current_device(self) -> Optional[Device]:
         """
@@ -41,30 +50,61 @@ class DeviceRepository(BaseRepository[Device]):
         Returns:
             Device o None si no hay registro
         """
-        query = select(Device).limit(1)
-        result = self.session.execute(query)
+        result = self.session.execute(_CURRENT_DEVICE)
         return result.scalar_one_or_none()
 
+    def _cached_device(self, device_id: str) -> Optional[Device]:
+        """Dispositivo ya cargado, si sigue en la sesion y es el mismo."""
+        device = self._device
+        if device is not None and device in self.session and device.device_id == device_id:
+            return device
+        return None
+
+    def _get_status(self, device_id: str) -> Optional[str]:
+        """
+        Obtiene el estado de un dispositivo.
+
+        Usa el dispositivo ya cargado; si no, consulta solo la columna
+        status, sin crear la instancia.
+
+        Args:
+            device_id: ID del dispositivo
+
+        Returns:
+            Estado o None si no existe
+        """
+        device = self._cached_device(device_id)
+        if device is not None:
+            return device.status
+        return self.session.execute(_DEVICE_STATUS, {"device_id": device_id}).scalar()
+
     def get_by_device_id(self, device_id: str) -> Optional[Device]:
         """
         Obtiene un dispositivo por su device_id.
 
+        El dispositivo encontrado se recuerda mientras siga en la sesion:
+        los chequeos siguientes del mismo device_id no consultan la base.
+
         Args:
             device_id: ID unico del dispositivo
 
         Returns:
             Device o None
         """
-        query = select(Device).where(Device.device_id == device_id)
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+        cached = self._cached_device(device_id)
+        if cached is not None:
+            return cached
+
+        result = self.session.execute(_DEVICE_BY_ID, {"device_id": device_id})
+        self._device = result.scalar_one_or_none()
+        return self._device
 
     def register_or_update_device(self, device_info: DeviceInfo) -> Device:
         """
         Registra o actualiza el dispositivo actual.
 
-        Si el dispositivo ya existe, actualiza su informacion.
-        Si no existe, lo crea.
+        Si el dispositivo ya existe, actualiza su informacion (sin
+        UPDATE ni flush si no cambio nada). Si no existe, lo crea.
 
         Args:
             device_info: Informacion del dispositivo
@@ -77,14 +117,16 @@ class DeviceRepository(BaseRepository[Device]):
         if existing:
             # Actualizar informacion que puede cambiar
             existing.update_from_device_info(device_info)
-            self.session.flush()
-            logger.debug(f"Dispositivo actualizado: {existing.hostname}")
+            if self.session.is_modified(existing):
+                self.session.flush()
+                logger.debug(f"Dispositivo actualizado: {existing.hostname}")
             return existing
         else:
             # Crear nuevo registro
-            device = Device.from_device_info(device_info)
+            device = Device.from_device_info(device_info, now=SyncContext.get(self.session).now)
             self.session.add(device)
             self.session.flush()
+            self._device = device
             logger.info(f"Dispositivo registrado: {device.hostname} ({device.device_id[:8]}...)")
             return device
 
@@ -111,20 +153,34 @@ class DeviceRepository(BaseRepository[Device]):
         Returns:
             Device actualizado o None
         """
-        device = self.get_by_device_id(device_id)
+        status = DeviceStatus(status)
+
+        # Mismos campos que Device.update_status, en un solo UPDATE ... RETURNING
+        values = {
+            Device.status: status.value,
+            Device.status_message: message,
+            Device.last_check: SyncContext.get(self.session).now,
+        }
+        if server_device_id:
+            values[Device.server_device_id] = server_device_id
+        if approved_at:
+            values[Device.approved_at] = approved_at
+        if approved_by:
+            values[Device.approved_by] = approved_by
+
+        stmt = (
+            update(Device)
+            .where(Device.device_id == device_id)
+            .values(values)
+            .returning(Device)
+        )
+        device = self.session.scalars(stmt).one_or_none()
+        self._device = device
+
         if not device:
             logger.warning(f"Dispositivo no encontrado: {device_id[:8]}...")
             return None
 
-        device.update_status(
-            status=status,
-            message=message,
-            server_device_id=server_device_id,
-            approved_at=approved_at,
-            approved_by=approved_by,
-        )
-
-        self.session.flush()
         logger.info(f"Estado de dispositivo actualizado: {status.value}")
         return device
 
@@ -138,8 +194,7 @@ class DeviceRepository(BaseRepository[Device]):
         Returns:
             True si esta aprobado
         """
-        device = self.get_by_device_id(device_id)
-        return device.is_approved() if device else False
+        return self._get_status(device_id) == DeviceStatus.APPROVED.value
 
     def is_device_blocked(self, device_id: str) -> bool:
         """
@@ -151,14 +206,15 @@ class DeviceRepository(BaseRepository[Device]):
         Returns:
             True si esta bloqueado
         """
-        device = self.get_by_device_id(device_id)
-        return device.is_blocked() if device else False
+        return self._get_status(device_id) == DeviceStatus.BLOCKED.value
 
     def ensure_device_registered(self) -> Device:
         """
         Asegura que el dispositivo actual este registrado.
 
-        Si no existe, lo registra automaticamente.
+        Si no existe, lo registra automaticamente. La informacion del
+        equipo se lee una vez por proceso (get_device_info) y el
+        dispositivo ya cargado por este repositorio no se vuelve a consultar.
 
         Returns:
             Device actual
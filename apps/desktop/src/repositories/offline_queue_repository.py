@@ -0,0 +1,69 @@
+"""
+Repositorio de la cola de operaciones offline.
+
+Maneja las operaciones pendientes de enviar al backend.
+"""
+
+from typing import List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .base import BaseRepository
+from src.db import SyncContext
+from src.models import OfflineQueue
+
+
+# Estados que se pueden (re)intentar
+RETRYABLE_STATUSES = ("pending", "failed")
+
+
+class OfflineQueueRepository(BaseRepository[OfflineQueue]):
+    """
+    Repositorio para la cola de operaciones offline.
+
+    Las operaciones se toman en lotes para enviarlas al backend.
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session, OfflineQueue)
+
+    def claim_batch(self, tenant_id: str, limit: int = 50) -> List[OfflineQueue]:
+        """
+        Toma un lote de operaciones para procesar.
+
+        Un solo UPDATE ... RETURNING marca como "processing" las
+        operaciones mas antiguas que admiten reintento (mismo criterio
+        que OfflineQueue.can_retry) y las devuelve. Otra sesion que
+        reclame despues no vuelve a tomar las mismas.
+
+        Args:
+            tenant_id: ID del tenant
+            limit: Maximo de operaciones a tomar
+
+        Returns:
+            Operaciones tomadas, en orden de creacion
+        """
+        pending_ids = (
+            select(OfflineQueue.id)
+            .where(OfflineQueue.tenant_id == tenant_id)
+            .where(OfflineQueue.status.in_(RETRYABLE_STATUSES))
+            .where(OfflineQueue.retry_count < OfflineQueue.max_retries)
+            .order_by(OfflineQueue.id)
+            .limit(limit)
+        )
+
+        stmt = (
+            update(OfflineQueue)
+            .where(OfflineQueue.id.in_(pending_ids.scalar_subquery()))
+            .values(
+                status="processing",
+                last_attempt_at=SyncContext.get(self.session).now,
+            )
+            .returning(OfflineQueue)
+        )
+
+        claimed = self.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).all()
+        return sorted(claimed, key=lambda operation: operation.id)
@@ -5,13 +5,47 @@ Proporciona acceso a productos, categorias y marcas
 con metodos de busqueda optimizados.
 """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional, Union
 
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, or_, and_, case, func, literal, union_all, bindparam
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer_group
 
 from .base import BaseRepository
+from src.db.reference_cache import REFERENCE_CACHE
 from src.models import Product, Category, Brand
+from src.models.product import PRODUCTS_FTS, PRODUCT_TEXT_COLUMNS
+
+
+# Carga de categoria y marca en el mismo SELECT (joinedload); los
+# precios, en una consulta para todos los productos (selectinload)
+_RELATION_OPTIONS = (
+    joinedload(Product.category),
+    joinedload(Product.brand),
+    selectinload(Product.prices),
+)
+
+
+def _active_by_code(column) -> dict:
+    """
+    Consulta de producto activo por codigo, armada una vez.
+
+    Args:
+        column: Columna del codigo (barcode, sku)
+
+    Returns:
+        Diccionario with_relations -> select con :tenant_id y :code
+    """
+    stmt = (
+        select(Product)
+        .where(Product.tenant_id == bindparam("tenant_id"))
+        .where(column == bindparam("code"))
+        .where(Product.is_active == True)
+    )
+    return {False: stmt, True: stmt.options(*_RELATION_OPTIONS)}
+
+
+_PRODUCT_BY_BARCODE = _active_by_code(Product.barcode)
+_PRODUCT_BY_SKU = _active_by_code(Product.sku)
 
 
 class ProductRepository(BaseRepository[Product]):
@@ -25,6 +59,79 @@ class ProductRepository(BaseRepository[Product]):
     def __init__(self, session: Session):
         super().__init__(session, Product)
 
+    def _text_filter(self, query: str, variants: bool = False):
+        """
+        Condicion de busqueda por texto en nombre y codigos.
+
+        Usa el indice FTS5 de productos si existe y el termino tiene
+        al menos 3 caracteres; si no, LIKE '%texto%' sobre las columnas.
+
+        Args:
+            query: Texto de busqueda
+            variants: Buscar tambien en color y talle
+
+        Returns:
+            Condicion para el WHERE
+        """
+        columns = PRODUCTS_FTS.columns if variants else PRODUCT_TEXT_COLUMNS
+        clause = PRODUCTS_FTS.match(
+            self.session.connection(),
+            query,
+            columns=None if variants else PRODUCT_TEXT_COLUMNS,
+        )
+        if clause is not None:
+            return clause
+
+        search_term = f"%{query}%"
+        return or_(*(getattr(Product, column).ilike(search_term) for column in columns))
+
+    @staticmethod
+    def _code_prefix_ranges(prefix: str) -> List[tuple]:
+        """
+        Rangos de codigo (SKU, barras o interno) que empiezan con un texto.
+
+        Cada rango es codigo >= 'abc' AND codigo < 'abd', para que SQLite
+        use los indices (tenant_id, codigo): LIKE 'abc%' no los usa con
+        la collation BINARY. Distingue mayusculas.
+
+        Args:
+            prefix: Comienzo del codigo (no vacio)
+
+        Returns:
+            Lista de (columna, condicion)
+        """
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return [
+            (column, and_(column >= prefix, column < upper))
+            for column in (Product.sku, Product.barcode, Product.internal_code)
+        ]
+
+    @classmethod
+    def _code_prefix_filter(cls, prefix: str):
+        """
+        Condicion de codigo (SKU, barras o interno) que empieza con un texto.
+
+        Args:
+            prefix: Comienzo del codigo (no vacio)
+
+        Returns:
+            Condicion para el WHERE
+        """
+        return or_(*(condition for _, condition in cls._code_prefix_ranges(prefix)))
+
+    @staticmethod
+    def _with_relations(stmt):
+        """
+        Agrega la carga de categoria, marca y precios a un select de Product.
+
+        Args:
+            stmt: Select de Product
+
+        Returns:
+            Select con las opciones de carga
+        """
+        return stmt.options(*_RELATION_OPTIONS)
+
     def search(
         self,
         tenant_id: str,
@@ -34,12 +141,16 @@ class ProductRepository(BaseRepository[Product]):
         brand_id: str = None,
         only_active: bool = True,
         exclude_variants: bool = True,
+        with_relations: bool = False,
+        prefix_only: bool = False,
     ) -> List[Product]:
         """
         Busca productos por texto.
 
         Busca en nombre, SKU, codigo de barras y codigo interno.
         Si hay coincidencia exacta de codigo de barras/SKU, incluye variantes.
+        Con prefix_only busca solo codigos que empiezan con el texto
+        (autocompletado de SKU).
 
         Args:
             tenant_id: ID del tenant
@@ -49,13 +160,40 @@ class ProductRepository(BaseRepository[Product]):
             brand_id: Filtrar por marca
             only_active: Solo productos activos
             exclude_variants: Excluir variantes (mostrar solo padres y simples)
+            with_relations: Cargar categoria, marca y precios
+            prefix_only: Buscar solo por comienzo de codigo, ordenado por
+                el codigo (texto vacio: sin resultados)
 
         Returns:
             Lista de productos que coinciden
         """
-        # Primero buscar coincidencia exacta de codigo de barras o SKU (incluye variantes)
-        exact_stmt = (
-            select(Product)
+        if prefix_only:
+            if not query:
+                return []
+            ranges = self._code_prefix_ranges(query)
+            # Ordenar por el codigo que coincidio: pagina estable al tipear
+            matched_code = case(*((condition, column) for column, condition in ranges))
+            stmt = (
+                select(Product)
+                .where(Product.tenant_id == tenant_id)
+                .where(or_(*(condition for _, condition in ranges)))
+                .order_by(matched_code, Product.id)
+            )
+            if exclude_variants:
+                stmt = stmt.where(Product.parent_product_id == None)
+            if only_active:
+                stmt = stmt.where(Product.is_active == True)
+            if category_id:
+                stmt = stmt.where(Product.category_id == category_id)
+            if brand_id:
+                stmt = stmt.where(Product.brand_id == brand_id)
+            if with_relations:
+                stmt = self._with_relations(stmt)
+            return list(self.session.execute(stmt.limit(limit)).scalars().all())
+
+        # Coincidencia exacta de codigo de barras o SKU (incluye variantes)
+        exact_ids = (
+            select(Product.id, literal(0).label("rank"))
             .where(Product.tenant_id == tenant_id)
             .where(
                 or_(
@@ -66,12 +204,40 @@ class ProductRepository(BaseRepository[Product]):
             )
         )
         if only_active:
-            exact_stmt = exact_stmt.where(Product.is_active == True)
+            exact_ids = exact_ids.where(Product.is_active == True)
+
+        # Busqueda por texto, solo si no hay coincidencia exacta
+        text_ids = (
+            select(Product.id, literal(1).label("rank"))
+            .where(~exact_ids.exists())
+            .where(Product.tenant_id == tenant_id)
+            .where(self._text_filter(query))
+        )
+        if exclude_variants:
+            text_ids = text_ids.where(Product.parent_product_id == None)
+        if only_active:
+            text_ids = text_ids.where(Product.is_active == True)
+        if category_id:
+            text_ids = text_ids.where(Product.category_id == category_id)
+        if brand_id:
+            text_ids = text_ids.where(Product.brand_id == brand_id)
+
+        # Una sola consulta: cada parte usa sus indices
+        ranked = union_all(exact_ids, text_ids).subquery()
+        stmt = (
+            select(Product, ranked.c.rank)
+            .join(ranked, Product.id == ranked.c.id)
+            .order_by(ranked.c.rank)
+            .limit(limit)
+        )
+        if with_relations:
+            stmt = self._with_relations(stmt)
+        rows = self.session.execute(stmt).all()
+        products = [product for product, _ in rows]
 
-        exact_result = self.session.execute(exact_stmt)
-        exact_matches = list(exact_result.scalars().all())
+        if rows and rows[0].rank == 0:
+            exact_matches = products
 
-        if exact_matches:
             # Si hay una sola coincidencia exacta, retornarla
             if len(exact_matches) == 1:
                 return exact_matches
@@ -81,113 +247,45 @@ class ProductRepository(BaseRepository[Product]):
             parent_ids = set(p.parent_product_id for p in exact_matches if p.parent_product_id)
             if len(parent_ids) == 1:
                 # Todas son variantes del mismo padre, retornar el padre
-                parent_id = parent_ids.pop()
-                parent_stmt = select(Product).where(Product.id == parent_id)
-                parent_result = self.session.execute(parent_stmt)
-                parent = parent_result.scalar_one_or_none()
+                parent = self.session.get(
+                    Product,
+                    parent_ids.pop(),
+                    options=_RELATION_OPTIONS if with_relations else None,
+                )
                 if parent:
                     return [parent]
 
             # Si son productos diferentes o mezcla, retornar todos
             return exact_matches
 
-        # Si no hay coincidencia exacta, buscar por texto
-        search_term = f"%{query}%"
-
-        if exclude_variants:
-            # Buscar en productos padre/simples
-            stmt = (
-                select(Product)
+        # Si no hay resultados, buscar en variantes y retornar sus padres
+        if exclude_variants and not products:
+            # Padres de las variantes que coinciden, resueltos en la base
+            variant_parents = (
+                select(Product.parent_product_id)
                 .where(Product.tenant_id == tenant_id)
-                .where(Product.parent_product_id == None)
-                .where(
-                    or_(
-                        Product.name.ilike(search_term),
-                        Product.sku.ilike(search_term),
-                        Product.barcode.ilike(search_term),
-                        Product.internal_code.ilike(search_term),
-                    )
-                )
+                .where(Product.parent_product_id != None)
+                .where(self._text_filter(query, variants=True))
             )
-
             if only_active:
-                stmt = stmt.where(Product.is_active == True)
-            if category_id:
-                stmt = stmt.where(Product.category_id == category_id)
-            if brand_id:
-                stmt = stmt.where(Product.brand_id == brand_id)
-
-            stmt = stmt.limit(limit)
-            result = self.session.execute(stmt)
-            products = list(result.scalars().all())
-
-            # Si no hay resultados, buscar en variantes y retornar sus padres
-            if not products:
-                variant_stmt = (
-                    select(Product)
-                    .where(Product.tenant_id == tenant_id)
-                    .where(Product.parent_product_id != None)
-                    .where(
-                        or_(
-                            Product.name.ilike(search_term),
-                            Product.sku.ilike(search_term),
-                            Product.barcode.ilike(search_term),
-                            Product.internal_code.ilike(search_term),
-                            Product.color.ilike(search_term),
-                            Product.size.ilike(search_term),
-                        )
-                    )
-                )
-                if only_active:
-                    variant_stmt = variant_stmt.where(Product.is_active == True)
-
-                variant_stmt = variant_stmt.limit(limit)
-                variant_result = self.session.execute(variant_stmt)
-                variants = list(variant_result.scalars().all())
-
-                # Obtener los padres únicos de las variantes encontradas
-                parent_ids = list(set(v.parent_product_id for v in variants if v.parent_product_id))
-                if parent_ids:
-                    parent_stmt = (
-                        select(Product)
-                        .where(Product.id.in_(parent_ids))
-                    )
-                    if only_active:
-                        parent_stmt = parent_stmt.where(Product.is_active == True)
-                    parent_result = self.session.execute(parent_stmt)
-                    products = list(parent_result.scalars().all())
-
-            return products
-        else:
-            # Buscar sin excluir variantes
-            stmt = (
-                select(Product)
-                .where(Product.tenant_id == tenant_id)
-                .where(
-                    or_(
-                        Product.name.ilike(search_term),
-                        Product.sku.ilike(search_term),
-                        Product.barcode.ilike(search_term),
-                        Product.internal_code.ilike(search_term),
-                    )
-                )
-            )
+                variant_parents = variant_parents.where(Product.is_active == True)
+            variant_parents = variant_parents.distinct().limit(limit)
 
+            parent_stmt = select(Product).where(Product.id.in_(variant_parents.scalar_subquery()))
             if only_active:
-                stmt = stmt.where(Product.is_active == True)
-            if category_id:
-                stmt = stmt.where(Product.category_id == category_id)
-            if brand_id:
-                stmt = stmt.where(Product.brand_id == brand_id)
+                parent_stmt = parent_stmt.where(Product.is_active == True)
+            if with_relations:
+                parent_stmt = self._with_relations(parent_stmt)
+            parent_result = self.session.execute(parent_stmt)
+            products = list(parent_result.scalars().all())
 
-            stmt = stmt.limit(limit)
-            result = self.session.execute(stmt)
-            return list(result.scalars().all())
+        return products
 
     def get_by_barcode(
         self,
         tenant_id: str,
         barcode: str,
+        with_relations: bool = False,
     ) -> Optional[Product]:
         """
         Obtiene un producto por codigo de barras.
@@ -195,24 +293,21 @@ class ProductRepository(BaseRepository[Product]):
         Args:
             tenant_id: ID del tenant
             barcode: Codigo de barras
+            with_relations: Cargar categoria, marca y precios
 
         Returns:
             Producto o None
         """
-        stmt = (
-            select(Product)
-            .where(Product.tenant_id == tenant_id)
-            .where(Product.barcode == barcode)
-            .where(Product.is_active == True)
+        result = self.session.execute(
+            _PRODUCT_BY_BARCODE[with_relations], {"tenant_id": tenant_id, "code": barcode}
         )
-
-        result = self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     def get_by_sku(
         self,
         tenant_id: str,
         sku: str,
+        with_relations: bool = False,
     ) -> Optional[Product]:
         """
         Obtiene un producto por SKU.
@@ -220,18 +315,14 @@ class ProductRepository(BaseRepository[Product]):
         Args:
             tenant_id: ID del tenant
             sku: SKU del producto
+            with_relations: Cargar categoria, marca y precios
 
         Returns:
             Producto o None
         """
-        stmt = (
-            select(Product)
-            .where(Product.tenant_id == tenant_id)
-            .where(Product.sku == sku)
-            .where(Product.is_active == True)
+        result = self.session.execute(
+            _PRODUCT_BY_SKU[with_relations], {"tenant_id": tenant_id, "code": sku}
         )
-
-        result = self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     def get_by_category(
@@ -241,6 +332,7 @@ class ProductRepository(BaseRepository[Product]):
         limit: int = 50,
         offset: int = 0,
         exclude_variants: bool = True,
+        with_relations: bool = False,
     ) -> List[Product]:
         """
         Obtiene productos de una categoria.
@@ -251,6 +343,7 @@ class ProductRepository(BaseRepository[Product]):
             limit: Limite de resultados
             offset: Desplazamiento
             exclude_variants: Excluir variantes (mostrar solo padres y simples)
+            with_relations: Cargar categoria, marca y precios
 
         Returns:
             Lista de productos
@@ -267,6 +360,8 @@ class ProductRepository(BaseRepository[Product]):
             stmt = stmt.where(Product.parent_product_id == None)
 
         stmt = stmt.order_by(Product.name).offset(offset).limit(limit)
+        if with_relations:
+            stmt = self._with_relations(stmt)
 
         result = self.session.execute(stmt)
         return list(result.scalars().all())
@@ -277,6 +372,7 @@ class ProductRepository(BaseRepository[Product]):
         limit: int = 100,
         offset: int = 0,
         exclude_variants: bool = True,
+        with_relations: bool = False,
     ) -> List[Product]:
         """
         Obtiene productos activos.
@@ -286,6 +382,7 @@ class ProductRepository(BaseRepository[Product]):
             limit: Limite de resultados
             offset: Desplazamiento
             exclude_variants: Excluir variantes (mostrar solo padres y simples)
+            with_relations: Cargar categoria, marca y precios
 
         Returns:
             Lista de productos activos
@@ -301,6 +398,8 @@ class ProductRepository(BaseRepository[Product]):
             stmt = stmt.where(Product.parent_product_id == None)
 
         stmt = stmt.order_by(Product.name).offset(offset).limit(limit)
+        if with_relations:
+            stmt = self._with_relations(stmt)
 
         result = self.session.execute(stmt)
         return list(result.scalars().all())
@@ -309,25 +408,21 @@ class ProductRepository(BaseRepository[Product]):
         """
         Obtiene un producto con sus relaciones cargadas.
 
+        Usa session.get: si el producto ya esta en la sesion no hay
+        consulta (las relaciones que falten se cargan al accederlas).
+
         Args:
             product_id: ID del producto
 
         Returns:
             Producto con categoria, marca y precios
         """
-        stmt = (
-            select(Product)
-            .options(
-                joinedload(Product.category),
-                joinedload(Product.brand),
-                joinedload(Product.prices),
-            )
-            .where(Product.id == product_id)
+        return self.session.get(
+            Product,
+            product_id,
+            options=[*_RELATION_OPTIONS, undefer_group("details")],
         )
 
-        result = self.session.execute(stmt)
-        return result.unique().scalar_one_or_none()
-
 
 class CategoryRepository(BaseRepository[Category]):
     """
@@ -341,16 +436,20 @@ class CategoryRepository(BaseRepository[Category]):
         self,
         tenant_id: str,
         only_active: bool = True,
-    ) -> List[Category]:
+        stream: bool = False,
+    ) -> Union[List[Category], Iterator[Category]]:
         """
         Obtiene categorias raiz (sin padre).
 
+        La lista sale de REFERENCE_CACHE; con stream se consulta la base.
+
         Args:
             tenant_id: ID del tenant
             only_active: Solo categorias activas
+            stream: Devolver un iterador por lotes
 
         Returns:
-            Lista de categorias raiz
+            Lista (o iterador) de categorias raiz
         """
         stmt = (
             select(Category)
@@ -362,15 +461,20 @@ class CategoryRepository(BaseRepository[Category]):
         if only_active:
             stmt = stmt.where(Category.is_active == True)
 
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+        if stream:
+            return self._fetch(stmt, stream=True)
+        return REFERENCE_CACHE.get(
+            self.session,
+            ("root_categories", tenant_id, only_active),
+            lambda: self._fetch(stmt),
+        )
 
     def get_quick_access_categories(
         self,
         tenant_id: str,
     ) -> List[Category]:
         """
-        Obtiene categorias de acceso rapido.
+        Obtiene categorias de acceso rapido (desde REFERENCE_CACHE).
 
         Args:
             tenant_id: ID del tenant
@@ -386,8 +490,11 @@ class CategoryRepository(BaseRepository[Category]):
             .order_by(Category.quick_access_order)
         )
 
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+        return REFERENCE_CACHE.get(
+            self.session,
+            ("quick_access_categories", tenant_id),
+            lambda: self._fetch(stmt),
+        )
 
     def get_children(
         self,
@@ -395,7 +502,7 @@ class CategoryRepository(BaseRepository[Category]):
         parent_id: str,
     ) -> List[Category]:
         """
-        Obtiene subcategorias.
+        Obtiene subcategorias (desde REFERENCE_CACHE).
 
         Args:
             tenant_id: ID del tenant
@@ -412,8 +519,11 @@ class CategoryRepository(BaseRepository[Category]):
             .order_by(Category.name)
         )
 
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+        return REFERENCE_CACHE.get(
+            self.session,
+            ("child_categories", tenant_id, parent_id),
+            lambda: self._fetch(stmt),
+        )
 
 
 class BrandRepository(BaseRepository[Brand]):
@@ -427,15 +537,19 @@ class BrandRepository(BaseRepository[Brand]):
     def get_active_brands(
         self,
         tenant_id: str,
-    ) -> List[Brand]:
+        stream: bool = False,
+    ) -> Union[List[Brand], Iterator[Brand]]:
         """
         Obtiene todas las marcas activas.
 
+        La lista sale de REFERENCE_CACHE; con stream se consulta la base.
+
         Args:
             tenant_id: ID del tenant
+            stream: Devolver un iterador por lotes
 
         Returns:
-            Lista de marcas activas ordenadas por nombre
+            Lista (o iterador) de marcas activas ordenadas por nombre
         """
         stmt = (
             select(Brand)
@@ -444,5 +558,10 @@ class BrandRepository(BaseRepository[Brand]):
             .order_by(Brand.name)
         )
 
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+        if stream:
+            return self._fetch(stmt, stream=True)
+        return REFERENCE_CACHE.get(
+            self.session,
+            ("active_brands", tenant_id),
+            lambda: self._fetch(stmt),
+        )
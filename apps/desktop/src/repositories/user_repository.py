@@ -4,15 +4,34 @@ Repositorio de usuarios.
 Maneja el almacenamiento local de datos de usuario y tenant.
 """
 
-from typing import Optional
+from typing import Iterator, List, Optional, Union
 
-from sqlalchemy import select, update
+from sqlalchemy import String, bindparam, case, func, or_, select, update
 from sqlalchemy.orm import Session
 
 from .base import BaseRepository
 from src.models import User, Tenant, Branch
 
 
+# Consultas frecuentes, armadas una vez (solo cambian los parametros)
+_CURRENT_USER = select(User).where(User.is_current_user == True)
+_USER_BY_EMAIL = (
+    select(User)
+    .where(User.tenant_id == bindparam("tenant_id"))
+    .where(func.lower(User.email) == func.lower(bindparam("email", type_=String)))
+)
+_TENANT_BY_SLUG = select(Tenant).where(Tenant.slug == bindparam("slug"))
+_ACTIVE_TENANT = select(Tenant).join(User).where(User.is_current_user == True)
+_BRANCH_BY_CODE = (
+    select(Branch)
+    .where(Branch.tenant_id == bindparam("tenant_id"))
+    .where(func.lower(Branch.code) == func.lower(bindparam("code", type_=String)))
+)
+
+# Clave de session.info con el tenant del usuario actual
+CURRENT_TENANT_KEY = "current_tenant_id"
+
+
 class UserRepository(BaseRepository[User]):
     """
     Repositorio para operaciones con usuarios.
@@ -20,17 +39,30 @@ class UserRepository(BaseRepository[User]):
 
     def __init__(self, session: Session):
         super().__init__(session, User)
+        # Usuario actual ya cargado en esta sesion
+        self._current_user: Optional[User] = None
 
     def get_current_user(self) -> Optional[User]:
         """
         Obtiene el usuario marcado como actual.
 
+        El usuario encontrado se recuerda mientras siga en la sesion y
+        marcado como actual.
+
         Returns:
             Usuario actual o None
         """
-        stmt = select(User).where(User.is_current_user == True)
-        result = self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        user = self._current_user
+        if user is not None and user in self.session and user.is_current_user:
+            return user
+
+        result = self.session.execute(_CURRENT_USER)
+        self._current_user = result.scalar_one_or_none()
+        if self._current_user is not None:
+            self.session.info[CURRENT_TENANT_KEY] = self._current_user.tenant_id
+        else:
+            self.session.info.pop(CURRENT_TENANT_KEY, None)
+        return self._current_user
 
     def set_current_user(self, user_id: str) -> None:
         """
@@ -41,21 +73,17 @@ class UserRepository(BaseRepository[User]):
         Args:
             user_id: ID del usuario
         """
-        # Desmarcar todos
-        stmt = (
-            update(User)
-            .where(User.is_current_user == True)
-            .values(is_current_user=False)
-        )
-        self.session.execute(stmt)
-
-        # Marcar el nuevo
+        # Un solo UPDATE: desmarca el anterior y marca el nuevo
         stmt = (
             update(User)
-            .where(User.id == user_id)
-            .values(is_current_user=True)
+            .where(or_(User.is_current_user == True, User.id == user_id))
+            .values(is_current_user=case((User.id == user_id, True), else_=False))
+            .returning(User.id, User.tenant_id)
         )
-        self.session.execute(stmt)
+        self.session.info.pop(CURRENT_TENANT_KEY, None)
+        for row in self.session.execute(stmt):
+            if row.id == user_id:
+                self.session.info[CURRENT_TENANT_KEY] = row.tenant_id
         self.session.flush()
 
     def clear_current_user(self) -> None:
@@ -70,6 +98,7 @@ class UserRepository(BaseRepository[User]):
             .values(is_current_user=False)
         )
         self.session.execute(stmt)
+        self.session.info.pop(CURRENT_TENANT_KEY, None)
         self.session.flush()
 
     def get_by_email(
@@ -78,7 +107,11 @@ class UserRepository(BaseRepository[User]):
         email: str,
     ) -> Optional[User]:
         """
-        Obtiene un usuario por email.
+        Obtiene un usuario por email (sin distinguir mayusculas ASCII).
+
+        Ambos lados se pasan por lower() de SQLite, que solo convierte
+        ASCII: asi se usa ix_users_tenant_email_lower y las letras no
+        ASCII se comparan tal cual.
 
         Args:
             tenant_id: ID del tenant
@@ -87,12 +120,9 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Usuario o None
         """
-        stmt = (
-            select(User)
-            .where(User.tenant_id == tenant_id)
-            .where(User.email == email)
+        result = self.session.execute(
+            _USER_BY_EMAIL, {"tenant_id": tenant_id, "email": email}
         )
-        result = self.session.execute(stmt)
         return result.scalar_one_or_none()
 
 
@@ -114,24 +144,29 @@ class TenantRepository(BaseRepository[Tenant]):
         Returns:
             Tenant o None
         """
-        stmt = select(Tenant).where(Tenant.slug == slug)
-        result = self.session.execute(stmt)
+        result = self.session.execute(_TENANT_BY_SLUG, {"slug": slug})
         return result.scalar_one_or_none()
 
     def get_active_tenant(self) -> Optional[Tenant]:
         """
         Obtiene el tenant activo (basado en el usuario actual).
 
+        Si la sesion ya conoce el tenant del usuario actual (ver
+        UserRepository) se busca por primary key, desde el identity map
+        si ya esta cargado.
+
         Returns:
             Tenant del usuario actual o None
         """
-        stmt = (
-            select(Tenant)
-            .join(User)
-            .where(User.is_current_user == True)
-        )
-        result = self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        tenant_id = self.session.info.get(CURRENT_TENANT_KEY)
+        if tenant_id is not None:
+            return self.session.get(Tenant, tenant_id)
+
+        result = self.session.execute(_ACTIVE_TENANT)
+        tenant = result.scalar_one_or_none()
+        if tenant is not None:
+            self.session.info[CURRENT_TENANT_KEY] = tenant.id
+        return tenant
 
 
 class BranchRepository(BaseRepository[Branch]):
@@ -148,7 +183,7 @@ class BranchRepository(BaseRepository[Branch]):
         code: str,
     ) -> Optional[Branch]:
         """
-        Obtiene una sucursal por codigo.
+        Obtiene una sucursal por codigo (sin distinguir mayusculas ASCII).
 
         Args:
             tenant_id: ID del tenant
@@ -157,23 +192,25 @@ class BranchRepository(BaseRepository[Branch]):
         Returns:
             Sucursal o None
         """
-        stmt = (
-            select(Branch)
-            .where(Branch.tenant_id == tenant_id)
-            .where(Branch.code == code)
+        result = self.session.execute(
+            _BRANCH_BY_CODE, {"tenant_id": tenant_id, "code": code}
         )
-        result = self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    def get_active_branches(self, tenant_id: str) -> list[Branch]:
+    def get_active_branches(
+        self,
+        tenant_id: str,
+        stream: bool = False,
+    ) -> Union[List[Branch], Iterator[Branch]]:
         """
         Obtiene las sucursales activas de un tenant.
 
         Args:
             tenant_id: ID del tenant
+            stream: Devolver un iterador por lotes
 
         Returns:
-            Lista de sucursales activas
+            Lista (o iterador) de sucursales activas
         """
         stmt = (
             select(Branch)
@@ -181,5 +218,4 @@ class BranchRepository(BaseRepository[Branch]):
             .where(Branch.is_active == True)
             .order_by(Branch.name)
         )
-        result = self.session.execute(stmt)
-        return list(result.scalars().all())
+        return self._fetch(stmt, stream=stream)
@@ -31,6 +31,12 @@ from src.config.constants import (
 from src.models import Product
 
 
+# Constantes de calculo (evita parsear Decimal en cada operacion)
+ZERO = Decimal("0")
+HUNDRED = Decimal("100")
+CENT = Decimal("0.01")
+
+
 class DiscountType(str, Enum):
     """Tipos de descuento."""
 
@@ -65,7 +71,7 @@ class CartItem:
     unit_price: Decimal
     quantity: Decimal
     discount_type: Optional[DiscountType] = None
-    discount_value: Decimal = field(default_factory=lambda: Decimal("0"))
+    discount_value: Decimal = ZERO
     notes: Optional[str] = None
     added_at: datetime = field(default_factory=datetime.now)
 
@@ -77,18 +83,18 @@ class CartItem:
     def subtotal(self) -> Decimal:
         """Subtotal sin descuento."""
         return (self.unit_price * self.quantity).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
+            CENT, rounding=ROUND_HALF_UP
         )
 
     @property
     def discount_amount(self) -> Decimal:
         """Monto del descuento."""
         if not self.discount_type or self.discount_value <= 0:
-            return Decimal("0")
+            return ZERO
 
         if self.discount_type == DiscountType.PERCENTAGE:
-            return (self.subtotal * self.discount_value / Decimal("100")).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
+            return (self.subtotal * self.discount_value / HUNDRED).quantize(
+                CENT, rounding=ROUND_HALF_UP
             )
         else:  # FIXED_AMOUNT
             return min(self.discount_value, self.subtotal)
@@ -97,7 +103,7 @@ class CartItem:
     def total(self) -> Decimal:
         """Total con descuento aplicado."""
         return (self.subtotal - self.discount_amount).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
+            CENT, rounding=ROUND_HALF_UP
         )
 
     def to_dict(self) -> dict:
@@ -145,7 +151,7 @@ class CartService:
         self._customer_id: Optional[str] = None
         self._customer_name: Optional[str] = None
         self._global_discount_type: Optional[DiscountType] = None
-        self._global_discount_value: Decimal = Decimal("0")
+        self._global_discount_value: Decimal = ZERO
         self._notes: Optional[str] = None
 
         # Callbacks para eventos
@@ -187,14 +193,14 @@ class CartService:
     def global_discount_amount(self) -> Decimal:
         """Monto del descuento global."""
         if not self._global_discount_type or self._global_discount_value <= 0:
-            return Decimal("0")
+            return ZERO
 
         subtotal_after_items = self.subtotal - self.items_discount
 
         if self._global_discount_type == DiscountType.PERCENTAGE:
             return (
-                subtotal_after_items * self._global_discount_value / Decimal("100")
-            ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+                subtotal_after_items * self._global_discount_value / HUNDRED
+            ).quantize(CENT, rounding=ROUND_HALF_UP)
         else:
             return min(self._global_discount_value, subtotal_after_items)
 
@@ -207,7 +213,7 @@ class CartService:
     def total(self) -> Decimal:
         """Total a pagar."""
         return (self.subtotal - self.total_discount).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
+            CENT, rounding=ROUND_HALF_UP
         )
 
     @property
@@ -406,7 +412,7 @@ class CartService:
         item = self._find_item(item_id)
         if item:
             item.discount_type = None
-            item.discount_value = Decimal("0")
+            item.discount_value = ZERO
 
             if self._on_item_updated:
                 self._on_item_updated(item)
@@ -449,7 +455,7 @@ class CartService:
     def clear_global_discount(self) -> None:
         """Elimina el descuento global."""
         self._global_discount_type = None
-        self._global_discount_value = Decimal("0")
+        self._global_discount_value = ZERO
 
     # =========================================================================
     # CLIENTE
@@ -497,7 +503,7 @@ class CartService:
         self._customer_id = None
         self._customer_name = None
         self._global_discount_type = None
-        self._global_discount_value = Decimal("0")
+        self._global_discount_value = ZERO
         self._notes = None
 
         if self._on_cart_cleared:
@@ -14,14 +14,17 @@ import threading
 import uuid
 
 from loguru import logger
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from src.api import get_api_client, NetworkError
 from src.api.products import ProductsAPI, ProductData, CategoryData, BrandData
-from src.api.promotions import PromotionsAPI, PromotionData, CalculationResult
+from src.api.promotions import PromotionsAPI, PromotionData, PromotionIndex, CalculationResult
 from src.api.customers import CustomersAPI, CustomerData
 from src.api.sales import SalesAPI
-from src.db import session_scope, get_session
+from src.db import session_scope, get_session, SyncContext
+from src.db.reference_cache import REFERENCE_CACHE
 from src.models import Product, Category, Brand, Customer, Sale, SaleItem
 
 
@@ -85,6 +88,7 @@ class SyncService:
 
         # Cache de promociones en memoria
         self._active_promotions: List[PromotionData] = []
+        self._promotion_index = PromotionIndex([])
         self._promotions_last_sync: Optional[datetime] = None
 
         # Dias de ventas a mantener en cache local
@@ -262,6 +266,8 @@ class SyncService:
                 except Exception as e:
                     logger.error(f"Error sincronizando categoria {cat_data.id}: {e}")
 
+        # Despues del commit: las lecturas siguientes ven los cambios
+        REFERENCE_CACHE.invalidate()
         return synced
 
     def _upsert_category(self, session: Session, data: CategoryData) -> Category:
@@ -279,6 +285,10 @@ class SyncService:
 
         if category:
             # Actualizar existente
+            if category.name != data.name:
+                session.query(Product).filter_by(category_id=data.id).update(
+                    {Product.category_name: data.name}, synchronize_session=False
+                )
             category.name = data.name
             category.code = data.code
             category.parent_id = data.parent_id
@@ -287,7 +297,7 @@ class SyncService:
             category.quick_access_color = data.quick_access_color
             category.is_active = data.is_active
             category.cianbox_id = data.cianbox_id
-            category.last_synced_at = datetime.now()
+            category.last_synced_at = SyncContext.get(session).now
         else:
             # Crear nueva
             category = Category(
@@ -301,7 +311,7 @@ class SyncService:
                 quick_access_color=data.quick_access_color,
                 is_active=data.is_active,
                 cianbox_id=data.cianbox_id,
-                last_synced_at=datetime.now(),
+                last_synced_at=SyncContext.get(session).now,
             )
             session.add(category)
 
@@ -330,6 +340,8 @@ class SyncService:
                 except Exception as e:
                     logger.error(f"Error sincronizando marca {brand_data.id}: {e}")
 
+        # Despues del commit: las lecturas siguientes ven los cambios
+        REFERENCE_CACHE.invalidate()
         return synced
 
     def _upsert_brand(self, session: Session, data: BrandData) -> Brand:
@@ -347,12 +359,16 @@ class SyncService:
 
         if brand:
             # Actualizar existente
+            if brand.name != data.name:
+                session.query(Product).filter_by(brand_id=data.id).update(
+                    {Product.brand_name: data.name}, synchronize_session=False
+                )
             brand.name = data.name
             brand.code = data.code
             brand.logo_url = data.logo_url
             brand.is_active = data.is_active
             brand.cianbox_id = data.cianbox_id
-            brand.last_synced_at = datetime.now()
+            brand.last_synced_at = SyncContext.get(session).now
         else:
             # Crear nueva
             brand = Brand(
@@ -363,7 +379,7 @@ class SyncService:
                 logo_url=data.logo_url,
                 is_active=data.is_active,
                 cianbox_id=data.cianbox_id,
-                last_synced_at=datetime.now(),
+                last_synced_at=SyncContext.get(session).now,
             )
             session.add(brand)
 
@@ -429,6 +445,17 @@ class SyncService:
         """
         product = session.query(Product).filter_by(id=data.id).first()
 
+        # Nombres denormalizados; si la API no los trae, usar el cache local
+        category_name = data.category_name
+        if category_name is None and data.category_id:
+            category = session.get(Category, data.category_id)
+            category_name = category.name if category else None
+
+        brand_name = data.brand_name
+        if brand_name is None and data.brand_id:
+            brand = session.get(Brand, data.brand_id)
+            brand_name = brand.name if brand else None
+
         if product:
             # Actualizar existente
             product.name = data.name
@@ -439,6 +466,8 @@ class SyncService:
             product.description = data.description
             product.category_id = data.category_id
             product.brand_id = data.brand_id
+            product.category_name = category_name
+            product.brand_name = brand_name
             product.base_price = Decimal(str(data.base_price))
             product.base_cost = Decimal(str(data.base_cost)) if data.base_cost else None
             product.tax_rate = Decimal(str(data.tax_rate))
@@ -454,7 +483,7 @@ class SyncService:
             product.parent_product_id = data.parent_product_id
             product.size = data.size
             product.color = data.color
-            product.last_synced_at = datetime.now()
+            product.last_synced_at = SyncContext.get(session).now
         else:
             # Crear nuevo
             product = Product(
@@ -468,6 +497,8 @@ class SyncService:
                 description=data.description,
                 category_id=data.category_id,
                 brand_id=data.brand_id,
+                category_name=category_name,
+                brand_name=brand_name,
                 base_price=Decimal(str(data.base_price)),
                 base_cost=Decimal(str(data.base_cost)) if data.base_cost else None,
                 tax_rate=Decimal(str(data.tax_rate)),
@@ -483,7 +514,7 @@ class SyncService:
                 parent_product_id=data.parent_product_id,
                 size=data.size,
                 color=data.color,
-                last_synced_at=datetime.now(),
+                last_synced_at=SyncContext.get(session).now,
             )
             session.add(product)
 
@@ -494,6 +525,7 @@ class SyncService:
         search: Optional[str] = None,
         category_id: Optional[str] = None,
         limit: int = 100,
+        prefix_only: bool = False,
     ) -> List[Product]:
         """
         Obtiene productos desde la base de datos local.
@@ -502,13 +534,14 @@ class SyncService:
             search: Texto de busqueda (nombre, SKU, codigo de barras)
             category_id: Filtrar por categoria
             limit: Limite de resultados
+            prefix_only: Buscar search solo como comienzo de codigo
 
         Returns:
             Lista de productos
         """
         from src.repositories.product_repository import ProductRepository
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             repo = ProductRepository(session)
 
             if search:
@@ -517,6 +550,7 @@ class SyncService:
                     query=search,
                     limit=limit,
                     category_id=category_id,
+                    prefix_only=prefix_only,
                 )
             elif category_id:
                 products = repo.get_by_category(
@@ -544,7 +578,7 @@ class SyncService:
         Returns:
             Lista de diccionarios con datos de variantes
         """
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             products = session.query(Product).filter(
                 Product.tenant_id == self.tenant_id,
                 Product.parent_product_id == parent_product_id,
@@ -575,7 +609,7 @@ class SyncService:
         """
         from src.repositories.product_repository import CategoryRepository
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             repo = CategoryRepository(session)
             categories = repo.get_root_categories(
                 tenant_id=self.tenant_id,
@@ -593,7 +627,7 @@ class SyncService:
         """
         from src.repositories.product_repository import CategoryRepository
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             repo = CategoryRepository(session)
             categories = repo.get_quick_access_categories(
                 tenant_id=self.tenant_id,
@@ -617,7 +651,7 @@ class SyncService:
         from src.repositories.product_repository import ProductRepository
 
         # Buscar localmente
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             repo = ProductRepository(session)
             product = repo.get_by_barcode(
                 tenant_id=self.tenant_id,
@@ -653,7 +687,7 @@ class SyncService:
         """
         from sqlalchemy import select, func
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             count = session.execute(
                 select(func.count(Product.id))
                 .where(Product.tenant_id == self.tenant_id)
@@ -684,7 +718,17 @@ class SyncService:
         Returns:
             True si hay productos cacheados
         """
-        return self.get_products_count() > 0
+        from sqlalchemy import select, exists
+
+        # EXISTS se detiene en el primer producto (COUNT los recorre todos)
+        with session_scope(readonly=True) as session:
+            return bool(session.execute(
+                select(
+                    exists()
+                    .where(Product.tenant_id == self.tenant_id)
+                    .where(Product.is_active == True)
+                )
+            ).scalar())
 
     # =========================================================================
     # PROMOCIONES
@@ -703,6 +747,7 @@ class SyncService:
         try:
             promotions = self._promotions_api.get_active()
             self._active_promotions = promotions
+            self._promotion_index = PromotionIndex(promotions)
             self._promotions_last_sync = datetime.now()
             return len(promotions)
         except Exception as e:
@@ -799,10 +844,9 @@ class SyncService:
         Returns:
             PromotionData si hay promocion aplicable, None si no
         """
-        promotions = self.get_active_promotions()
-        return self._promotions_api.get_promotion_for_product(
-            promotions, product_id, category_id, brand_id
-        )
+        # Refresca el cache (y el indice) si esta vencido
+        self.get_active_promotions()
+        return self._promotion_index.first_for(product_id, category_id, brand_id)
 
     # =========================================================================
     # CLIENTES
@@ -891,7 +935,7 @@ class SyncService:
             customer.global_discount = data.global_discount
             customer.is_active = data.is_active
             customer.cianbox_id = data.cianbox_id
-            customer.last_synced_at = datetime.now()
+            customer.last_synced_at = SyncContext.get(session).now
         else:
             # Crear nuevo
             customer = Customer(
@@ -920,7 +964,7 @@ class SyncService:
                 global_discount=data.global_discount,
                 is_active=data.is_active,
                 cianbox_id=data.cianbox_id,
-                last_synced_at=datetime.now(),
+                last_synced_at=SyncContext.get(session).now,
             )
             session.add(customer)
 
@@ -943,7 +987,7 @@ class SyncService:
         """
         from src.repositories.customer_repository import CustomerRepository
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             repo = CustomerRepository(session)
 
             if search:
@@ -962,6 +1006,53 @@ class SyncService:
             session.expunge_all()
             return customers
 
+    def get_local_customer_rows(
+        self,
+        search: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[Any]:
+        """
+        Obtiene filas livianas de clientes para listados.
+
+        No hidrata instancias ORM; para operar sobre un cliente
+        usar get_customer con el id de la fila.
+
+        Args:
+            search: Texto de busqueda (nombre, documento, email)
+            limit: Limite de resultados
+
+        Returns:
+            Lista de filas (ver CUSTOMER_LIST_COLUMNS)
+        """
+        from src.db.queries import load_customer_rows
+
+        with session_scope(readonly=True) as session:
+            return load_customer_rows(
+                session,
+                tenant_id=self.tenant_id,
+                search=search,
+                limit=limit,
+            )
+
+    def get_customer(self, customer_id: str) -> Optional[Customer]:
+        """
+        Obtiene un cliente por ID.
+
+        Args:
+            customer_id: ID del cliente
+
+        Returns:
+            Cliente o None
+        """
+        with session_scope(readonly=True) as session:
+            customer = session.get(Customer, customer_id)
+
+            if customer:
+                session.expunge(customer)
+                return customer
+
+        return None
+
     def get_customer_by_tax_id(self, tax_id: str) -> Optional[Customer]:
         """
         Busca un cliente por documento fiscal.
@@ -974,7 +1065,7 @@ class SyncService:
         """
         from src.repositories.customer_repository import CustomerRepository
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             repo = CustomerRepository(session)
             customer = repo.get_by_tax_id(
                 tenant_id=self.tenant_id,
@@ -996,7 +1087,7 @@ class SyncService:
         """
         from sqlalchemy import select
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             customer = session.execute(
                 select(Customer)
                 .where(Customer.tenant_id == self.tenant_id)
@@ -1018,7 +1109,7 @@ class SyncService:
         """
         from sqlalchemy import select, func
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             count = session.execute(
                 select(func.count(Customer.id))
                 .where(Customer.tenant_id == self.tenant_id)
@@ -1062,16 +1153,29 @@ class SyncService:
             if not sales:
                 break
 
+            sale_rows = []
+            item_rows = []
+            now = datetime.now()
+            for sale_data in sales:
+                try:
+                    # Solo sincronizar ventas que se pueden devolver
+                    status = sale_data.get("status", "")
+                    if status in ("COMPLETED", "PARTIAL_REFUND"):
+                        sale_row = self._sale_row(sale_data, now)
+                        items = [
+                            self._sale_item_row(sale_row["id"], item_data)
+                            for item_data in sale_data.get("items") or []
+                        ]
+                        sale_rows.append(sale_row)
+                        item_rows.extend(items)
+                except Exception as e:
+                    logger.error(f"Error sincronizando venta {sale_data.get('id')}: {e}")
+
+            # Un INSERT ... ON CONFLICT por tabla para toda la pagina
             with session_scope() as session:
-                for sale_data in sales:
-                    try:
-                        # Solo sincronizar ventas que se pueden devolver
-                        status = sale_data.get("status", "")
-                        if status in ("COMPLETED", "PARTIAL_REFUND"):
-                            self._upsert_sale(session, sale_data)
-                            synced += 1
-                    except Exception as e:
-                        logger.error(f"Error sincronizando venta {sale_data.get('id')}: {e}")
+                self._bulk_upsert(session, Sale, sale_rows, keep=("tenant_id", "branch_id"))
+                self._bulk_upsert(session, SaleItem, item_rows, keep=("sale_id",))
+            synced += len(sale_rows)
 
             # Verificar si hay mas paginas
             if pagination:
@@ -1090,25 +1194,58 @@ class SyncService:
 
         return synced
 
-    def _upsert_sale(self, session: Session, data: dict) -> Sale:
+    def _bulk_upsert(
+        self,
+        session: Session,
+        model: type,
+        rows: List[Dict[str, Any]],
+        keep: Tuple[str, ...] = (),
+    ) -> None:
         """
-        Inserta o actualiza una venta.
+        Inserta o actualiza filas en lote (INSERT ... ON CONFLICT DO UPDATE).
+
+        No pasa por el unit of work del ORM: las filas deben traer todas
+        las columnas que se quieren guardar, con las mismas claves.
 
         Args:
             session: Sesion de base de datos
+            model: Modelo destino (Sale, SaleItem)
+            rows: Filas como diccionarios
+            keep: Columnas que no se pisan si la fila ya existe
+        """
+        if not rows:
+            return
+
+        stmt = sqlite_insert(model)
+        update = {
+            name: stmt.excluded[name]
+            for name in rows[0]
+            if name != "id" and name not in keep
+        }
+        # onupdate no se aplica en ON CONFLICT: asignarlo a mano
+        update["updated_at"] = func.now()
+
+        session.execute(
+            stmt.on_conflict_do_update(index_elements=["id"], set_=update),
+            rows,
+        )
+
+    def _sale_row(self, data: dict, now: datetime) -> Dict[str, Any]:
+        """
+        Convierte una venta de la API en una fila de la tabla sales.
+
+        Args:
             data: Datos de la venta desde API
+            now: Fecha de sincronizacion del lote
 
         Returns:
-            Venta creada o actualizada
+            Diccionario con las columnas de Sale
         """
         from dateutil.parser import parse as parse_date
 
-        sale_id = data.get("id")
-        sale = session.query(Sale).filter_by(id=sale_id).first()
-
         # Parsear fecha
         sale_date_str = data.get("saleDate") or data.get("createdAt")
-        sale_date = parse_date(sale_date_str) if sale_date_str else datetime.now()
+        sale_date = parse_date(sale_date_str) if sale_date_str else now
 
         # Datos del cliente
         customer = data.get("customer") or {}
@@ -1127,114 +1264,65 @@ class SyncService:
         pos_id = pos.get("id") if pos else data.get("pointOfSaleId")
         pos_name = pos.get("name") if pos else None
 
-        if sale:
-            # Actualizar existente
-            sale.sale_number = data.get("saleNumber", "")
-            sale.sale_date = sale_date
-            sale.customer_id = customer_id
-            sale.customer_name = customer_name
-            sale.subtotal = Decimal(str(data.get("subtotal", 0)))
-            sale.discount = Decimal(str(data.get("discount", 0)))
-            sale.tax = Decimal(str(data.get("tax", 0)))
-            sale.total = Decimal(str(data.get("total", 0)))
-            sale.status = data.get("status", "COMPLETED")
-            sale.receipt_type = data.get("receiptType", "NDP_X")
-            sale.fiscal_number = data.get("fiscalNumber")
-            sale.user_id = user_id
-            sale.user_name = user_name
-            sale.point_of_sale_id = pos_id
-            sale.point_of_sale_name = pos_name
-            sale.branch_name = branch_name
-            sale.notes = data.get("notes")
-            sale.last_synced_at = datetime.now()
-        else:
-            # Crear nueva
-            sale = Sale(
-                id=sale_id,
-                tenant_id=self.tenant_id,
-                branch_id=data.get("branchId") or (branch.get("id") if branch else ""),
-                sale_number=data.get("saleNumber", ""),
-                sale_date=sale_date,
-                customer_id=customer_id,
-                customer_name=customer_name,
-                subtotal=Decimal(str(data.get("subtotal", 0))),
-                discount=Decimal(str(data.get("discount", 0))),
-                tax=Decimal(str(data.get("tax", 0))),
-                total=Decimal(str(data.get("total", 0))),
-                status=data.get("status", "COMPLETED"),
-                receipt_type=data.get("receiptType", "NDP_X"),
-                fiscal_number=data.get("fiscalNumber"),
-                user_id=user_id,
-                user_name=user_name,
-                point_of_sale_id=pos_id,
-                point_of_sale_name=pos_name,
-                branch_name=branch_name,
-                notes=data.get("notes"),
-                last_synced_at=datetime.now(),
-            )
-            session.add(sale)
+        return {
+            "id": data.get("id"),
+            "tenant_id": self.tenant_id,
+            "branch_id": data.get("branchId") or (branch.get("id") if branch else ""),
+            "sale_number": data.get("saleNumber", ""),
+            "sale_date": sale_date,
+            "customer_id": customer_id,
+            "customer_name": customer_name,
+            "subtotal": Decimal(str(data.get("subtotal", 0))),
+            "discount": Decimal(str(data.get("discount", 0))),
+            "tax": Decimal(str(data.get("tax", 0))),
+            "total": Decimal(str(data.get("total", 0))),
+            "status": data.get("status", "COMPLETED"),
+            "receipt_type": data.get("receiptType", "NDP_X"),
+            "fiscal_number": data.get("fiscalNumber"),
+            "user_id": user_id,
+            "user_name": user_name,
+            "point_of_sale_id": pos_id,
+            "point_of_sale_name": pos_name,
+            "branch_name": branch_name,
+            "notes": data.get("notes"),
+            "last_synced_at": now,
+        }
+
+    def _sale_item_row(self, sale_id: str, data: dict) -> Dict[str, Any]:
+        """
+        Convierte un item de venta de la API en una fila de sale_items.
 
-        # Sincronizar items
-        items = data.get("items") or []
-        for item_data in items:
-            self._upsert_sale_item(session, sale_id, item_data)
-
-        return sale
+        Args:
+            sale_id: ID de la venta
+            data: Datos del item desde API
 
-    def _upsert_sale_item(self, session: Session, sale_id: str, data: dict) -> SaleItem:
-        """
-        Inserta o actualiza un item de venta.
+        Returns:
+            Diccionario con las columnas de SaleItem
         """
-        item_id = data.get("id")
-        item = session.query(SaleItem).filter_by(id=item_id).first()
-
         # Calcular cantidad devuelta
         refund_items = data.get("refundItems") or []
         refunded_qty = sum(abs(float(r.get("quantity", 0))) for r in refund_items)
 
-        if item:
-            # Actualizar existente
-            item.product_id = data.get("productId")
-            item.product_code = data.get("productCode")
-            item.product_name = data.get("productName", "")
-            item.product_barcode = data.get("productBarcode")
-            item.quantity = Decimal(str(data.get("quantity", 0)))
-            item.unit_price = Decimal(str(data.get("unitPrice", 0)))
-            item.unit_price_net = Decimal(str(data.get("unitPriceNet", 0))) if data.get("unitPriceNet") else None
-            item.discount = Decimal(str(data.get("discount", 0)))
-            item.subtotal = Decimal(str(data.get("subtotal", 0)))
-            item.tax_rate = Decimal(str(data.get("taxRate", 21)))
-            item.tax_amount = Decimal(str(data.get("taxAmount", 0)))
-            item.promotion_id = data.get("promotionId")
-            item.promotion_name = data.get("promotionName")
-            item.is_return = data.get("isReturn", False)
-            item.original_item_id = data.get("originalItemId")
-            item.refunded_quantity = Decimal(str(refunded_qty))
-        else:
-            # Crear nuevo
-            item = SaleItem(
-                id=item_id,
-                sale_id=sale_id,
-                product_id=data.get("productId"),
-                product_code=data.get("productCode"),
-                product_name=data.get("productName", ""),
-                product_barcode=data.get("productBarcode"),
-                quantity=Decimal(str(data.get("quantity", 0))),
-                unit_price=Decimal(str(data.get("unitPrice", 0))),
-                unit_price_net=Decimal(str(data.get("unitPriceNet", 0))) if data.get("unitPriceNet") else None,
-                discount=Decimal(str(data.get("discount", 0))),
-                subtotal=Decimal(str(data.get("subtotal", 0))),
-                tax_rate=Decimal(str(data.get("taxRate", 21))),
-                tax_amount=Decimal(str(data.get("taxAmount", 0))),
-                promotion_id=data.get("promotionId"),
-                promotion_name=data.get("promotionName"),
-                is_return=data.get("isReturn", False),
-                original_item_id=data.get("originalItemId"),
-                refunded_quantity=Decimal(str(refunded_qty)),
-            )
-            session.add(item)
-
-        return item
+        return {
+            "id": data.get("id"),
+            "sale_id": sale_id,
+            "product_id": data.get("productId"),
+            "product_code": data.get("productCode"),
+            "product_name": data.get("productName", ""),
+            "product_barcode": data.get("productBarcode"),
+            "quantity": Decimal(str(data.get("quantity", 0))),
+            "unit_price": Decimal(str(data.get("unitPrice", 0))),
+            "unit_price_net": Decimal(str(data.get("unitPriceNet", 0))) if data.get("unitPriceNet") else None,
+            "discount": Decimal(str(data.get("discount", 0))),
+            "subtotal": Decimal(str(data.get("subtotal", 0))),
+            "tax_rate": Decimal(str(data.get("taxRate", 21))),
+            "tax_amount": Decimal(str(data.get("taxAmount", 0))),
+            "promotion_id": data.get("promotionId"),
+            "promotion_name": data.get("promotionName"),
+            "is_return": data.get("isReturn", False),
+            "original_item_id": data.get("originalItemId"),
+            "refunded_quantity": Decimal(str(refunded_qty)),
+        }
 
     def _cleanup_old_sales(self) -> int:
         """
@@ -1286,11 +1374,11 @@ class SyncService:
             Dict con producto y lista de ventas
         """
         from sqlalchemy import or_, and_
-        from sqlalchemy.orm import joinedload
+        from sqlalchemy.orm import selectinload
 
         logger.info(f"Buscando ventas por producto: '{query}'")
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             # Primero buscar el producto
             logger.debug(f"Buscando producto con query: {query}")
             product = session.query(Product).filter(
@@ -1310,14 +1398,19 @@ class SyncService:
 
             logger.info(f"Producto encontrado: {product.name} (ID: {product.id})")
 
-            # Buscar ventas con este producto (con eager loading de items)
+            # Buscar ventas con este producto (items en un solo SELECT ... IN)
+            # EXISTS en lugar de JOIN: una venta por fila, asi LIMIT cuenta ventas
+            # Solo items con saldo a devolver, filtrado en SQL
             # Excluir devoluciones (NDC_X, CREDIT_NOTE_*) - no se puede devolver una devolución
             sales = session.query(Sale).options(
-                joinedload(Sale.items)
-            ).join(SaleItem).filter(
+                selectinload(Sale.items)
+            ).filter(
                 Sale.tenant_id == self.tenant_id,
                 Sale.status.in_(["COMPLETED", "PARTIAL_REFUND"]),
-                SaleItem.product_id == product.id,
+                Sale.items.any(and_(
+                    SaleItem.product_id == product.id,
+                    SaleItem.available_quantity > 0,
+                )),
                 ~Sale.receipt_type.in_(["NDC_X", "CREDIT_NOTE_A", "CREDIT_NOTE_B", "CREDIT_NOTE_C"]),
             ).order_by(Sale.sale_date.desc()).limit(limit).all()
 
@@ -1331,7 +1424,7 @@ class SyncService:
                 has_matching_item = False
 
                 for item in sale.items:
-                    available_qty = float(abs(item.quantity)) - float(item.refunded_quantity)
+                    available_qty = float(item.available_quantity)
                     is_match = item.product_id == product.id
 
                     if is_match and available_qty > 0:
@@ -1390,11 +1483,11 @@ class SyncService:
         Returns:
             Lista de ventas con sus items
         """
-        from sqlalchemy.orm import joinedload
+        from sqlalchemy.orm import selectinload
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             sales = session.query(Sale).options(
-                joinedload(Sale.items)
+                selectinload(Sale.items)
             ).filter(
                 Sale.tenant_id == self.tenant_id
             ).order_by(Sale.sale_date.desc()).limit(limit).all()
@@ -1436,7 +1529,7 @@ class SyncService:
         """
         from sqlalchemy import select, func
 
-        with session_scope() as session:
+        with session_scope(readonly=True) as session:
             count = session.execute(
                 select(func.count(Sale.id))
                 .where(Sale.tenant_id == self.tenant_id)
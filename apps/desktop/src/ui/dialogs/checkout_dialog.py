@@ -37,10 +37,20 @@ from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QKeyEvent
 from loguru import logger
 
-from src.config.constants import PaymentMethod, BILL_DENOMINATIONS
+from src.config.constants import PaymentMethod, BILL_DENOMINATIONS, as_payment_method
 from src.ui.styles import get_theme
 
 
+# Indice del panel de cada metodo en el QStackedWidget
+_PAYMENT_PANEL_INDEX = {
+    PaymentMethod.CASH: 0,
+    PaymentMethod.DEBIT_CARD: 1,
+    PaymentMethod.CREDIT_CARD: 2,
+    PaymentMethod.QR: 3,
+    PaymentMethod.GIFTCARD: 4,
+}
+
+
 @dataclass
 class PaymentData:
     """Datos de un pago individual."""
@@ -1131,12 +1141,13 @@ class CheckoutDialog(QDialog):
 
     def _select_method(self, method: PaymentMethod) -> None:
         """Selecciona un metodo de pago."""
+        method = as_payment_method(method)
         self.current_method = method
 
         # Actualizar estilos de botones
         for m, btn in self.method_buttons.items():
             color = btn.property("color")
-            if m == method:
+            if m is method:
                 btn.setStyleSheet(f"""
                     QPushButton {{
                         background-color: {color};
@@ -1165,14 +1176,7 @@ class CheckoutDialog(QDialog):
                 btn.setChecked(False)
 
         # Cambiar panel
-        index_map = {
-            PaymentMethod.CASH: 0,
-            PaymentMethod.DEBIT_CARD: 1,
-            PaymentMethod.CREDIT_CARD: 2,
-            PaymentMethod.QR: 3,
-            PaymentMethod.GIFTCARD: 4,
-        }
-        self.payment_stack.setCurrentIndex(index_map.get(method, 0))
+        self.payment_stack.setCurrentIndex(_PAYMENT_PANEL_INDEX.get(method, 0))
 
         logger.debug(f"Metodo de pago seleccionado: {method.value}")
 
@@ -1276,7 +1280,7 @@ class CheckoutDialog(QDialog):
     def _on_confirm(self) -> None:
         """Confirma el pago."""
         # Validar segun metodo
-        if self.current_method == PaymentMethod.CASH:
+        if self.current_method is PaymentMethod.CASH:
             if self.cash_amount < self.remaining_amount:
                 QMessageBox.warning(
                     self,
@@ -1292,7 +1296,7 @@ class CheckoutDialog(QDialog):
             )
             change = self.cash_amount - self.remaining_amount
 
-        elif self.current_method == PaymentMethod.DEBIT_CARD:
+        elif self.current_method is PaymentMethod.DEBIT_CARD:
             digits = self.debit_digits_input.text().strip() if hasattr(self, 'debit_digits_input') else None
             payment = PaymentData(
                 method=PaymentMethod.DEBIT_CARD,
@@ -1301,7 +1305,7 @@ class CheckoutDialog(QDialog):
             )
             change = 0.0
 
-        elif self.current_method == PaymentMethod.CREDIT_CARD:
+        elif self.current_method is PaymentMethod.CREDIT_CARD:
             digits = self.credit_digits_input.text().strip() if hasattr(self, 'credit_digits_input') else None
             installments = 1
             if hasattr(self, 'installments_group'):
@@ -1317,14 +1321,14 @@ class CheckoutDialog(QDialog):
             )
             change = 0.0
 
-        elif self.current_method == PaymentMethod.QR:
+        elif self.current_method is PaymentMethod.QR:
             payment = PaymentData(
                 method=PaymentMethod.QR,
                 amount=self.remaining_amount,
             )
             change = 0.0
 
-        elif self.current_method == PaymentMethod.GIFTCARD:
+        elif self.current_method is PaymentMethod.GIFTCARD:
             if not hasattr(self, '_giftcard_amount_to_apply') or self._giftcard_amount_to_apply <= 0:
                 QMessageBox.warning(self, "Error", "Consulte primero una gift card valida")
                 return
@@ -1418,7 +1422,7 @@ class CheckoutDialog(QDialog):
             self._select_method(PaymentMethod.QR)
         else:
             # Pasar digitos al teclado numerico si estamos en efectivo
-            if self.current_method == PaymentMethod.CASH:
+            if self.current_method is PaymentMethod.CASH:
                 text = event.text()
                 if text.isdigit():
                     self._append_digit(text)
@@ -370,7 +370,7 @@ class CustomerDialog(QDialog):
     def _load_initial_customers(self) -> None:
         """Carga clientes iniciales (todos)."""
         try:
-            customers = self.sync_service.get_local_customers(limit=500)
+            customers = self.sync_service.get_local_customer_rows(limit=500)
             self._update_table(customers)
             self.search_input.setFocus()
         except Exception as e:
@@ -392,10 +392,9 @@ class CustomerDialog(QDialog):
         try:
             query = self.search_input.text().strip()
 
-            if query:
-                customers = self.sync_service.get_local_customers(search=query, limit=500)
-            else:
-                customers = self.sync_service.get_local_customers(limit=500)
+            customers = self.sync_service.get_local_customer_rows(
+                search=query or None, limit=500
+            )
 
             self._update_table(customers)
         except Exception as e:
@@ -403,7 +402,12 @@ class CustomerDialog(QDialog):
             self.results_label.setText(f"Error: {e}")
 
     def _update_table(self, customers: list) -> None:
-        """Actualiza la tabla con los clientes."""
+        """
+        Actualiza la tabla con los clientes.
+
+        Args:
+            customers: Filas livianas (ver CUSTOMER_LIST_COLUMNS)
+        """
         self.customers_table.setRowCount(len(customers))
 
         type_labels = {
@@ -416,7 +420,7 @@ class CustomerDialog(QDialog):
 
         for row, customer in enumerate(customers):
             # Nombre
-            name = customer.display_name or customer.name or "-"
+            name = customer.trade_name or customer.name or "-"
             name_item = QTableWidgetItem(name)
             self.customers_table.setItem(row, 0, name_item)
 
@@ -447,7 +451,7 @@ class CustomerDialog(QDialog):
             self.customers_table.setItem(row, 5, type_item)
 
             # Credito
-            credit_text = "Si" if customer.has_credit else "No"
+            credit_text = "Si" if (customer.credit_limit or 0) > 0 else "No"
             credit_item = QTableWidgetItem(credit_text)
             self.customers_table.setItem(row, 6, credit_item)
 
@@ -457,8 +461,8 @@ class CustomerDialog(QDialog):
             discount_item = QTableWidgetItem(discount_text)
             self.customers_table.setItem(row, 7, discount_item)
 
-            # Guardar referencia al cliente
-            name_item.setData(Qt.ItemDataRole.UserRole, customer)
+            # Guardar el ID; el cliente completo se carga al seleccionarlo
+            name_item.setData(Qt.ItemDataRole.UserRole, customer.id)
 
         self.results_label.setText(f"{len(customers)} clientes encontrados")
         self.selected_customer = None
@@ -477,7 +481,8 @@ class CustomerDialog(QDialog):
             if not item:
                 return
 
-            customer = item.data(Qt.ItemDataRole.UserRole)
+            customer_id = item.data(Qt.ItemDataRole.UserRole)
+            customer = self.sync_service.get_customer(customer_id) if customer_id else None
 
             if customer:
                 self.selected_customer = customer
@@ -389,14 +389,6 @@ class ProductLookupDialog(QDialog):
         """Actualiza la tabla con los productos."""
         self.products_table.setRowCount(len(products))
 
-        # Cargar categorias una sola vez para mapear
-        category_map = {}
-        try:
-            categories = self.sync_service.get_local_categories()
-            category_map = {cat.id: cat.name for cat in categories}
-        except Exception:
-            pass
-
         for row, product in enumerate(products):
             # Codigo
             code = product.barcode or product.sku or product.internal_code or "-"
@@ -414,8 +406,7 @@ class ProductLookupDialog(QDialog):
             self.products_table.setItem(row, 1, name_item)
 
             # Categoria
-            category_name = category_map.get(product.category_id, "-") if product.category_id else "-"
-            cat_item = QTableWidgetItem(category_name)
+            cat_item = QTableWidgetItem(product.category_name or "-")
             self.products_table.setItem(row, 2, cat_item)
 
             # Stock
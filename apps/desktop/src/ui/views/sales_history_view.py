@@ -28,6 +28,7 @@ from PyQt6.QtGui import QFont
 
 from loguru import logger
 
+from src.config.constants import ReceiptType, SaleStatus
 from src.ui.styles.theme import Theme
 from src.services.sync_service import SyncService
 
@@ -356,19 +357,9 @@ class SalesHistoryView(QWidget):
 
             # Tipo de comprobante
             receipt_type = sale.get("receiptType", "NDP_X")
-            receipt_map = {
-                "TICKET": "NDP X",     # @deprecated - mantener por compatibilidad
-                "NDP_X": "NDP X",      # Nota de Pedido X (comprobante provisorio)
-                "NDC_X": "NDC X",      # Nota de Crédito X (devolución provisoria)
-                "INVOICE_A": "Fact. A",
-                "INVOICE_B": "Fact. B",
-                "INVOICE_C": "Fact. C",
-                "CREDIT_NOTE_A": "NC A",
-                "CREDIT_NOTE_B": "NC B",
-                "CREDIT_NOTE_C": "NC C",
-                "RECEIPT": "Recibo",
-            }
-            type_item = QTableWidgetItem(receipt_map.get(receipt_type, receipt_type or "NDP X"))
+            type_item = QTableWidgetItem(
+                ReceiptType.label(receipt_type) if receipt_type else "NDP X"
+            )
             if receipt_type and receipt_type.startswith("INVOICE"):
                 type_item.setForeground(Qt.GlobalColor.darkGreen)
             elif receipt_type and (receipt_type.startswith("CREDIT_NOTE") or receipt_type == "NDC_X"):
@@ -390,15 +381,12 @@ class SalesHistoryView(QWidget):
 
             # Estado
             sale_status = sale.get("status", "COMPLETED")
-            status_map = {
-                "COMPLETED": "Completada",
-                "VOIDED": "Anulada",
-                "CANCELLED": "Anulada",
-                "CANCELED": "Anulada",
-                "REFUNDED": "Devolución",
-                "PARTIAL_REFUND": "Dev. Parcial",
-            }
-            status_item = QTableWidgetItem(status_map.get(sale_status, sale_status))
+            if sale_status in ("VOIDED", "CANCELED"):
+                # Variantes del backend para ventas anuladas
+                status_text = SaleStatus.label(SaleStatus.CANCELLED)
+            else:
+                status_text = SaleStatus.label(sale_status)
+            status_item = QTableWidgetItem(status_text)
             if sale_status in ["VOIDED", "CANCELLED", "CANCELED"]:
                 status_item.setForeground(Qt.GlobalColor.red)
             elif sale_status in ["REFUNDED", "PARTIAL_REFUND"]:
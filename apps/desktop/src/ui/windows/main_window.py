@@ -45,7 +45,7 @@ from PyQt6.QtCore import Qt, QSize, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont, QKeyEvent, QAction, QCloseEvent, QPixmap, QColor
 from loguru import logger
 
-from src.config import get_settings
+from src.config import get_settings, get_key_sequences
 from src.api import get_api_client, PromotionData, CalculationResult
 from src.api.products import ProductsAPI
 from src.api.sales import SalesAPI, CreateSaleRequest, SaleItemData, PaymentData as SalePaymentData
@@ -1789,20 +1789,22 @@ class MainWindow(QMainWindow):
 
     def _setup_shortcuts(self) -> None:
         """Configura atajos de teclado para navegacion."""
-        from PyQt6.QtGui import QShortcut, QKeySequence
+        from PyQt6.QtGui import QShortcut
+
+        sequences = get_key_sequences()
 
         # F1 - Punto de Venta
-        QShortcut(QKeySequence(Qt.Key.Key_F1), self, lambda: self._navigate_to("pos"))
+        QShortcut(sequences["F1"], self, lambda: self._navigate_to("pos"))
         # F2 - Devoluciones
-        QShortcut(QKeySequence(Qt.Key.Key_F2), self, lambda: self._navigate_to("refund"))
+        QShortcut(sequences["F2"], self, lambda: self._navigate_to("refund"))
         # F3 - Consulta Productos
-        QShortcut(QKeySequence(Qt.Key.Key_F3), self, lambda: self._navigate_to("lookup"))
+        QShortcut(sequences["F3"], self, lambda: self._navigate_to("lookup"))
         # F4 - Historial Ventas
-        QShortcut(QKeySequence(Qt.Key.Key_F4), self, lambda: self._navigate_to("history"))
+        QShortcut(sequences["F4"], self, lambda: self._navigate_to("history"))
         # F5 - Cierre de Caja
-        QShortcut(QKeySequence(Qt.Key.Key_F5), self, lambda: self._navigate_to("close"))
+        QShortcut(sequences["F5"], self, lambda: self._navigate_to("close"))
         # F6 - Sincronizar
-        QShortcut(QKeySequence(Qt.Key.Key_F6), self, lambda: self._navigate_to("sync"))
+        QShortcut(sequences["F6"], self, lambda: self._navigate_to("sync"))
 
     def _navigate_to(self, item_id: str) -> None:
         """Navega a una vista por su ID."""
@@ -2160,8 +2162,8 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error filtrando productos: {e}")
 
-    def _search_products(self, query: str) -> None:
-        """Busca productos por texto."""
+    def _search_products(self, query: str, prefix_only: bool = False) -> None:
+        """Busca productos por texto (o solo por comienzo de codigo)."""
         if not query:
             self._filter_products()
             return
@@ -2170,6 +2172,7 @@ class MainWindow(QMainWindow):
             products = self.sync_service.get_local_products(
                 search=query,
                 limit=50,
+                prefix_only=prefix_only,
             )
 
             # Si hay exactamente 1 resultado y es una variante con codigo de barras exacto,
@@ -2665,7 +2668,8 @@ class MainWindow(QMainWindow):
         query = self.search_input.text().strip()
 
         # Verificar si es un codigo de barras (solo numeros)
-        if query.isdigit() and len(query) >= 8:
+        is_scanned_code = query.isdigit() and len(query) >= 8
+        if is_scanned_code:
             product = self.sync_service.get_product_by_barcode(query)
             if product:
                 # Agregar directamente al carrito
@@ -2687,8 +2691,9 @@ class MainWindow(QMainWindow):
                 logger.info(f"Producto escaneado: {product.name}")
                 return
 
-        # Busqueda normal por texto
-        self._search_products(query)
+        # Codigo escaneado sin coincidencia exacta: codigos que empiezan
+        # con el (rangos sobre los indices de codigo); si no, por texto
+        self._search_products(query, prefix_only=is_scanned_code)
 
     def _on_search_text_changed(self, text: str) -> None:
         """Maneja cambios en el texto de busqueda."""
@@ -77,8 +77,11 @@ def db_session(db_engine) -> Generator[Session, None, None]:
     """
     Proporciona una sesion de base de datos limpia para cada test.
 
-    La sesion hace rollback al finalizar el test.
+    La sesion hace rollback al finalizar el test (y se vacia el cache
+    de tablas de referencia, que sobrevive a la sesion).
     """
+    from src.db.reference_cache import REFERENCE_CACHE
+
     Session = sessionmaker(bind=db_engine)
     session = Session()
 
@@ -87,6 +90,37 @@ def db_session(db_engine) -> Generator[Session, None, None]:
     finally:
         session.rollback()
         session.close()
+        REFERENCE_CACHE.invalidate()
+
+
+@pytest.fixture
+def count_queries(db_engine):
+    """
+    Cuenta las sentencias SQL ejecutadas dentro de un bloque.
+
+    Uso:
+        with count_queries() as queries:
+            ...
+        assert len(queries) == 1
+    """
+    from contextlib import contextmanager
+
+    from sqlalchemy import event
+
+    @contextmanager
+    def counter():
+        queries = []
+
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", before_execute)
+        try:
+            yield queries
+        finally:
+            event.remove(db_engine, "before_cursor_execute", before_execute)
+
+    return counter
 
 
 # ==============================================================================
@@ -0,0 +1,55 @@
+"""
+Tests para el calculo de vuelto por denominacion.
+"""
+
+import pytest
+
+
+class TestMakeChange:
+    """Tests para make_change."""
+
+    def test_exact_amount(self):
+        """Desglosa un monto exacto en billetes."""
+        from src.config import make_change
+        breakdown, remainder = make_change(1_750_000)
+        assert breakdown == [(10000, 1), (5000, 1), (2000, 1), (500, 1)]
+        assert remainder == 0
+
+    def test_with_coins(self):
+        """Usa monedas para los montos chicos."""
+        from src.config import make_change
+        breakdown, remainder = make_change(8_800)
+        assert breakdown == [(50, 1), (25, 1), (10, 1), (2, 1), (1, 1)]
+        assert remainder == 0
+
+    def test_cents_remainder(self):
+        """Los centavos no representables quedan como resto."""
+        from src.config import make_change
+        breakdown, remainder = make_change(10_050)
+        assert breakdown == [(100, 1)]
+        assert remainder == 50
+
+    @pytest.mark.parametrize("amount", [0, -100])
+    def test_non_positive(self, amount):
+        """Montos no positivos no generan desglose."""
+        from src.config import make_change
+        assert make_change(amount) == ([], 0)
+
+    def test_denominations_sorted(self):
+        """Las denominaciones estan ordenadas y sin repetir."""
+        from src.config import ALL_DENOMINATIONS
+        assert list(ALL_DENOMINATIONS) == sorted(set(ALL_DENOMINATIONS), reverse=True)
+
+
+class TestSplitChange:
+    """Tests para split_change."""
+
+    def test_custom_denominations(self):
+        """Acepta un vector de denominaciones propio."""
+        from src.config.change_math import split_change
+        assert split_change(1700, (1000, 500, 200, 100)) == ([1, 1, 1, 0], 0)
+
+    def test_remainder(self):
+        """Devuelve el resto no representable."""
+        from src.config.change_math import split_change
+        assert split_change(350, (200, 100)) == ([1, 1], 50)
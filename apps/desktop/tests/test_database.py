@@ -0,0 +1,304 @@
+"""
+Tests para la configuracion de base de datos.
+
+Cubre:
+- Motor de escritura con una sola conexion
+- Sesiones de solo lectura
+- Transacciones de escritura con BEGIN IMMEDIATE
+- Pragmas de conexion
+- Creacion del esquema y columnas nuevas
+- PRAGMA optimize al devolver conexiones
+- Consultas livianas de listados
+- Carga de relaciones con selectinload
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+
+@pytest.fixture
+def temp_database(tmp_path, monkeypatch):
+    """Apunta la configuracion a una base de datos temporal."""
+    from src.config import reset_settings
+    from src.db import database
+
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "test.db"))
+    reset_settings()
+    database.reset_database()
+    yield database
+    database.reset_database()
+    monkeypatch.undo()
+    reset_settings()
+
+
+class TestEngines:
+    """Tests para los motores de lectura y escritura."""
+
+    def test_write_engine_single_connection(self, temp_database):
+        """El motor de escritura usa una sola conexion."""
+        engine = temp_database.get_engine()
+
+        assert engine.pool.size() == temp_database.WRITE_POOL_SIZE == 1
+
+    def test_readonly_session_reads(self, temp_database):
+        """Una sesion de lectura ve los datos escritos."""
+        with temp_database.session_scope() as session:
+            session.execute(text("CREATE TABLE items (value INTEGER)"))
+            session.execute(text("INSERT INTO items VALUES (1)"))
+
+        with temp_database.session_scope(readonly=True) as session:
+            rows = session.execute(text("SELECT value FROM items")).all()
+            mode = session.execute(text("PRAGMA journal_mode")).scalar()
+
+        assert rows == [(1,)]
+        assert mode == "wal"
+
+    def test_readonly_session_rejects_writes(self, temp_database):
+        """Una sesion de lectura no puede escribir."""
+        with temp_database.session_scope() as session:
+            session.execute(text("CREATE TABLE items (value INTEGER)"))
+
+        with pytest.raises(OperationalError):
+            with temp_database.session_scope(readonly=True) as session:
+                session.execute(text("INSERT INTO items VALUES (2)"))
+
+    def test_write_session_takes_lock_upfront(self, temp_database):
+        """Una sesion de escritura toma el lock al iniciar la transaccion."""
+        import sqlite3
+
+        from src.config import get_settings
+
+        with temp_database.session_scope() as session:
+            session.execute(text("CREATE TABLE items (value INTEGER)"))
+
+        with temp_database.session_scope() as session:
+            session.execute(text("SELECT count(*) FROM items"))
+
+            other = sqlite3.connect(get_settings().database_file, timeout=0)
+            try:
+                with pytest.raises(sqlite3.OperationalError):
+                    other.execute("BEGIN IMMEDIATE")
+            finally:
+                other.close()
+
+    def test_first_read_while_writing(self, temp_database):
+        """El primer uso del motor de lectura no espera la conexion de escritura."""
+        with temp_database.session_scope() as session:
+            session.execute(text("CREATE TABLE items (value INTEGER)"))
+
+        with temp_database.session_scope() as session:
+            session.execute(text("INSERT INTO items VALUES (1)"))
+
+            with temp_database.session_scope(readonly=True) as reader:
+                assert reader.execute(text("SELECT count(*) FROM items")).scalar() == 0
+
+    def test_read_engine_escapes_path(self, tmp_path, monkeypatch):
+        """Una ruta con ?, # o % abre el mismo archivo en solo lectura."""
+        from src.config import reset_settings
+        from src.db import database
+
+        folder = tmp_path / "caja?1#a%20b"
+        folder.mkdir()
+        monkeypatch.setenv("DATABASE_PATH", str(folder / "test.db"))
+        reset_settings()
+        database.reset_database()
+        try:
+            with database.session_scope() as session:
+                session.execute(text("CREATE TABLE items (value INTEGER)"))
+                session.execute(text("INSERT INTO items VALUES (1)"))
+
+            with database.session_scope(readonly=True) as session:
+                assert session.execute(text("SELECT value FROM items")).all() == [(1,)]
+        finally:
+            database.reset_database()
+            monkeypatch.undo()
+            reset_settings()
+
+    def test_connection_pragmas(self, temp_database):
+        """Las conexiones quedan configuradas con los pragmas esperados."""
+        with temp_database.session_scope(readonly=True) as session:
+            busy_timeout = session.execute(text("PRAGMA busy_timeout")).scalar()
+            temp_store = session.execute(text("PRAGMA temp_store")).scalar()
+
+        assert busy_timeout == 30000
+        assert temp_store == 2  # MEMORY
+
+    def test_wal_enabled_on_first_connect(self, temp_database):
+        """El modo WAL se activa en la primera conexion y persiste."""
+        engine = temp_database.get_engine()
+
+        with engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+
+        assert mode == "wal"
+
+    def test_init_database_creates_model_tables(self, temp_database):
+        """init_database registra y crea las tablas de todos los modelos."""
+        from sqlalchemy import inspect
+
+        temp_database.init_database()
+
+        tables = set(inspect(temp_database.get_engine()).get_table_names())
+
+        assert {"customers", "products", "sales", "offline_queue"} <= tables
+
+    def test_init_database_adds_missing_columns(self, temp_database):
+        """init_database agrega las columnas nuevas a tablas existentes."""
+        from sqlalchemy import inspect
+
+        temp_database.init_database()
+        with temp_database.get_engine().begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE products DROP COLUMN brand_name")
+
+        temp_database.init_database()
+
+        columns = {
+            column["name"]
+            for column in inspect(temp_database.get_engine()).get_columns("products")
+        }
+        assert "brand_name" in columns
+
+    def test_init_database_drops_obsolete_indexes(self, temp_database):
+        """init_database elimina los indices reemplazados."""
+        from sqlalchemy import inspect
+
+        temp_database.init_database()
+        with temp_database.get_engine().begin() as conn:
+            conn.exec_driver_sql("CREATE INDEX ix_sale_items_product ON sale_items (product_id)")
+
+        temp_database.init_database()
+
+        indexes = {
+            index["name"]
+            for index in inspect(temp_database.get_engine()).get_indexes("sale_items")
+        }
+        assert "ix_sale_items_product" not in indexes
+        assert "ix_sale_items_product_refund" in indexes
+
+    def test_init_database_recreates_changed_fts(self, temp_database):
+        """Un indice FTS5 con otras columnas se recrea y se recarga."""
+        from decimal import Decimal
+
+        from src.db.fts import FtsIndex
+        from src.models import Product
+        from src.models.product import PRODUCTS_FTS
+
+        temp_database.init_database()
+        with temp_database.session_scope() as session:
+            session.add(Product(
+                id="p-1", tenant_id="t-1", name="Remera", color="Verde", base_price=Decimal("1"),
+            ))
+
+        engine = temp_database.get_engine()
+        with engine.begin() as conn:
+            PRODUCTS_FTS.drop(conn)
+            FtsIndex("products_fts", "products", ("name",)).create(conn)
+
+        temp_database.init_database()
+
+        with engine.connect() as conn:
+            assert PRODUCTS_FTS._stored_columns(conn) == PRODUCTS_FTS.columns
+            rows = conn.exec_driver_sql(
+                "SELECT rowid FROM products_fts WHERE products_fts MATCH 'verde'"
+            ).all()
+        assert len(rows) == 1
+
+    def test_optimize_on_checkin_throttled(self, temp_database):
+        """PRAGMA optimize corre al devolver la conexion, a lo sumo una vez por intervalo."""
+        engine = temp_database.get_engine()
+
+        with engine.connect():
+            pass
+        record = engine.pool._pool.queue[0]
+        first_run = record.info["optimized_at"]
+
+        with engine.connect():
+            pass
+
+        assert record.info["optimized_at"] == first_run
+
+    def test_json_columns_round_trip(self, temp_database):
+        """Los payloads de la cola offline se guardan y leen como JSON."""
+        from src.models import OfflineQueue
+
+        temp_database.init_database()
+        payload = {"items": [{"qty": 2, "price": 10.5}], "note": "Ñandú", 7: None}
+
+        with temp_database.session_scope() as session:
+            session.add(OfflineQueue(
+                id=1,
+                tenant_id="t-1",
+                operation_type="sale",
+                endpoint="/sales",
+                method="POST",
+                payload=payload,
+            ))
+
+        with temp_database.session_scope(readonly=True) as session:
+            stored = session.get(OfflineQueue, 1).payload
+            raw = session.connection().exec_driver_sql(
+                "SELECT payload FROM offline_queue WHERE id = 1"
+            ).scalar()
+
+        assert stored == {"items": [{"qty": 2, "price": 10.5}], "note": "Ñandú", "7": None}
+        assert isinstance(raw, str)
+
+    def test_sync_context_per_session(self, temp_database):
+        """La fecha del lote se calcula una vez por sesion."""
+        from src.db import SyncContext, get_session
+
+        session = get_session()
+        other = get_session()
+        try:
+            context = SyncContext.get(session)
+            assert SyncContext.get(session) is context
+            assert SyncContext.get(session).now is context.now
+            assert SyncContext.get(other) is not context
+        finally:
+            session.close()
+            other.close()
+
+
+class TestQueries:
+    """Tests para las consultas de listados."""
+
+    def test_load_customer_rows(self, db_session):
+        """Devuelve filas de clientes activos filtradas y ordenadas."""
+        from src.db.queries import load_customer_rows
+        from src.models import Customer
+
+        db_session.add_all([
+            Customer(id="q-1", tenant_id="t-q", name="Zapata", phone="111"),
+            Customer(id="q-2", tenant_id="t-q", name="Alvarez", tax_id="20123"),
+            Customer(id="q-3", tenant_id="t-q", name="Baja", is_active=False),
+            Customer(id="q-4", tenant_id="t-otro", name="Otro"),
+        ])
+        db_session.flush()
+
+        rows = load_customer_rows(db_session, "t-q")
+        found = load_customer_rows(db_session, "t-q", search="201")
+
+        assert [row.id for row in rows] == ["q-2", "q-1"]
+        assert [row.name for row in found] == ["Alvarez"]
+        assert not isinstance(rows[0], Customer)
+
+    def test_product_prices_selectin(self, db_session):
+        """Los precios del producto se cargan en la misma consulta."""
+        from decimal import Decimal
+
+        from src.models import PriceList, Product, ProductPrice
+        from src.repositories import ProductRepository
+
+        db_session.add_all([
+            PriceList(id="pl-sel", tenant_id="t-sel", name="Minorista"),
+            Product(id="p-sel", tenant_id="t-sel", name="Yerba", base_price=Decimal("10")),
+            ProductPrice(id="pp-sel", product_id="p-sel", price_list_id="pl-sel", price=Decimal("12")),
+        ])
+        db_session.flush()
+        db_session.expunge_all()
+
+        product = ProductRepository(db_session).get_with_relations("p-sel")
+        db_session.expunge(product)
+
+        assert product.get_price("pl-sel") == Decimal("12")
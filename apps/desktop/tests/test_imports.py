@@ -133,6 +133,79 @@ class TestConfig:
         assert settings.logs_dir is not None
         assert settings.data_dir is not None
 
+    def test_settings_from_env(self, monkeypatch):
+        """Verifica la conversion de variables de entorno."""
+        from src.config import Settings
+
+        monkeypatch.setenv("API_TIMEOUT", "45")
+        monkeypatch.setenv("DEBUG", "yes")
+        monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+
+        settings = Settings.from_env()
+
+        assert settings.API_TIMEOUT == 45
+        assert settings.DEBUG is True
+        assert settings.LOG_LEVEL == "DEBUG"
+
+    def test_settings_validation(self, monkeypatch):
+        """Verifica que los valores invalidos se rechazan."""
+        from src.config import Settings
+
+        monkeypatch.setenv("API_TIMEOUT", "1")
+        with pytest.raises(ValueError):
+            Settings.from_env()
+
+        monkeypatch.setenv("API_TIMEOUT", "30")
+        monkeypatch.setenv("LOG_LEVEL", "VERBOSE")
+        with pytest.raises(ValueError):
+            Settings.from_env()
+
+    def test_absolute_paths_cached(self, tmp_path):
+        """Verifica que las rutas se resuelven una vez por valor."""
+        from src.config import get_settings
+
+        settings = get_settings()
+
+        assert settings.get_absolute_path("logs") is settings.get_absolute_path("logs")
+        assert settings.get_absolute_path("logs") == settings.base_path / "logs"
+        assert settings.get_absolute_path(str(tmp_path)) == tmp_path
+
+    def test_ensure_directories_once(self, tmp_path, monkeypatch):
+        """Verifica que los directorios se verifican una vez por proceso."""
+        from unittest.mock import patch
+
+        from src.config import get_settings
+
+        settings = get_settings()
+        monkeypatch.setattr(settings, "DATABASE_PATH", str(tmp_path / "data" / "pos.db"))
+        monkeypatch.setattr(settings, "LOG_PATH", str(tmp_path / "logs"))
+
+        settings.ensure_directories()
+        assert settings.data_dir.is_dir()
+        assert settings.logs_dir.is_dir()
+
+        with patch("src.config.settings.os.makedirs") as makedirs:
+            settings.ensure_directories()
+        makedirs.assert_not_called()
+
+    def test_app_info_without_settings(self, monkeypatch):
+        """Verifica nombre y version sin construir Settings."""
+        from src.config.env import get_app_info
+
+        monkeypatch.setenv("APP_VERSION", "9.9.9")
+
+        assert get_app_info() == ("Cianbox POS", "9.9.9")
+
+    def test_enum_labels(self):
+        """Verifica nombres para mostrar de los enums."""
+        from src.config.constants import PaymentMethod, SaleStatus
+
+        assert PaymentMethod.get_display_name(PaymentMethod.CASH) == "Efectivo"
+        assert PaymentMethod.label(PaymentMethod.OTHER) == "Otro"
+        assert PaymentMethod.label("CHECK") == "Cheque"
+        assert PaymentMethod.label("DESCONOCIDO") == "DESCONOCIDO"
+        assert SaleStatus.label(SaleStatus.REFUNDED) == "Devolución"
+
 
 class TestAPIClient:
     """Tests del cliente API."""
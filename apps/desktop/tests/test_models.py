@@ -0,0 +1,530 @@
+"""
+Tests para los modelos SQLAlchemy.
+
+Cubre:
+- Serializacion con to_dict
+- Representacion string
+- Serializacion de clientes
+- Precios de productos
+- Aplicabilidad de promociones
+- Estado de dispositivos
+"""
+
+from datetime import datetime
+
+
+class TestBaseModel:
+    """Tests para BaseModel."""
+
+    def test_to_dict_serializes_datetimes(self):
+        """Las columnas DateTime se serializan como ISO string."""
+        from src.models import Tenant
+
+        tenant = Tenant(id="t-1", name="Tienda", slug="tienda")
+        tenant.created_at = datetime(2024, 1, 2, 3, 4, 5)
+
+        data = tenant.to_dict()
+
+        assert data["id"] == "t-1"
+        assert data["created_at"] == "2024-01-02T03:04:05"
+        assert data["updated_at"] is None
+
+    def test_to_dict_exclude(self):
+        """Los campos excluidos no se incluyen."""
+        from src.models import Tenant
+
+        tenant = Tenant(id="t-1", name="Tienda", slug="tienda")
+
+        data = tenant.to_dict(exclude={"slug"})
+
+        assert "slug" not in data
+        assert data["name"] == "Tienda"
+
+    def test_serialization_plan_per_class(self):
+        """Cada modelo cachea su propio plan de columnas."""
+        from src.models import Customer, Tenant
+
+        customer_plan = Customer._serialization_plan()
+        tenant_plan = Tenant._serialization_plan()
+
+        assert customer_plan is Customer._serialization_plan()
+        assert customer_plan != tenant_plan
+        assert ("created_at", True) in tenant_plan
+
+    def test_repr(self):
+        """La representacion muestra la primary key."""
+        from src.models import Tenant
+
+        assert repr(Tenant(id="t-1")) == "<Tenant(id='t-1')>"
+
+
+class TestUser:
+    """Tests para User."""
+
+    def test_permission_set_cached(self):
+        """Los permisos se convierten a conjunto una vez y al cambiar."""
+        from src.models import User
+
+        user = User(id="u-1", permissions=["sales.create", "sales.refund"])
+        assert user.has_permission("sales.refund")
+        assert not user.has_permission("config.edit")
+        assert user._permission_set is user._permission_set
+
+        user.permissions = ["*"]
+        assert user.has_permission("config.edit")
+
+        user.permissions = None
+        assert not user.has_permission("sales.create")
+
+
+    def test_current_user_uses_partial_index(self, db_engine):
+        """La busqueda del usuario actual usa el indice parcial."""
+        from sqlalchemy import select
+
+        from src.models import User
+
+        stmt = select(User.id).where(User.is_current_user == True)
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+
+        with db_engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+        assert "ix_users_current" in plan
+
+class TestCustomer:
+    """Tests para Customer."""
+
+    def test_to_dict_credit(self):
+        """Los montos de credito se serializan en notacion decimal."""
+        from decimal import Decimal
+
+        from src.models import Customer
+
+        customer = Customer(
+            id="c-1",
+            tenant_id="t-1",
+            name="Cliente",
+            credit_limit=Decimal("1E+3"),
+            credit_balance=Decimal("250.50"),
+            global_discount=Decimal("5.00"),
+        )
+
+        data = customer.to_dict()
+
+        assert data["credit_limit"] == "1000"
+        assert data["credit_balance"] == "250.50"
+        assert data["available_credit"] == "749.50"
+        assert data["global_discount"] == "5.00"
+
+    def test_to_dict_without_credit(self):
+        """Un cliente sin montos cargados serializa ceros."""
+        from src.models import Customer
+
+        data = Customer(id="c-1", tenant_id="t-1", name="Cliente").to_dict()
+
+        assert data["available_credit"] == "0"
+
+    def test_search_uses_name_index(self, db_engine):
+        """La busqueda por texto recorre el indice por nombre sin ordenar aparte."""
+        from sqlalchemy import or_, select
+
+        from src.models import Customer
+
+        term = "%ab%"
+        stmt = (
+            select(Customer)
+            .where(Customer.tenant_id == "t-1")
+            .where(or_(Customer.name.ilike(term), Customer.phone.ilike(term)))
+            .where(Customer.is_active == True)
+            .order_by(Customer.name)
+            .limit(50)
+        )
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+
+        with db_engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+        assert "ix_customers_active_name" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_listings_use_indexes(self, db_engine):
+        """Listados y conteo de activos se resuelven sin ordenar aparte."""
+        from sqlalchemy import func, select
+
+        from src.models import Customer
+
+        active = (
+            select(Customer)
+            .where(Customer.tenant_id == "t-1")
+            .where(Customer.is_active == True)
+            .order_by(Customer.name)
+        )
+        recent = (
+            select(Customer)
+            .where(Customer.tenant_id == "t-1")
+            .where(Customer.is_active == True)
+            .order_by(Customer.last_synced_at.desc())
+            .limit(10)
+        )
+        count = (
+            select(func.count())
+            .select_from(Customer)
+            .where(Customer.tenant_id == "t-1")
+            .where(Customer.is_active == True)
+        )
+
+        plans = []
+        with db_engine.connect() as conn:
+            for stmt in (active, recent, count):
+                sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+                plans.append(" ".join(
+                    row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+                ))
+
+        assert all("TEMP B-TREE" not in plan for plan in plans)
+        assert "ix_customers_tenant_synced" in plans[1]
+        assert "COVERING INDEX" in plans[2]
+
+    def test_cached_properties_invalidated_on_change(self):
+        """Las propiedades cacheadas se recalculan al cambiar sus columnas."""
+        from src.models import Customer
+
+        customer = Customer(id="c-1", tenant_id="t-1", name="Perez SA", phone="111")
+
+        assert customer.display_name == "Perez SA"
+        assert customer.full_contact == "Tel: 111"
+        assert customer.tax_info == "Sin documento"
+
+        customer.trade_name = "Kiosco Perez"
+        customer.email = "perez@example.com"
+        customer.tax_id = "20123456789"
+        customer.tax_id_type = "CUIT"
+
+        assert customer.display_name == "Kiosco Perez"
+        assert customer.full_contact == "Tel: 111 | perez@example.com"
+        assert customer.tax_info == "CUIT: 20123456789"
+
+
+class TestProduct:
+    """Tests para Product."""
+
+    def test_net_price(self):
+        """El precio neto quita el IVA y redondea a centavos."""
+        from decimal import Decimal
+
+        from src.models import Product
+
+        product = Product(
+            id="p-1",
+            tenant_id="t-1",
+            name="Yerba",
+            base_price=Decimal("121"),
+            tax_rate=Decimal("21"),
+            tax_included=True,
+        )
+
+        assert product.get_net_price() == Decimal("100.00")
+
+        product.tax_rate = Decimal("10.5")
+        assert product.get_net_price() == Decimal("109.50")
+
+        product.tax_included = False
+        assert product.get_net_price() == Decimal("121")
+
+    def test_price_by_list(self):
+        """El precio por lista sigue a los cambios de la coleccion."""
+        from decimal import Decimal
+
+        from src.models import Product, ProductPrice
+
+        product = Product(id="p-1", tenant_id="t-1", name="Yerba", base_price=Decimal("100"))
+        assert product.get_price("pl-1") == Decimal("100")
+
+        retail = ProductPrice(id="pp-1", price_list_id="pl-1", price=Decimal("120"))
+        product.prices.append(retail)
+        assert product.get_price("pl-1") == Decimal("120")
+
+        retail.price = Decimal("130")
+        assert product.get_price("pl-1") == Decimal("130")
+
+        retail.price_list_id = "pl-2"
+        assert product.get_price("pl-1") == Decimal("100")
+        assert product.get_price("pl-2") == Decimal("130")
+
+        product.prices.remove(retail)
+        assert product.get_price("pl-2") == Decimal("100")
+        assert product.get_price() == Decimal("100")
+
+    def test_barcode_lookup_uses_index(self, db_engine):
+        """La busqueda por codigo de barras usa tenant y codigo en el indice."""
+        from sqlalchemy import select
+
+        from src.models import Product
+
+        stmt = (
+            select(Product.id)
+            .where(Product.tenant_id == "t-1")
+            .where(Product.barcode == "779")
+        )
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+
+        with db_engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+        assert "ix_products_tenant_barcode (tenant_id=? AND barcode=?)" in plan
+
+    def test_active_listing_uses_partial_index(self, db_engine):
+        """El listado de activos se resuelve por indice, sin ordenar aparte."""
+        from sqlalchemy import select
+
+        from src.models import Product
+
+        stmt = (
+            select(Product.id)
+            .where(Product.tenant_id == "t-1")
+            .where(Product.is_active == True)
+            .order_by(Product.name)
+            .limit(50)
+        )
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+
+        with db_engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+        with db_engine.connect() as conn:
+            index_sql = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'ix_products_active_name'"
+            ).scalar()
+
+        assert "WHERE is_active = 1" in index_sql
+        assert "SCAN products" not in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestPromotion:
+    """Tests para Promotion."""
+
+    def test_applies_to_product(self):
+        """La pertenencia de productos sigue a los cambios de la coleccion."""
+        from src.models import Promotion, PromotionProduct
+
+        promotion = Promotion(id="pr-1", tenant_id="t-1", code="P1", name="Promo", promotion_type="PERCENTAGE")
+        item = PromotionProduct(id="pp-1", product_id="p-1")
+
+        assert not promotion.applies_to_product("p-1")
+
+        promotion.products.append(item)
+        assert promotion.applies_to_product("p-1")
+
+        promotion.products.remove(item)
+        assert not promotion.applies_to_product("p-1")
+
+        promotion.applies_to_all = True
+        assert promotion.applies_to_product("p-9")
+
+    def test_is_valid_now(self):
+        """La vigencia se evalua contra la fecha recibida."""
+        from src.models import Promotion
+
+        promotion = Promotion(
+            id="pr-2",
+            tenant_id="t-1",
+            code="P2",
+            name="Promo",
+            promotion_type="PERCENTAGE",
+            is_active=True,
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 1, 31),
+        )
+
+        assert promotion.is_valid_now(datetime(2024, 1, 15))
+        assert not promotion.is_valid_now(datetime(2024, 2, 1))
+        assert not promotion.is_valid_now()
+
+
+class TestSale:
+    """Tests para Sale."""
+
+    def _plan(self, engine, stmt):
+        sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+        with engine.connect() as conn:
+            return " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+    def test_listings_use_indexes(self, db_engine):
+        """Los listados por fecha y por estado se resuelven sin ordenar aparte."""
+        from sqlalchemy import select
+
+        from src.models import Sale
+
+        recent = (
+            select(Sale.id)
+            .where(Sale.tenant_id == "t-1")
+            .order_by(Sale.sale_date.desc())
+            .limit(20)
+        )
+        by_status = (
+            select(Sale.id)
+            .where(Sale.tenant_id == "t-1")
+            .where(Sale.status == "COMPLETED")
+            .order_by(Sale.sale_date.desc())
+            .limit(20)
+        )
+
+        plan = self._plan(db_engine, recent)
+        assert "ix_sales_tenant_date" in plan
+        assert "TEMP B-TREE" not in plan
+
+        plan = self._plan(db_engine, by_status)
+        assert "ix_sales_tenant_status_date (tenant_id=? AND status=?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_tables_without_rowid(self, db_engine):
+        """Ventas e items se guardan agrupados por clave primaria."""
+        from sqlalchemy import select
+
+        from src.models import Sale
+
+        with db_engine.connect() as conn:
+            for table in ("sales", "sale_items"):
+                sql = conn.exec_driver_sql(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (table,),
+                ).scalar()
+                assert sql.rstrip().endswith("WITHOUT ROWID")
+
+        # Sin autoindex: la busqueda por id va directo a la tabla
+        plan = self._plan(db_engine, select(Sale.branch_id).where(Sale.id == "s-1"))
+        assert "USING PRIMARY KEY (id=?)" in plan
+
+
+class TestSaleItem:
+    """Tests para SaleItem."""
+
+    def test_available_quantity_in_sql(self, db_session):
+        """La cantidad disponible se calcula igual en Python y en SQL."""
+        from datetime import datetime
+        from decimal import Decimal
+
+        from sqlalchemy import select
+
+        from src.models import Sale, SaleItem
+
+        item = SaleItem(
+            id="si-avail",
+            sale_id="s-avail",
+            product_name="Yerba",
+            quantity=Decimal("-3"),
+            unit_price=Decimal("10"),
+            subtotal=Decimal("30"),
+            refunded_quantity=Decimal("1"),
+        )
+        db_session.add_all([
+            Sale(id="s-avail", tenant_id="t-1", branch_id="b-1", sale_number="1", sale_date=datetime.now()),
+            item,
+        ])
+        db_session.flush()
+
+        stmt = select(SaleItem.available_quantity).where(SaleItem.id == "si-avail")
+
+        assert item.available_quantity == Decimal("2")
+        assert db_session.scalar(stmt) == 2
+
+    def test_refund_search_uses_covering_index(self, db_engine):
+        """La busqueda de ventas por producto se resuelve con el indice."""
+        from sqlalchemy import select
+
+        from src.models import Sale, SaleItem
+
+        stmt = select(Sale.id).where(Sale.items.any(SaleItem.product_id == "p-1"))
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+
+        with db_engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+        assert "COVERING INDEX ix_sale_items_product_refund" in plan
+
+
+class TestDevice:
+    """Tests para Device."""
+
+    def test_status_stored_as_text(self):
+        """El estado se guarda como texto y los predicados lo comparan."""
+        from src.models import Device, DeviceStatus
+
+        device = Device(device_id="d-1", status=DeviceStatus.UNKNOWN.value)
+        assert not device.is_approved()
+
+        device.update_status(DeviceStatus.APPROVED)
+        assert device.status == "APPROVED"
+        assert type(device.status) is str
+        assert device.is_approved()
+
+        device.update_status("BLOCKED")
+        assert device.is_blocked()
+        assert not device.is_pending()
+
+
+class TestOfflineQueue:
+    """Tests para OfflineQueue."""
+
+    def test_mark_uses_given_time(self):
+        """Los cambios de estado usan la fecha recibida o la actual."""
+        from datetime import datetime
+
+        from src.models import OfflineQueue
+
+        now = datetime(2024, 5, 1, 10, 30)
+        op = OfflineQueue(status="pending", retry_count=0)
+
+        op.mark_processing(now)
+        assert op.last_attempt_at == now
+
+        op.mark_failed("timeout", now=now)
+        assert (op.status, op.retry_count, op.last_error) == ("failed", 1, "timeout")
+
+        op.mark_completed({"ok": True})
+        assert op.status == "completed"
+        assert op.processed_at > now
+
+
+class TestAppConfig:
+    """Tests para AppConfig."""
+
+    def test_typed_value_cached(self):
+        """El valor se convierte una vez y se recalcula al cambiar."""
+        from src.models import AppConfig
+
+        config = AppConfig(key="k", value='{"a": 1}', value_type="json")
+        assert config.get_typed_value() == {"a": 1}
+        assert config.get_typed_value() is config.get_typed_value()
+
+        config.value = "YES"
+        config.value_type = "bool"
+        assert config.get_typed_value() is True
+
+    def test_encode_by_type(self):
+        """Cada tipo se guarda con su value_type; las subclases usan el de su base."""
+        from collections import OrderedDict
+
+        from src.models import AppConfig
+
+        assert AppConfig._encode(True) == ("bool", "true")
+        assert AppConfig._encode(0) == ("int", "0")
+        assert AppConfig._encode([1, 2]) == ("json", "[1, 2]")
+        assert AppConfig._encode("x") == ("string", "x")
+        assert AppConfig._encode(1.5) == ("string", "1.5")
+        assert AppConfig._encode(None) == ("string", None)
+        assert AppConfig._encode(OrderedDict(a=1)) == ("json", '{"a": 1}')
+
@@ -0,0 +1,863 @@
+"""
+Tests para los repositorios.
+
+Cubre:
+- Estado del dispositivo local
+- Columnas diferidas de productos
+- Configuracion clave-valor
+- Upsert generico
+- Busqueda de texto de clientes
+- Cola de operaciones offline
+"""
+
+from src.models import Device, DeviceStatus
+
+
+def _make_device(device_id: str) -> Device:
+    """Crea un dispositivo con los campos obligatorios."""
+    return Device(
+        device_id=device_id,
+        hostname="CAJA-01",
+        mac_address="00:11:22:33:44:55",
+        ip_address="10.0.0.2",
+        os_version="Windows 11",
+        cpu_info="x86_64",
+        machine_guid="guid",
+        disk_serial="serial",
+        app_version="1.0.0",
+    )
+
+
+class TestDeviceRepository:
+    """Tests para DeviceRepository."""
+
+    def test_update_device_status(self, db_session):
+        """Actualiza el estado en un solo UPDATE y devuelve el dispositivo."""
+        from src.repositories.device_repository import DeviceRepository
+
+        device = _make_device("dev-status")
+        db_session.add(device)
+        db_session.flush()
+
+        repo = DeviceRepository(db_session)
+        updated = repo.update_device_status(
+            "dev-status",
+            DeviceStatus.APPROVED,
+            message="ok",
+            approved_by="admin",
+        )
+
+        assert updated is device
+        assert device.is_approved()
+        assert device.status_message == "ok"
+        assert device.approved_by == "admin"
+        assert device.last_check is not None
+
+    def test_update_missing_device(self, db_session):
+        """Devuelve None si el dispositivo no existe."""
+        from src.repositories.device_repository import DeviceRepository
+
+        repo = DeviceRepository(db_session)
+
+        assert repo.update_device_status("dev-missing", DeviceStatus.BLOCKED) is None
+
+
+    def test_device_checks_reuse_lookup(self, db_session, count_queries):
+        """Los chequeos del mismo dispositivo consultan la base una vez."""
+        from src.repositories.device_repository import DeviceRepository
+
+        db_session.add(_make_device("dev-cache"))
+        db_session.flush()
+
+        repo = DeviceRepository(db_session)
+        with count_queries() as queries:
+            assert repo.get_by_device_id("dev-cache") is not None
+            assert not repo.is_device_approved("dev-cache")
+            assert not repo.is_device_blocked("dev-cache")
+        assert len(queries) == 1
+
+        repo.update_device_status("dev-cache", DeviceStatus.BLOCKED)
+        assert repo.is_device_blocked("dev-cache")
+
+        repo.delete_by_id(repo.get_by_device_id("dev-cache").id)
+        assert repo.get_by_device_id("dev-cache") is None
+
+
+    def test_device_checks_without_loading(self, db_session):
+        """Los chequeos de estado no cargan el dispositivo en la sesion."""
+        from src.repositories.device_repository import DeviceRepository
+
+        device = _make_device("dev-status-only")
+        device.status = DeviceStatus.APPROVED.value
+        db_session.add(device)
+        db_session.flush()
+        db_session.expunge_all()
+
+        repo = DeviceRepository(db_session)
+        assert repo.is_device_approved("dev-status-only")
+        assert not repo.is_device_blocked("dev-status-only")
+        assert not repo.is_device_approved("dev-missing")
+        assert len(db_session.identity_map) == 0
+
+    def test_ensure_registered_once(self, db_session, count_queries, monkeypatch):
+        """Registrar de nuevo el mismo equipo no consulta ni escribe."""
+        from src.repositories import device_repository
+        from src.repositories.device_repository import DeviceRepository
+        from src.utils.device import DeviceInfo
+
+        info = DeviceInfo(**{
+            column: getattr(_make_device("dev-ensure"), column)
+            for column in DeviceInfo.__dataclass_fields__
+            if column != "username"
+        })
+        monkeypatch.setattr(device_repository, "get_device_info", lambda: info)
+
+        repo = DeviceRepository(db_session)
+        device = repo.ensure_device_registered()
+
+        with count_queries() as queries:
+            assert repo.ensure_device_registered() is device
+        assert queries == []
+
+        info.ip_address = "10.0.0.9"
+        repo.ensure_device_registered()
+        assert device.ip_address == "10.0.0.9"
+
+class TestUserRepository:
+    """Tests para UserRepository."""
+
+    def test_current_user_cached(self, db_session, count_queries):
+        """El usuario actual se consulta una vez y se actualiza al cambiarlo."""
+        from src.models import Tenant, User
+        from src.repositories import UserRepository
+
+        db_session.add_all([
+            Tenant(id="t-cur", name="Tienda", slug="tienda-cur"),
+            User(id="u-cur-1", tenant_id="t-cur", email="a@x.com", name="A"),
+            User(id="u-cur-2", tenant_id="t-cur", email="b@x.com", name="B"),
+        ])
+        db_session.flush()
+
+        repo = UserRepository(db_session)
+        repo.set_current_user("u-cur-1")
+        with count_queries() as queries:
+            assert repo.get_current_user().id == "u-cur-1"
+            assert repo.get_current_user().id == "u-cur-1"
+        assert len(queries) == 1
+
+        with count_queries() as queries:
+            repo.set_current_user("u-cur-2")
+        assert len(queries) == 1
+        assert repo.get_current_user().id == "u-cur-2"
+        assert not db_session.get(User, "u-cur-1").is_current_user
+
+        repo.clear_current_user()
+        assert repo.get_current_user() is None
+
+
+    def test_lookups_by_key(self, db_session):
+        """Las consultas armadas una vez filtran por sus parametros."""
+        from src.models import Branch, Tenant, User
+        from src.repositories.user_repository import (
+            BranchRepository,
+            TenantRepository,
+            UserRepository,
+        )
+
+        db_session.add_all([
+            Tenant(id="t-key-1", name="Uno", slug="uno"),
+            Tenant(id="t-key-2", name="Dos", slug="dos"),
+            User(id="u-key", tenant_id="t-key-2", email="c@x.com", name="C", is_current_user=True),
+            Branch(id="b-key-1", tenant_id="t-key-1", name="Centro", code="001"),
+            Branch(id="b-key-2", tenant_id="t-key-2", name="Centro", code="001"),
+        ])
+        db_session.flush()
+
+        users = UserRepository(db_session)
+        tenants = TenantRepository(db_session)
+        branches = BranchRepository(db_session)
+
+        assert users.get_by_email("t-key-2", "C@X.com").id == "u-key"
+        assert users.get_by_email("t-key-1", "c@x.com") is None
+        assert tenants.get_by_slug("uno").id == "t-key-1"
+        assert tenants.get_active_tenant().id == "t-key-2"
+        assert branches.get_by_code("t-key-2", "001").id == "b-key-2"
+
+    def test_lookups_non_ascii(self, db_session):
+        """Email y codigo con letras no ASCII se encuentran tal como se guardaron."""
+        from src.models import Branch, Tenant, User
+        from src.repositories.user_repository import BranchRepository, UserRepository
+
+        db_session.add_all([
+            Tenant(id="t-ascii", name="Uno", slug="ascii"),
+            User(id="u-jose", tenant_id="t-ascii", email="JOSÉ@x.com", name="Jose"),
+            Branch(id="b-nunez", tenant_id="t-ascii", name="Nuñez", code="NUÑEZ"),
+        ])
+        db_session.flush()
+
+        users = UserRepository(db_session)
+        branches = BranchRepository(db_session)
+
+        assert users.get_by_email("t-ascii", "JOSÉ@x.com").id == "u-jose"
+        assert users.get_by_email("t-ascii", "josÉ@X.COM").id == "u-jose"
+        assert branches.get_by_code("t-ascii", "NUÑEZ").id == "b-nunez"
+        assert branches.get_by_code("t-ascii", "nuÑez").id == "b-nunez"
+
+    def test_active_tenant_by_primary_key(self, db_session, count_queries):
+        """Con el usuario actual conocido, el tenant sale del identity map."""
+        from src.models import Tenant, User
+        from src.repositories.user_repository import TenantRepository, UserRepository
+
+        db_session.add_all([
+            Tenant(id="t-act-1", name="Uno", slug="act-uno"),
+            Tenant(id="t-act-2", name="Dos", slug="act-dos"),
+            User(id="u-act-1", tenant_id="t-act-1", email="a@x.com", name="A"),
+            User(id="u-act-2", tenant_id="t-act-2", email="b@x.com", name="B"),
+        ])
+        db_session.flush()
+
+        users = UserRepository(db_session)
+        tenants = TenantRepository(db_session)
+
+        users.set_current_user("u-act-1")
+        tenant = tenants.get_by_slug("act-uno")
+        with count_queries() as queries:
+            assert tenants.get_active_tenant() is tenant
+        assert queries == []
+
+        users.set_current_user("u-act-2")
+        assert tenants.get_active_tenant().id == "t-act-2"
+
+        users.clear_current_user()
+        assert tenants.get_active_tenant() is None
+
+    def test_email_lookup_uses_lower_index(self, db_engine):
+        """get_by_email usa el indice sobre lower(email)."""
+        from src.repositories.user_repository import _USER_BY_EMAIL
+
+        stmt = _USER_BY_EMAIL.params(tenant_id="t-1", email="a@x.com")
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+
+        with db_engine.connect() as conn:
+            plan = " ".join(
+                row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            )
+
+        assert "ix_users_tenant_email_lower" in plan
+
+class TestProductRepository:
+    """Tests para ProductRepository."""
+
+    def test_detail_columns_deferred(self, db_session):
+        """Las columnas de detalle se cargan solo en la vista de detalle."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        db_session.add(Product(
+            id="p-defer",
+            tenant_id="t-defer",
+            name="Yerba",
+            description="Yerba mate con palo",
+            base_price=Decimal("10"),
+        ))
+        db_session.flush()
+        db_session.expunge_all()
+
+        repo = ProductRepository(db_session)
+        listed = db_session.get(Product, "p-defer")
+        assert "description" not in listed.__dict__
+
+        db_session.expunge_all()
+        detail = repo.get_with_relations("p-defer")
+        assert detail.__dict__["description"] == "Yerba mate con palo"
+
+    def test_get_with_relations_uses_identity_map(self, db_session, count_queries):
+        """Un producto ya cargado en la sesion no vuelve a consultarse."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        product = Product(id="p-ident", tenant_id="t-ident", name="Yerba", base_price=Decimal("10"))
+        db_session.add(product)
+        db_session.flush()
+
+        with count_queries() as queries:
+            assert ProductRepository(db_session).get_with_relations("p-ident") is product
+        assert queries == []
+
+    def test_search_uses_fts(self, db_session):
+        """La busqueda por texto usa el indice FTS5 y sigue los cambios."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        for product_id, name in (("p-fts-1", "Coca Cola 500ml"), ("p-fts-2", "Agua Mineral")):
+            db_session.add(Product(
+                id=product_id,
+                tenant_id="t-fts",
+                name=name,
+                base_price=Decimal("10"),
+            ))
+        db_session.flush()
+
+        repo = ProductRepository(db_session)
+        assert [p.id for p in repo.search("t-fts", "cola")] == ["p-fts-1"]
+        assert [p.id for p in repo.search("t-fts", "A COLA 5")] == ["p-fts-1"]
+
+        db_session.get(Product, "p-fts-2").name = "Agua Cola Light"
+        db_session.flush()
+        assert {p.id for p in repo.search("t-fts", "cola")} == {"p-fts-1", "p-fts-2"}
+
+        db_session.delete(db_session.get(Product, "p-fts-1"))
+        db_session.flush()
+        assert [p.id for p in repo.search("t-fts", "cola")] == ["p-fts-2"]
+
+        # Terminos cortos: LIKE sobre las columnas
+        assert [p.id for p in repo.search("t-fts", "ag")] == ["p-fts-2"]
+
+    def test_search_single_query(self, db_session, count_queries):
+        """Codigo exacto y texto se resuelven en una sola consulta."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        db_session.add_all([
+            Product(id="p-one-1", tenant_id="t-one", name="Alfajor 7790001",
+                    base_price=Decimal("10")),
+            Product(id="p-one-2", tenant_id="t-one", name="Galletitas", barcode="7790001",
+                    base_price=Decimal("10")),
+        ])
+        db_session.flush()
+
+        repo = ProductRepository(db_session)
+        with count_queries() as queries:
+            exact = repo.search("t-one", "7790001")
+            by_text = repo.search("t-one", "alfajor")
+
+        assert [p.id for p in exact] == ["p-one-2"]
+        assert [p.id for p in by_text] == ["p-one-1"]
+        assert len(queries) == 2
+
+    def test_get_by_code(self, db_session):
+        """get_by_barcode y get_by_sku buscan productos activos del tenant."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        db_session.add_all([
+            Product(id="p-code-1", tenant_id="t-code", name="A", barcode="111", sku="A-1",
+                    base_price=Decimal("1")),
+            Product(id="p-code-2", tenant_id="t-code", name="B", barcode="222", sku="B-1",
+                    base_price=Decimal("1"), is_active=False),
+        ])
+        db_session.flush()
+
+        repo = ProductRepository(db_session)
+        assert repo.get_by_barcode("t-code", "111").id == "p-code-1"
+        assert repo.get_by_sku("t-code", "A-1", with_relations=True).prices == []
+        assert repo.get_by_barcode("t-code", "222") is None
+        assert repo.get_by_sku("t-other", "A-1") is None
+
+    def test_search_with_relations(self, db_session, count_queries):
+        """with_relations carga categoria, marca y precios sin consultas por fila."""
+        from decimal import Decimal
+
+        from src.models import Category, Product
+        from src.repositories import ProductRepository
+
+        db_session.add(Category(id="cat-rel", tenant_id="t-rel", name="Bebidas"))
+        for i in range(3):
+            db_session.add(Product(
+                id=f"p-rel-{i}", tenant_id="t-rel", name=f"Jugo {i}", category_id="cat-rel",
+                base_price=Decimal("10"),
+            ))
+        db_session.flush()
+        db_session.expunge_all()
+
+        repo = ProductRepository(db_session)
+        with count_queries() as queries:
+            products = repo.search("t-rel", "jugo", with_relations=True)
+            assert {p.category.name for p in products} == {"Bebidas"}
+            assert all(p.prices == [] and p.brand is None for p in products)
+
+        assert len(products) == 3
+        assert len(queries) == 2
+
+    def test_search_code_prefix(self, db_session, db_engine):
+        """prefix_only busca codigos por comienzo con los indices de codigo."""
+        from decimal import Decimal
+
+        from sqlalchemy import select
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        db_session.add_all([
+            Product(id="p-pre-1", tenant_id="t-pre", name="Yerba", sku="YER-001",
+                    base_price=Decimal("1")),
+            Product(id="p-pre-2", tenant_id="t-pre", name="Azucar YER", barcode="779YER",
+                    base_price=Decimal("1")),
+            Product(id="p-pre-3", tenant_id="t-pre", name="Cafe", internal_code="YES",
+                    base_price=Decimal("1")),
+        ])
+        db_session.flush()
+
+        repo = ProductRepository(db_session)
+        assert [p.id for p in repo.search("t-pre", "YER", prefix_only=True)] == ["p-pre-1"]
+        # Ordenados por el codigo que coincidio: YER-001 < YES
+        assert [p.id for p in repo.search("t-pre", "YE", prefix_only=True)] == ["p-pre-1", "p-pre-3"]
+        assert repo.search("t-pre", "yer", prefix_only=True) == []
+        # Campo vacio (se borro el texto)
+        assert repo.search("t-pre", "", prefix_only=True) == []
+
+        stmt = (
+            select(Product.id)
+            .where(Product.tenant_id == "t-pre")
+            .where(repo._code_prefix_filter("YER"))
+        )
+        sql = str(stmt.compile(db_engine, compile_kwargs={"literal_binds": True}))
+        plan = " ".join(
+            row[-1] for row in db_session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}"
+            )
+        )
+        assert "SCAN products" not in plan
+
+    def test_search_multiple_words(self, db_session):
+        """Varias palabras se buscan en cualquier orden y columna."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        db_session.add(Product(
+            id="p-words", tenant_id="t-words", name="Coca Cola 500ml", sku="GASEOSA-1",
+            base_price=Decimal("10"),
+        ))
+        db_session.flush()
+
+        repo = ProductRepository(db_session)
+        assert [p.id for p in repo.search("t-words", "500 coca")] == ["p-words"]
+        assert [p.id for p in repo.search("t-words", "cola gaseosa")] == ["p-words"]
+        assert repo.search("t-words", "coca pepsi") == []
+
+    def test_variant_search_uses_fts(self, db_session, count_queries):
+        """Color y talle solo se buscan en variantes, que devuelven su padre."""
+        from decimal import Decimal
+
+        from src.models import Product
+        from src.repositories import ProductRepository
+
+        db_session.add_all([
+            Product(id="p-var", tenant_id="t-vfts", name="Remera", base_price=Decimal("10")),
+            Product(
+                id="p-var-1",
+                tenant_id="t-vfts",
+                name="Remera Azul L",
+                color="Azul marino",
+                size="L",
+                parent_product_id="p-var",
+                base_price=Decimal("10"),
+            ),
+            Product(
+                id="p-var-2",
+                tenant_id="t-vfts",
+                name="Remera Azul M",
+                color="Azul marino",
+                size="M",
+                parent_product_id="p-var",
+                base_price=Decimal("10"),
+            ),
+        ])
+        db_session.flush()
+
+        db_session.expunge_all()
+
+        repo = ProductRepository(db_session)
+        with count_queries() as queries:
+            parents = repo.search("t-vfts", "marino")
+        assert [p.id for p in parents] == ["p-var"]
+        # Busqueda combinada + padres de variantes (DISTINCT en la base)
+        assert len(queries) == 2
+        assert "DISTINCT products.parent_product_id" in queries[1]
+        # Las variantes no se cargan como entidades
+        assert len(db_session.identity_map) == 1
+        assert [p.id for p in repo.search("t-vfts", "marino", exclude_variants=False)] == []
+
+
+class TestBaseRepository:
+    """Tests para BaseRepository."""
+
+    def test_upsert_keeps_stored_values(self, db_session):
+        """upsert crea o actualiza sin pisar valores con None."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        created = repo.upsert(Category(id="cat-up", tenant_id="t-1", name="Bebidas", code="BEB"))
+        updated = repo.upsert(Category(id="cat-up", tenant_id="t-1", name="Bebidas frias"))
+
+        assert updated is created
+        assert updated.name == "Bebidas frias"
+        assert updated.code == "BEB"
+
+    def test_upsert_many_single_statement(self, db_session, count_queries):
+        """upsert_many escribe todas las filas en una sentencia."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        repo.upsert(Category(id="cat-many-1", tenant_id="t-1", name="Viejo"))
+
+        rows = [
+            {"id": f"cat-many-{n}", "tenant_id": "t-1", "name": f"Categoria {n}"}
+            for n in range(1, 4)
+        ]
+        with count_queries() as queries:
+            repo.upsert_many(rows)
+        assert len(queries) == 1
+
+        db_session.expire_all()
+        assert db_session.get(Category, "cat-many-1").name == "Categoria 1"
+        assert db_session.get(Category, "cat-many-3").name == "Categoria 3"
+
+    def test_create_many_bulk(self, db_session, count_queries):
+        """create_many_bulk inserta sin instancias y aplica defaults."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        rows = [
+            {"id": f"cat-bulk-{n}", "tenant_id": "t-bulk", "name": f"Categoria {n}"}
+            for n in range(5)
+        ]
+        with count_queries() as queries:
+            repo.create_many_bulk(rows)
+
+        assert len(queries) == 1
+        assert not any(isinstance(obj, Category) for obj in db_session)
+        assert repo.count("t-bulk") == 5
+        assert db_session.get(Category, "cat-bulk-0").created_at is not None
+
+    def test_delete_by_id_single_statement(self, db_session, count_queries):
+        """delete_by_id borra con un DELETE y saca la instancia de la sesion."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        category = repo.create(Category(id="cat-del", tenant_id="t-1", name="Borrar"))
+
+        with count_queries() as queries:
+            assert repo.delete_by_id("cat-del") is True
+        assert len(queries) == 1
+        assert category not in db_session
+
+        assert repo.delete_by_id("cat-del") is False
+
+    def test_delete_by_id_cascades(self, db_session):
+        """Los modelos con cascada siguen borrando sus hijos."""
+        from decimal import Decimal
+
+        from src.models import PriceList, Product, ProductPrice
+        from src.repositories import BaseRepository
+
+        db_session.add_all([
+            PriceList(id="pl-del", tenant_id="t-1", name="Lista"),
+            Product(
+                id="p-del",
+                tenant_id="t-1",
+                name="Yerba",
+                base_price=Decimal("10"),
+                prices=[ProductPrice(id="pp-del", price_list_id="pl-del", price=Decimal("9"))],
+            ),
+        ])
+        db_session.flush()
+
+        assert BaseRepository(db_session, Product).delete_by_id("p-del") is True
+        assert db_session.get(ProductPrice, "pp-del") is None
+
+    def test_get_by_tenant_reuses_statement(self, db_session):
+        """get_by_tenant reutiliza la sentencia armada para cada forma."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+        from src.repositories.base import _tenant_statement
+
+        repo = BaseRepository(db_session, Category)
+        for i in range(3):
+            repo.create(Category(id=f"cat-t{i}", tenant_id="t-stmt", name=f"C{i}"))
+        repo.create(Category(id="cat-other", tenant_id="t-other", name="Otra"))
+
+        assert {c.id for c in repo.get_by_tenant("t-stmt")} == {"cat-t0", "cat-t1", "cat-t2"}
+        assert len(repo.get_by_tenant("t-stmt", limit=2)) == 2
+        assert len(repo.get_by_tenant("t-stmt", limit=2, offset=2)) == 1
+        assert _tenant_statement(Category, True, False) is _tenant_statement(Category, True, False)
+
+    def test_model_meta_shared(self, db_session):
+        """Los datos del mapper se calculan una vez por modelo."""
+        from src.models import Category, Product
+        from src.repositories import BaseRepository
+
+        first = BaseRepository(db_session, Product)
+        second = BaseRepository(db_session, Product)
+
+        assert first._meta is second._meta
+        assert first._meta.pk_names == ("id",)
+        assert first._meta.cascade_delete is True
+        assert BaseRepository(db_session, Category)._meta.cascade_delete is False
+
+    def test_exists_without_loading(self, db_session):
+        """exists consulta la base sin cargar la entidad en la sesion."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        repo.create(Category(id="cat-exists", tenant_id="t-1", name="Existe"))
+        db_session.expunge_all()
+
+        assert repo.exists("cat-exists") is True
+        assert repo.exists("cat-missing") is False
+        assert len(db_session.identity_map) == 0
+
+    def test_fetch_stream(self, db_session):
+        """Con stream=True se devuelve un iterador por lotes."""
+        from src.models import Brand
+        from src.repositories.product_repository import BrandRepository
+
+        for i in range(3):
+            db_session.add(Brand(id=f"br-{i}", tenant_id="t-brand", name=f"Marca {i}"))
+        db_session.flush()
+
+        repo = BrandRepository(db_session)
+        brands = repo.get_active_brands("t-brand")
+        streamed = repo.get_active_brands("t-brand", stream=True)
+
+        assert isinstance(brands, list)
+        assert not isinstance(streamed, list)
+        assert [b.id for b in streamed] == [b.id for b in brands] == ["br-0", "br-1", "br-2"]
+
+    def test_reference_cache(self, db_session, count_queries):
+        """Las marcas se leen de la base una vez hasta invalidar el cache."""
+        from src.db.reference_cache import REFERENCE_CACHE
+        from src.models import Brand
+        from src.repositories.product_repository import BrandRepository
+
+        db_session.add(Brand(id="br-ref-1", tenant_id="t-ref", name="Arcor"))
+        db_session.flush()
+        repo = BrandRepository(db_session)
+        repo.get_active_brands("t-ref")
+
+        db_session.expunge_all()
+        with count_queries() as queries:
+            brands = repo.get_active_brands("t-ref")
+        assert queries == []
+        assert [b.name for b in brands] == ["Arcor"]
+        assert brands[0] in db_session
+
+        db_session.add(Brand(id="br-ref-2", tenant_id="t-ref", name="Bagley"))
+        db_session.flush()
+        REFERENCE_CACHE.invalidate()
+        assert [b.name for b in repo.get_active_brands("t-ref")] == ["Arcor", "Bagley"]
+
+    def test_has_any(self, db_session):
+        """has_any indica si hay filas, opcionalmente por tenant."""
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        repo.create(Category(id="cat-any", tenant_id="t-any", name="Alguna"))
+
+        assert repo.has_any("t-any") is True
+        assert repo.has_any("t-none") is False
+        assert repo.has_any() is True
+
+    def test_bulk_flushes_once(self, db_session):
+        """Dentro de bulk() las escrituras se envian en un solo flush."""
+        from sqlalchemy import event
+
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        flushes = []
+        event.listen(db_session, "after_flush", lambda session, context: flushes.append(1))
+
+        repo = BaseRepository(db_session, Category)
+        with repo.bulk():
+            for n in range(3):
+                repo.create(Category(id=f"cat-bulkctx-{n}", tenant_id="t-ctx", name=f"C{n}"))
+            assert flushes == []
+
+        assert len(flushes) == 1
+        assert repo.count("t-ctx") == 3
+
+        repo.create(Category(id="cat-bulkctx-x", tenant_id="t-ctx", name="X"))
+        assert len(flushes) == 2
+
+    def test_iter_by_tenant_batches(self, db_session):
+        """iter_by_tenant entrega todas las entidades en lotes."""
+        import types
+
+        from src.models import Category
+        from src.repositories import BaseRepository
+
+        repo = BaseRepository(db_session, Category)
+        repo.create_many_bulk([
+            {"id": f"cat-iter-{n}", "tenant_id": "t-iter", "name": f"C{n}"}
+            for n in range(7)
+        ])
+
+        rows = repo.iter_by_tenant("t-iter", batch_size=3)
+        assert isinstance(rows, types.GeneratorType)
+        assert sorted(c.id for c in rows) == [f"cat-iter-{n}" for n in range(7)]
+        assert sum(1 for _ in repo.iter_all(batch_size=2)) >= 7
+
+
+class TestCustomerRepository:
+    """Tests para CustomerRepository."""
+
+    def test_search_uses_fts(self, db_session):
+        """La busqueda por texto usa el indice FTS5 de clientes."""
+        from src.models import Customer
+        from src.models.customer import CUSTOMERS_FTS
+        from src.repositories.customer_repository import CustomerRepository
+
+        db_session.add_all([
+            Customer(id="c-fts-1", tenant_id="t-cfts", name="Perez SA", email="ventas@perez.com"),
+            Customer(id="c-fts-2", tenant_id="t-cfts", name="Gomez", phone="11-4455-6677"),
+        ])
+        db_session.flush()
+
+        repo = CustomerRepository(db_session)
+        assert CUSTOMERS_FTS.exists(db_session.connection())
+        assert [c.id for c in repo.search("t-cfts", "PEREZ.C")] == ["c-fts-1"]
+        assert [c.id for c in repo.search("t-cfts", "4455")] == ["c-fts-2"]
+        assert [c.id for c in repo.search("t-cfts", "go")] == ["c-fts-2"]
+
+    def test_short_search_single_like(self, db_session):
+        """Sin FTS la busqueda usa un solo LIKE sin cruzar columnas."""
+        from src.models import Customer
+        from src.repositories.customer_repository import CustomerRepository
+
+        db_session.add_all([
+            Customer(id="c-like-1", tenant_id="t-clike", name="Xa", trade_name="bY"),
+            Customer(id="c-like-2", tenant_id="t-clike", name="Zz", mobile="15AB"),
+        ])
+        db_session.flush()
+
+        repo = CustomerRepository(db_session)
+        assert [c.id for c in repo.search("t-clike", "ab")] == ["c-like-2"]
+        assert [c.id for c in repo.search("t-clike", "By")] == ["c-like-1"]
+
+    def test_get_by_tax_id(self, db_session, count_queries):
+        """Encuentra el documento con o sin separadores."""
+        from src.models import Customer
+        from src.repositories.customer_repository import CustomerRepository
+
+        db_session.add(Customer(id="c-cuit", tenant_id="t-cuit", name="Perez", tax_id="20123456789"))
+        db_session.flush()
+
+        repo = CustomerRepository(db_session)
+        assert repo.get_by_tax_id("t-cuit", "20-12345678-9").id == "c-cuit"
+
+        with count_queries() as queries:
+            assert repo.get_by_tax_id("t-cuit", "20123456789").id == "c-cuit"
+        assert "tax_id IN" not in queries[0]
+
+
+class TestConfigRepository:
+    """Tests para ConfigRepository."""
+
+    def test_set_value_upserts(self, db_session):
+        """Una clave existente se actualiza y conserva su categoria."""
+        from src.repositories import ConfigRepository
+
+        repo = ConfigRepository(db_session)
+        first = repo.set_value("cfg_upsert", 5, "printer")
+        second = repo.set_value("cfg_upsert", True, "ui")
+
+        assert second is first
+        assert second.value_type == "bool"
+        assert second.category == "printer"
+        assert repo.get_value("cfg_upsert") is True
+
+    def test_set_printer_config_single_statement(self, db_session, count_queries):
+        """La configuracion de impresora se guarda en una sola sentencia."""
+        from src.repositories import ConfigRepository
+
+        repo = ConfigRepository(db_session)
+        config = {"name": "EPSON", "width": 80, "cut": True, "extra": {"copies": 2}}
+
+        with count_queries() as queries:
+            repo.set_printer_config(config)
+
+        assert len(queries) == 1
+        assert repo.get_printer_config() == {f"printer_{k}": v for k, v in config.items()}
+
+    def test_get_value_cached(self, db_session, count_queries):
+        """Las lecturas repetidas no consultan la base; las escrituras actualizan el cache."""
+        from src.repositories import ConfigRepository
+
+        repo = ConfigRepository(db_session)
+        repo.set_value("cfg_cached", "a")
+        repo.invalidate()
+
+        with count_queries() as queries:
+            assert repo.get_value("cfg_cached") == "a"
+            assert repo.get_value("cfg_cached") == "a"
+            assert repo.get_value("cfg_absent", "x") == "x"
+            assert repo.get_value("cfg_absent") is None
+        assert len(queries) == 2
+
+        repo.set_value("cfg_cached", "b")
+        assert repo.get_value("cfg_cached") == "b"
+
+        repo.delete_key("cfg_cached")
+        assert repo.get_value("cfg_cached") is None
+
+
+class TestOfflineQueueRepository:
+    """Tests para OfflineQueueRepository."""
+
+    def _add(self, session, id, status="pending", retry_count=0):
+        from src.models import OfflineQueue
+
+        session.add(OfflineQueue(
+            id=id,
+            tenant_id="t-queue",
+            operation_type="sale",
+            endpoint="/sales",
+            method="POST",
+            payload={"n": id},
+            status=status,
+            retry_count=retry_count,
+        ))
+
+    def test_claim_batch(self, db_session, count_queries):
+        """Toma en un UPDATE las operaciones reintentables mas antiguas."""
+        from src.repositories import OfflineQueueRepository
+
+        self._add(db_session, 101)
+        self._add(db_session, 102, status="failed", retry_count=1)
+        self._add(db_session, 103, status="failed", retry_count=5)
+        self._add(db_session, 104, status="completed")
+        self._add(db_session, 105)
+        self._add(db_session, 106)
+        db_session.flush()
+
+        repo = OfflineQueueRepository(db_session)
+        with count_queries() as queries:
+            claimed = repo.claim_batch("t-queue", limit=3)
+
+        assert len(queries) == 1
+        assert [op.id for op in claimed] == [101, 102, 105]
+        assert all(op.status == "processing" for op in claimed)
+        assert all(op.last_attempt_at is not None for op in claimed)
+
+        assert [op.id for op in repo.claim_batch("t-queue", limit=3)] == [106]
+        assert repo.claim_batch("t-queue") == []
+
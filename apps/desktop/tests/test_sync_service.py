@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+from datetime import datetime
 from decimal import Decimal
 
 from src.services.sync_service import (
@@ -20,6 +21,7 @@ from src.services.sync_service import (
     reset_sync_service,
 )
 from src.api.products import ProductData, CategoryData, BrandData
+from src.models import Sale, SaleItem
 
 
 class TestSyncService(unittest.TestCase):
@@ -161,5 +163,166 @@ class TestCategoryData(unittest.TestCase):
         self.assertEqual(category.quick_access_color, "#3b82f6")
 
 
+class TestPromotionData(unittest.TestCase):
+    """Tests para PromotionData."""
+
+    def test_applies_to_product(self):
+        """Verifica la aplicabilidad por producto, categoria y marca."""
+        from src.api.promotions import PromotionData
+
+        by_product = PromotionData.from_dict({
+            "id": "promo-1",
+            "name": "2x1",
+            "applyTo": "SPECIFIC_PRODUCTS",
+            "applicableProducts": [{"productId": "prod-1"}, {"id": "prod-2"}],
+        })
+        by_category = PromotionData.from_dict({
+            "id": "promo-2",
+            "name": "Bebidas",
+            "applyTo": "CATEGORIES",
+            "categoryIds": ["cat-1"],
+            "brandIds": None,
+        })
+
+        self.assertEqual(by_product.product_ids, frozenset({"prod-1", "prod-2"}))
+        self.assertTrue(by_product.applies_to_product("prod-2"))
+        self.assertFalse(by_product.applies_to_product("prod-3"))
+        self.assertTrue(by_category.applies_to_product("prod-3", category_id="cat-1"))
+        self.assertFalse(by_category.applies_to_product("prod-3"))
+        self.assertEqual(by_category.brand_ids, frozenset())
+
+    def test_index_matches_linear_search(self):
+        """El indice devuelve la misma promocion que recorrer la lista."""
+        from src.api.promotions import PromotionData, PromotionIndex, PromotionsAPI
+
+        promotions = [
+            PromotionData(id="inactive", name="", type="PERCENTAGE", apply_to="ALL_PRODUCTS", is_active=False),
+            PromotionData(id="brand", name="", type="PERCENTAGE", apply_to="BRANDS", brand_ids=frozenset({"b-1"})),
+            PromotionData(id="product", name="", type="PERCENTAGE", apply_to="SPECIFIC_PRODUCTS", product_ids=frozenset({"p-1", "p-2"})),
+            PromotionData(id="category", name="", type="PERCENTAGE", apply_to="CATEGORIES", category_ids=frozenset({"c-1"})),
+            PromotionData(id="all", name="", type="PERCENTAGE", apply_to="ALL_PRODUCTS"),
+        ]
+        index = PromotionIndex(promotions)
+        api = PromotionsAPI(client=Mock())
+
+        for product_id in ("p-1", "p-3"):
+            for category_id in (None, "c-1"):
+                for brand_id in (None, "b-1"):
+                    expected = api.get_promotion_for_product(promotions, product_id, category_id, brand_id)
+                    found = index.first_for(product_id, category_id, brand_id)
+                    self.assertIs(found, expected)
+
+        self.assertIsNone(PromotionIndex(promotions[:1]).first_for("p-1"))
+
+
+class TestSalesBulkUpsert:
+    """Tests para la escritura en lote del cache de ventas."""
+
+    def _sale(self, total, refunded=0):
+        return {
+            "id": "s-bulk",
+            "branchId": "b-1",
+            "saleNumber": "0001",
+            "saleDate": "2024-05-01T10:00:00",
+            "total": total,
+            "status": "COMPLETED",
+            "items": [{
+                "id": "si-bulk",
+                "productId": "p-1",
+                "productName": "Yerba Mate",
+                "quantity": 2,
+                "unitPrice": 10,
+                "subtotal": 20,
+                "refundItems": [{"quantity": refunded}] if refunded else [],
+            }],
+        }
+
+    def _write(self, service, session, data):
+        service._bulk_upsert(
+            session, Sale, [service._sale_row(data, datetime.now())], keep=("tenant_id", "branch_id")
+        )
+        service._bulk_upsert(
+            session,
+            SaleItem,
+            [service._sale_item_row(data["id"], item) for item in data["items"]],
+            keep=("sale_id",),
+        )
+
+    def test_insert_then_update(self, db_session):
+        """La segunda escritura actualiza las filas existentes."""
+        service = SyncService("t-bulk")
+
+        self._write(service, db_session, self._sale(20))
+        self._write(service, db_session, self._sale(25, refunded=1))
+
+        sale = db_session.get(Sale, "s-bulk")
+        item = db_session.get(SaleItem, "si-bulk")
+
+        assert db_session.query(Sale).filter_by(id="s-bulk").count() == 1
+        assert sale.total == Decimal("25")
+        assert sale.tenant_id == "t-bulk"
+        assert item.refunded_quantity == Decimal("1")
+
+
+class TestDenormalizedNames:
+    """Tests para los nombres de categoria y marca copiados en Product."""
+
+    def test_names_follow_sync(self, db_session):
+        """El producto guarda los nombres y los actualiza al renombrar."""
+        service = SyncService("t-names")
+
+        service._upsert_category(db_session, CategoryData(id="cat-n", name="Bebidas"))
+        service._upsert_brand(db_session, BrandData(id="brand-n", name="Marca"))
+        db_session.flush()
+
+        product = service._upsert_product(db_session, ProductData(
+            id="prod-n",
+            name="Agua",
+            category_id="cat-n",
+            brand_id="brand-n",
+            brand_name="Marca API",
+        ))
+        db_session.flush()
+
+        assert product.category_name == "Bebidas"
+        assert product.brand_name == "Marca API"
+
+        service._upsert_category(db_session, CategoryData(id="cat-n", name="Aguas"))
+        db_session.flush()
+        db_session.refresh(product)
+
+        assert product.category_name == "Aguas"
+
+
+
+class TestLocalProducts:
+    """Tests para la busqueda de productos locales."""
+
+    def test_prefix_only_search(self, db_session):
+        """Con prefix_only se buscan codigos que empiezan con el texto."""
+        from contextlib import contextmanager
+
+        from src.models import Product
+
+        db_session.add_all([
+            Product(id="p-scan-1", tenant_id="t-scan", name="Yerba", barcode="77912345678",
+                    base_price=Decimal("1")),
+            Product(id="p-scan-2", tenant_id="t-scan", name="Cafe", barcode="12377912345",
+                    base_price=Decimal("1")),
+        ])
+        db_session.flush()
+
+        @contextmanager
+        def scope(readonly=False):
+            yield db_session
+
+        service = SyncService("t-scan")
+        with patch("src.services.sync_service.session_scope", scope):
+            by_prefix = service.get_local_products(search="779123", prefix_only=True)
+            by_text = service.get_local_products(search="779123")
+
+        assert [p.id for p in by_prefix] == ["p-scan-1"]
+        assert {p.id for p in by_text} == {"p-scan-1", "p-scan-2"}
+
 if __name__ == "__main__":
     unittest.main()
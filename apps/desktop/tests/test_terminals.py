@@ -0,0 +1,287 @@
+"""
+Tests para la API de terminales.
+
+Cubre:
+- Cache de estado de terminal
+- Invalidacion del cache
+- Datos aplanados de TerminalInfo
+- Identificacion de terminal
+- Reintentos del registro de terminal
+- Heartbeat con body pre-serializado
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.api.client import APIResponse
+
+
+@pytest.fixture(autouse=True)
+def clear_status_cache():
+    """Limpia el cache de estado antes y despues de cada test."""
+    from src.api.terminals import invalidate_terminal_status
+
+    invalidate_terminal_status()
+    yield
+    invalidate_terminal_status()
+
+
+class TestTerminalStatusCache:
+    """Tests para get_terminal_status con cache."""
+
+    def test_status_is_cached(self):
+        """La segunda consulta no hace request."""
+        from src.api.terminals import get_terminal_status
+
+        client = MagicMock()
+        client.get.return_value = APIResponse(success=True, data={"status": "ACTIVE"})
+
+        with patch("src.api.terminals.get_api_client", return_value=client):
+            assert get_terminal_status("dev-1") == "ACTIVE"
+            assert get_terminal_status("dev-1") == "ACTIVE"
+
+        client.get.assert_called_once()
+
+    def test_cache_expires(self):
+        """Vencido el TTL se vuelve a consultar."""
+        from src.api import terminals
+
+        client = MagicMock()
+        client.get.return_value = APIResponse(success=True, data={"status": "ACTIVE"})
+
+        with patch("src.api.terminals.get_api_client", return_value=client):
+            terminals.get_terminal_status("dev-1")
+            timestamp, status = terminals._STATUS_CACHE["dev-1"]
+            terminals._STATUS_CACHE["dev-1"] = (
+                timestamp - terminals.STATUS_CACHE_TTL - 1,
+                status,
+            )
+            terminals.get_terminal_status("dev-1")
+
+        assert client.get.call_count == 2
+
+    def test_errors_are_not_cached(self):
+        """Una respuesta fallida no se cachea."""
+        from src.api.terminals import get_terminal_status
+
+        client = MagicMock()
+        client.get.return_value = APIResponse(success=False, data=None)
+
+        with patch("src.api.terminals.get_api_client", return_value=client):
+            assert get_terminal_status("dev-1") is None
+            assert get_terminal_status("dev-1") is None
+
+        assert client.get.call_count == 2
+
+    def test_failed_heartbeat_invalidates(self):
+        """Un heartbeat fallido descarta el estado cacheado."""
+        from src.api.terminals import get_terminal_status, send_heartbeat
+
+        client = MagicMock()
+        client.get.return_value = APIResponse(success=True, data={"status": "ACTIVE"})
+        client.post.return_value = APIResponse(success=False)
+
+        with patch("src.api.terminals.get_api_client", return_value=client):
+            get_terminal_status("dev-1")
+            assert send_heartbeat("dev-1") is False
+            get_terminal_status("dev-1")
+
+        assert client.get.call_count == 2
+
+
+class TestTerminalInfo:
+    """Tests para TerminalInfo."""
+
+    def _make(self, point_of_sale):
+        from src.api.terminals import TerminalInfo
+
+        return TerminalInfo(
+            id="t-1",
+            device_id="dev-1",
+            hostname="CAJA-01",
+            mac_address="00:11:22:33:44:55",
+            name="Caja 1",
+            status="ACTIVE",
+            point_of_sale=point_of_sale,
+        )
+
+    def test_flattened_point_of_sale(self):
+        """Los datos del punto de venta quedan accesibles como atributos."""
+        terminal = self._make({
+            "id": "pos-1",
+            "code": "001",
+            "name": "Caja Principal",
+            "branch": {"id": "br-1", "name": "Centro"},
+            "priceList": {"id": "pl-1", "name": "Minorista"},
+        })
+
+        assert terminal.pos_id == "pos-1"
+        assert terminal.pos_code == "001"
+        assert terminal.pos_name == "Caja Principal"
+        assert terminal.branch_id == "br-1"
+        assert terminal.branch_name == "Centro"
+        assert terminal.price_list_id == "pl-1"
+        assert terminal.price_list_name == "Minorista"
+
+    def test_without_point_of_sale(self):
+        """Sin punto de venta todas las propiedades son None."""
+        terminal = self._make(None)
+
+        assert terminal.pos_id is None
+        assert terminal.branch_id is None
+        assert terminal.price_list_name is None
+
+    def test_uses_slots(self):
+        """Las instancias no tienen __dict__."""
+        terminal = self._make(None)
+
+        assert not hasattr(terminal, "__dict__")
+        with pytest.raises(AttributeError):
+            terminal.extra = "x"
+
+
+class TestIdentifyTerminal:
+    """Tests para identify_terminal."""
+
+    def test_registered_terminal(self):
+        """Parsea la respuesta de una terminal registrada."""
+        import httpx
+        from src.api.terminals import identify_terminal
+
+        payload = {
+            "success": True,
+            "data": {
+                "registered": True,
+                "isActive": True,
+                "tenant": {"slug": "demo", "name": "Demo"},
+                "terminal": {"name": "Caja 1"},
+                "branch": {"name": "Centro"},
+            },
+        }
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+        real_client = httpx.Client
+
+        with patch(
+            "src.api.terminals.httpx.Client",
+            side_effect=lambda **kwargs: real_client(transport=transport, **kwargs),
+        ):
+            result = identify_terminal("00:11:22:33:44:55", "http://test")
+
+        assert result.registered
+        assert result.is_active
+        assert result.tenant_slug == "demo"
+        assert result.terminal_name == "Caja 1"
+        assert result.branch_name == "Centro"
+
+    def test_connect_timeout(self):
+        """Un timeout de conexion devuelve un mensaje especifico."""
+        import httpx
+        from src.api.terminals import IDENTIFY_TIMEOUT, identify_terminal
+
+        def handler(request):
+            raise httpx.ConnectTimeout("timeout", request=request)
+
+        transport = httpx.MockTransport(handler)
+        real_client = httpx.Client
+        created = []
+
+        def make_client(**kwargs):
+            created.append(kwargs)
+            return real_client(transport=transport, **kwargs)
+
+        with patch("src.api.terminals.httpx.Client", side_effect=make_client):
+            result = identify_terminal("00:11:22:33:44:55", "http://test")
+
+        assert not result.registered
+        assert result.message.startswith("Timeout conectando")
+        assert created[0]["timeout"] is IDENTIFY_TIMEOUT
+        assert IDENTIFY_TIMEOUT.connect < IDENTIFY_TIMEOUT.read
+
+
+class TestRegisterTerminal:
+    """Tests para register_terminal."""
+
+    def test_retries_on_same_client(self):
+        """Un error de red transitorio se reintenta con el mismo cliente HTTP."""
+        import httpx
+        from src.api.client import APIClient
+        from src.api.terminals import register_terminal
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("conexion rechazada", request=request)
+            return httpx.Response(200, json={
+                "success": True,
+                "data": {
+                    "id": "t-1",
+                    "deviceId": "dev-1",
+                    "hostname": "CAJA-01",
+                    "macAddress": "00:11:22:33:44:55",
+                    "status": "ACTIVE",
+                },
+            })
+
+        api_client = APIClient(base_url="http://test")
+        http_client = httpx.Client(
+            base_url="http://test", transport=httpx.MockTransport(handler)
+        )
+        api_client._client = http_client
+
+        with patch("src.api.terminals.get_api_client", return_value=api_client), \
+                patch("src.api.client.time.sleep") as sleep:
+            terminal = register_terminal(
+                "CAJA-01", "00:11:22:33:44:55", "Windows 11", "1.0.0", "10.0.0.2"
+            )
+
+        assert terminal.device_id == "dev-1"
+        assert len(calls) == 2
+        assert api_client._client is http_client
+        sleep.assert_called_once()
+
+
+class TestRetryDelay:
+    """Tests para el backoff de reintentos."""
+
+    def test_exponential_with_jitter(self):
+        """La espera se duplica por intento y agrega un jitter acotado."""
+        from src.api.client import RETRY_JITTER, retry_delay
+        from src.config.constants import API_RETRY_DELAY
+
+        for attempt in range(3):
+            delay = retry_delay(attempt)
+            base = API_RETRY_DELAY * 2 ** attempt
+            assert base <= delay <= base + RETRY_JITTER
+
+
+class TestHeartbeat:
+    """Tests para send_heartbeat."""
+
+    def test_sends_preserialized_body(self):
+        """El body del heartbeat se envia como JSON ya serializado."""
+        import json
+
+        import httpx
+        from src.api.client import APIClient
+        from src.api.terminals import _heartbeat_payload, send_heartbeat
+
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content)
+            return httpx.Response(200, json={"success": True})
+
+        api_client = APIClient(base_url="http://test")
+        api_client._client = httpx.Client(
+            base_url="http://test", transport=httpx.MockTransport(handler)
+        )
+
+        with patch("src.api.terminals.get_api_client", return_value=api_client):
+            assert send_heartbeat("dev-1") is True
+            assert send_heartbeat("dev-1") is True
+
+        assert json.loads(bodies[0]) == {"deviceId": "dev-1"}
+        assert bodies[0] == bodies[1] == _heartbeat_payload("dev-1")